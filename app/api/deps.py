@@ -0,0 +1,58 @@
+from fastapi import Request
+
+from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.core.event.kafka.producer import KafkaProducer
+from app.core.executor import ScrapeExecutor
+from app.core.extraction_cache import ExtractionCache
+from app.core.http import HTTPClientRegistry
+from app.core.process_pool import TransformExecutor
+from app.core.proxy_pool import ProxyPool
+from app.core.rate_limit import RateLimiterRegistry
+from app.service.duplicate_detector import DuplicateDetector
+from app.service.job_pipeline import JobPipeline
+from app.service.scrape_jobs import ScrapeJobService
+
+
+def get_mongo_repository(request: Request) -> MongoDBRepository:
+    """Repositorio de MongoDB compartido, creado al arrancar la aplicación."""
+    return request.app.state.mongo_repository
+
+
+def get_kafka_producer(request: Request) -> KafkaProducer:
+    return request.app.state.kafka_producer
+
+
+def get_scrape_executor(request: Request) -> ScrapeExecutor:
+    return request.app.state.scrape_executor
+
+
+def get_scrape_job_service(request: Request) -> ScrapeJobService:
+    return request.app.state.scrape_job_service
+
+
+def get_job_pipeline(request: Request) -> JobPipeline:
+    return request.app.state.job_pipeline
+
+
+def get_rate_limiter(request: Request) -> RateLimiterRegistry:
+    return request.app.state.rate_limiter
+
+
+def get_proxy_pool(request: Request) -> ProxyPool:
+    return request.app.state.proxy_pool
+
+
+def get_extraction_cache(request: Request) -> ExtractionCache:
+    return request.app.state.extraction_cache
+
+
+def get_http_clients(request: Request) -> HTTPClientRegistry:
+    return request.app.state.http_clients
+
+
+def get_transform_executor(request: Request) -> TransformExecutor:
+    return request.app.state.transform_executor
+
+
+def get_duplicate_detector(request: Request) -> DuplicateDetector:
+    return request.app.state.duplicate_detector
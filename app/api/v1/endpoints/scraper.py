@@ -1,25 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, BackgroundTasks, Request
-from jobspy import scrape_jobs
+from fastapi import APIRouter, Depends, HTTPException, Header, BackgroundTasks, Query, Request
 
 from sqlalchemy.orm import Session
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import logging
 
 from starlette.responses import JSONResponse
 
+from app.api.deps import get_duplicate_detector, get_extraction_cache, get_http_clients, get_job_pipeline, \
+    get_mongo_repository, get_proxy_pool, get_rate_limiter, get_scrape_job_service, get_transform_executor
 from app.config.settings import settings
 from app.core.datastore.database import get_db
 from app.core.datastore.repository.mongodb import MongoDBRepository
 from app.core.event.kafka.producer import KafkaProducer
 from app.core.exceptions import ScraperException
+from app.core.extraction_cache import ExtractionCache
+from app.core.html_reducer import reduction_stats
+from app.core.http import HTTPClientRegistry
+from app.core.process_pool import TransformExecutor
+from app.core.proxy_pool import ProxyPool
+from app.core.rate_limit import RateLimiterRegistry
 #from app.config.database import get_db
 from app.core.model.job_offer import JobOffer
-from app.core.model.schemas import ScrapingRequest, LinkedInJobCreate, ScrapingStats, JobSource
+from app.core.model.schemas import ScrapingRequest, LinkedInJobCreate, ScrapingStats, JobSource, ScrapeJob, \
+    ScrapeJobStatus
+from app.service.card_parser import card_parser_stats
+from app.service.duplicate_detector import DuplicateDetector
 from app.service.etl import JobETLService
+from app.service.job_pipeline import JobPipeline
 from app.service.job_spy_scraper import JobSpyScraper
 from app.service.scheduler import ScrapingScheduler
+from app.service.scrape_jobs import ScrapeJobService
 from app.service.scraper import LinkedInScraper
 from app.service.sync import JobSyncService
 
@@ -51,80 +63,111 @@ async def verify_api_key(
 router = APIRouter()
 
 
-@router.post("/scrape")
-async def scrape_and_sync_jobs(request: ScrapingRequest, app_request: Request):
+@router.post("/scrape", status_code=202)
+async def scrape_and_sync_jobs(
+        request: ScrapingRequest,
+        app_request: Request,
+        scrape_job_service: ScrapeJobService = Depends(get_scrape_job_service)
+):
+    """
+    Encola un trabajo de scraping y devuelve su id inmediatamente.
+    El avance se consulta en `/scrape/jobs/{job_id}`.
+    """
     logging.info("Starting scrape_and_sync_jobs endpoint")
-    #print("Starting scrape_and_sync_jobs endpoint")
-
-    mongo_repo = MongoDBRepository(settings.MONGO_URI, settings.MONGO_DB_NAME)
 
     try:
-        # Validar y configurar el país
-        country = request.country.lower() if request.country else "peru"
-
-        kafka_producer = app_request.app.state.kafka_producer
-
-        # Verificar que el producer está iniciado
-        if not kafka_producer._started:
-            #print("Kafka producer not started. Starting...")
-            await kafka_producer.start()
-
-        # Realizar scraping con JobSpy
-        logging.info("Starting JobSpy scraping...")
-        #print("Starting JobSpy scraping...")
-
-        jobs_df = scrape_jobs(
-            site_name=["indeed"],
-            search_term=",".join(request.keywords),
-            location=country,
-            results_wanted=1000,
-            hours_old=1200,
-            enforce_annual_salary=False,
-            country_indeed='peru',
-            description_format="markdown",
-            verbose=2,
+        job, created = await scrape_job_service.submit(request)
+
+        return JSONResponse(
+            content={
+                "message": "Scraping job accepted" if created else "Scraping job already in progress",
+                "job_id": job.job_id,
+                "status": job.status,
+                "status_url": app_request.url_for("get_scrape_job", job_id=job.job_id).path,
+            },
+            status_code=202
         )
 
-        if jobs_df is None or jobs_df.empty:
-            #print("No jobs found in scraping")
-            return JSONResponse(
-                content={"message": "No jobs found in scraping"},
-                status_code=200
-            )
+    except Exception as e:
+        logging.error(f"Error in scrape_and_sync_jobs: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        #print(f"Found {len(jobs_df)} jobs. Starting ETL process...")
 
-        # Inicializar ETL service directamente
-        etl_service = JobETLService(mongo_repo, kafka_producer)
+@router.get("/scrape/jobs/{job_id}", response_model=ScrapeJob)
+async def get_scrape_job(
+        job_id: str,
+        scrape_job_service: ScrapeJobService = Depends(get_scrape_job_service)
+):
+    """Devuelve el estado, los contadores de progreso y el resultado de un trabajo de scraping."""
+    job = await scrape_job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Scrape job {job_id} not found")
+    return job
+
+
+@router.get("/scrape/jobs", response_model=List[ScrapeJob])
+async def list_scrape_jobs(
+        status: Optional[ScrapeJobStatus] = None,
+        limit: int = Query(50, ge=1, le=500),
+        scrape_job_service: ScrapeJobService = Depends(get_scrape_job_service)
+):
+    """Lista los trabajos de scraping más recientes."""
+    return await scrape_job_service.list_jobs(status, limit)
 
-        # Inicializar scraper con el ETL
-        job_spy_scraper = JobSpyScraper(
-            mongo_repository=mongo_repo,
-            etl_service=etl_service,
-            proxies=None,
-            results_wanted=50
-        )
 
-        # Procesar trabajos
-        #print("Processing scraped jobs...")
-        await job_spy_scraper.process_scraped_jobs(jobs_df)
-        #print("Jobs processed and saved to MongoDB.")
+@router.get("/pipeline/stats")
+async def get_pipeline_stats(job_pipeline: JobPipeline = Depends(get_job_pipeline)):
+    """Profundidad de cola, elementos en curso y throughput de cada etapa del pipeline."""
+    return job_pipeline.stats()
 
-        # Ejecutar ETL explícitamente
-        #print("Starting ETL process_pending_jobs...")
-        await etl_service.process_pending_jobs()
-        #print("ETL process completed.")
 
-        return JSONResponse(
-            content={
-                "message": f"Scraping and synchronization completed successfully. Found {len(jobs_df)} jobs.",
-                "status": "success",
-                "jobs_processed": len(jobs_df)
-            },
-            status_code=200
-        )
+@router.get("/rate-limits")
+async def get_rate_limits(rate_limiter: RateLimiterRegistry = Depends(get_rate_limiter)):
+    """Estado del token bucket y del circuit breaker de cada sitio."""
+    return rate_limiter.stats()
 
-    except Exception as e:
-        #print(f"Error in scrape_and_sync_jobs: {str(e)}")
-        logging.error(f"Error in scrape_and_sync_jobs: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+
+@router.get("/proxies")
+async def get_proxy_stats(proxy_pool: ProxyPool = Depends(get_proxy_pool)):
+    """Salud de cada proxy del pool (sin credenciales)."""
+    return proxy_pool.stats()
+
+
+@router.get("/seen-cache")
+async def get_seen_cache_stats(mongo_repository: MongoDBRepository = Depends(get_mongo_repository)):
+    """Aciertos, fallos y tasa de falsos positivos de la caché de trabajos ya guardados."""
+    if mongo_repository.seen_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **mongo_repository.seen_cache.stats()}
+
+
+@router.get("/extraction-cache")
+async def get_extraction_cache_stats(extraction_cache: ExtractionCache = Depends(get_extraction_cache)):
+    """Tasa de aciertos de la caché de extracciones con LLM y reducción del HTML enviado."""
+    stats = await extraction_cache.stats()
+    stats["html_reduction"] = reduction_stats.stats()
+    return stats
+
+
+@router.get("/http-clients")
+async def get_http_client_stats(http_clients: HTTPClientRegistry = Depends(get_http_clients)):
+    """Uso del pool de conexiones de cada cliente HTTP compartido."""
+    return http_clients.stats()
+
+
+@router.get("/transform-pool")
+async def get_transform_pool_stats(transform_executor: TransformExecutor = Depends(get_transform_executor)):
+    """Lotes de la transformación ETL ejecutados en el pool de procesos y en línea."""
+    return transform_executor.stats()
+
+
+@router.get("/duplicates")
+async def get_duplicate_stats(duplicate_detector: DuplicateDetector = Depends(get_duplicate_detector)):
+    """Firmas indexadas y tasa de casi duplicados descartados por fuente."""
+    return duplicate_detector.stats()
+
+
+@router.get("/card-parser")
+async def get_card_parser_stats():
+    """Páginas resueltas por el parser de tarjetas frente a las que pasaron al LLM, por fuente."""
+    return card_parser_stats.stats()
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import AsyncIterator, List
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+
+class JobSignatureRepository:
+    """Firmas SimHash de los trabajos publicados, para reconstruir el índice de duplicados al arrancar."""
+
+    def __init__(self, database: AsyncIOMotorDatabase, collection_name: str = "job_signatures"):
+        self.collection: AsyncIOMotorCollection = database[collection_name]
+
+    async def iter_all(self) -> AsyncIterator[dict]:
+        """Recorre todas las firmas guardadas (solo job_id, fuente y firma)."""
+        cursor = self.collection.find({}, {"source": 1, "simhash": 1}).batch_size(5000)
+        async for doc in cursor:
+            yield doc
+
+    async def save(self, documents: List[dict]):
+        """Guarda (upsert) varias firmas en una sola escritura."""
+        if not documents:
+            return
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {**doc, "updated_at": now}}, upsert=True)
+            for doc in documents
+        ]
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            # El índice en memoria sigue siendo válido; solo se pierde tras un reinicio
+            logging.error(f"Error saving job signatures: {str(e)}")
@@ -1,29 +1,84 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+from bson import ObjectId, Timestamp
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pydantic import TypeAdapter, ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
-from app.core.model.schemas import RawJobData, ProcessedJobData, JobSource
+from app.config.settings import settings
+from app.core.exceptions import MongoDBError
+from app.core.fingerprint import LISTING_FIELDS, content_fingerprint, listing_fingerprint
+from app.core.model.schemas import RawJobData, ProcessedJobData, JobSource, BulkUpsertResult, BulkUpsertItem, \
+    BulkUpsertStatus
+from app.core.seen_cache import SEEN_NEW, SEEN_UNCHANGED, SeenCache
 import logging
 
+# Posición en el recorrido de trabajos sin procesar: (created_at, _id)
+StreamPosition = Tuple[datetime, ObjectId]
+
+# Campos de raw_jobs que usa el ETL. Se excluye raw_data, que repite todo el
+# trabajo original y es la mayor parte de cada documento.
+RAW_JOB_ETL_PROJECTION = {
+    field: 1 for field in (
+        "source", "job_id", "title", "company", "description", "location", "url",
+        "salary_range", "requirements", "job_type", "experience_level", "processed", "created_at",
+    )
+}
+STRING_FIELDS = ("title", "company", "description", "location", "url", "job_type", "experience_level")
+
+# Valida un bloque de documentos en una sola llamada: en pydantic 2 es más
+# rápido que `RawJobData(**doc)` por documento e incluso que `model_construct`,
+# que rellena los valores por defecto en Python
+RAW_JOBS_ADAPTER = TypeAdapter(List[RawJobData])
+
+
+def _clean_string_field(value) -> str:
+    """Convierte a str los campos de texto; None y NaN (pandas) quedan como ''."""
+    if isinstance(value, str):
+        return '' if value.lower() == 'nan' else value
+    if isinstance(value, float) or value is None:
+        return ''
+    return str(value)
+
 
 class MongoDBRepository:
     """Repositorio para gestionar las operaciones con MongoDB."""
 
-    def __init__(self, mongodb_url: str, database: str):
+    def __init__(
+            self,
+            mongodb_url: str,
+            database: str,
+            collection_name: str = "raw_jobs",
+            seen_cache: Optional[SeenCache] = None,
+            **client_options
+    ):
+        """
+        Crea el cliente de MongoDB. Está pensado para instanciarse una sola vez
+        por proceso (al arrancar la aplicación) y compartirse entre peticiones;
+        `client_options` se pasan a `AsyncIOMotorClient` (p. ej. `maxPoolSize`).
+        Con `seen_cache` los guardados masivos evitan consultar MongoDB para
+        los trabajos sin cambios recientes o seguro nuevos.
+        """
+        self.seen_cache = seen_cache
         try:
-            self.client = AsyncIOMotorClient(mongodb_url)
-            # Verificar la conexión
-            self.client.admin.command('ping')
-            logging.info(f"Successfully connected to MongoDB at {mongodb_url}")
+            self.client = AsyncIOMotorClient(mongodb_url, **client_options)
+            logging.info(f"MongoDB client created with options: {client_options}")
 
             self.db = self.client[database]
-            self.raw_jobs_collection: AsyncIOMotorCollection = self.db.raw_jobs
-            logging.info(f"Using database: {database}, collection: raw_jobs")
+            self.raw_jobs_collection: AsyncIOMotorCollection = self.db[collection_name]
+            logging.info(f"Using database: {database}, collection: {collection_name}")
 
         except Exception as e:
             logging.error(f"Failed to connect to MongoDB: {str(e)}", exc_info=True)
             raise
 
+    def close(self):
+        """Cierra el cliente y su pool de conexiones."""
+        self.client.close()
+        logging.info("MongoDB client closed.")
+
     async def verify_connection(self) -> bool:
         """Verifica que la conexión a MongoDB esté funcionando."""
         try:
@@ -39,6 +94,28 @@ class MongoDBRepository:
         """Método para inicializar índices y otras configuraciones asincrónicas."""
         await self._setup_indexes()
 
+    async def warm_seen_cache(self):
+        """
+        Carga en la caché las huellas guardadas con un recorrido solo de
+        (source, url, content_hash). Si la colección cabe entera en la
+        capacidad del Bloom, sus negativos pasan a ser concluyentes.
+        """
+        if self.seen_cache is None:
+            return
+        total = await self.raw_jobs_collection.estimated_document_count()
+        capacity = self.seen_cache.bloom.capacity
+
+        cursor = self.raw_jobs_collection.find(
+            {}, {"_id": 0, "source": 1, "url": 1, "content_hash": 1}
+        ).batch_size(5000).limit(capacity + 1)
+        scanned = 0
+        async for doc in cursor:
+            self.seen_cache.add(doc.get("source"), doc.get("url"), doc.get("content_hash"))
+            scanned += 1
+
+        self.seen_cache.authoritative = scanned <= capacity and total <= capacity
+        logging.info(f"Seen cache warmed with {scanned} jobs (authoritative: {self.seen_cache.authoritative}).")
+
     async def _setup_indexes(self):
         """Configura los índices necesarios en MongoDB."""
         await self.raw_jobs_collection.create_index([
@@ -48,110 +125,388 @@ class MongoDBRepository:
 
         await self.raw_jobs_collection.create_index([
             ("processed", 1),
-            ("created_at", 1)
+            ("created_at", 1),
+            ("_id", 1)
         ])
 
-    async def save_raw_job(self, job_data: RawJobData) -> str:
-        try:
-            logging.info(f"Preparing to save job: {job_data.url}")
+        await self.raw_jobs_collection.create_index("job_id")
 
-            # Map the raw data fields correctly
-            job_dict = {
-                "source": job_data.source,
-                "job_id": job_data.raw_data.get('job_url'),
-                "title": job_data.raw_data.get('title'),
-                "company": job_data.raw_data.get('company'),
-                "description": job_data.raw_data.get('description'),
-                "location": job_data.raw_data.get('location'),
-                "url": job_data.raw_data.get('job_url'),
-                "salary_range": job_data.salary_range,
-                "requirements": job_data.requirements,
-                "job_type": job_data.raw_data.get('job_type'),
-                "experience_level": job_data.raw_data.get('job_level'),
-                "raw_data": job_data.raw_data,
-                "processed": False
-            }
+    def build_job_document(self, job_data: RawJobData) -> dict:
+        """Construye el documento a guardar en MongoDB a partir de los datos crudos."""
+        # Los datos de JobSpy traen la URL en `job_url`; el resto de scrapers en `url`
+        url = job_data.raw_data.get('job_url') or job_data.url
 
-            update_operation = {
-                "$set": {
-                    **job_dict,
-                    "updated_at": datetime.utcnow()
-                },
-                "$setOnInsert": {
-                    "created_at": datetime.utcnow()
-                }
+        # Map the raw data fields correctly
+        document = {
+            "source": job_data.source,
+            "job_id": url,
+            "title": job_data.raw_data.get('title'),
+            "company": job_data.raw_data.get('company'),
+            "description": job_data.raw_data.get('description'),
+            "location": job_data.raw_data.get('location'),
+            "url": url,
+            "salary_range": job_data.salary_range,
+            "requirements": job_data.requirements,
+            "job_type": job_data.raw_data.get('job_type'),
+            "experience_level": job_data.raw_data.get('job_level'),
+            "raw_data": job_data.raw_data,
+            "processed": False
+        }
+        document["content_hash"] = content_fingerprint(document)
+        return document
+
+    def _build_upsert(self, job_dict: dict) -> Tuple[dict, dict]:
+        """Construye el filtro y la operación de upsert para un documento de trabajo."""
+        now = datetime.utcnow()
+        filter_query = {
+            "source": job_dict["source"],
+            "url": job_dict["url"]
+        }
+        update_operation = {
+            "$set": {
+                **job_dict,
+                "updated_at": now
+            },
+            "$setOnInsert": {
+                "created_at": now
             }
+        }
+        return filter_query, update_operation
 
-            result = await self.raw_jobs_collection.update_one(
-                {
-                    "source": job_data.source,
-                    "url": job_data.raw_data.get('job_url')
-                },
-                update_operation,
-                upsert=True
-            )
+    async def save_raw_job(self, job_data: RawJobData) -> str:
+        try:
+            logging.info(f"Preparing to save job: {job_data.url}")
+
+            result = await self.save_raw_jobs_bulk([job_data])
+            item = result.items[0]
+            if item.status == BulkUpsertStatus.FAILED:
+                raise MongoDBError(item.error)
 
-            return str(result.upserted_id) if result.upserted_id else str(result.matched_count)
+            return item.upserted_id if item.upserted_id else "1"
 
         except Exception as e:
             logging.error(f"Error saving raw job: {str(e)}", exc_info=True)
             raise
 
-    async def get_unprocessed_jobs(self, limit: int = 100) -> List[RawJobData]:
-        """Obtiene trabajos que no han sido procesados."""
+    async def _find_content_hashes(self, documents: List[dict]) -> Dict[Tuple[str, str], Optional[str]]:
+        """Obtiene la huella de contenido guardada para los (source, url) dados en una sola consulta."""
+        urls_by_source = defaultdict(list)
+        for document in documents:
+            urls_by_source[document["source"]].append(document["url"])
+
         cursor = self.raw_jobs_collection.find(
-            {"processed": False}
-        ).sort("created_at", 1).limit(limit)
+            {"$or": [{"source": source, "url": {"$in": urls}} for source, urls in urls_by_source.items()]},
+            {"_id": 0, "source": 1, "url": 1, "content_hash": 1}
+        )
+        return {(doc["source"], doc.get("url")): doc.get("content_hash") async for doc in cursor}
+
+    async def find_listing_fingerprints(
+            self,
+            urls_by_source: Dict[str, List[str]]
+    ) -> Dict[Tuple[str, str], str]:
+        """
+        Devuelve la huella de listado (`listing_fingerprint` de su `raw_data`)
+        de los (source, url) que ya están en `raw_jobs`, en una sola consulta
+        que solo trae los campos del listado.
+        """
+        urls_by_source = {source: urls for source, urls in urls_by_source.items() if urls}
+        if not urls_by_source:
+            return {}
+        projection = {"_id": 0, "source": 1, "url": 1, **{f"raw_data.{field}": 1 for field in LISTING_FIELDS}}
+        cursor = self.raw_jobs_collection.find(
+            {"$or": [{"source": source, "url": {"$in": urls}} for source, urls in urls_by_source.items()]},
+            projection
+        )
+        return {
+            (doc["source"], doc.get("url")): listing_fingerprint(doc.get("raw_data") or {})
+            async for doc in cursor
+        }
+
+    async def save_raw_jobs_bulk(
+            self,
+            jobs: Sequence[Union[RawJobData, dict]],
+            chunk_size: Optional[int] = None
+    ) -> BulkUpsertResult:
+        """
+        Guarda un lote de trabajos con `bulk_write` no ordenado, en bloques de `chunk_size`.
+
+        Acepta objetos `RawJobData` o documentos ya preparados con la forma de
+        `build_job_document`. Antes de escribir compara la huella de contenido
+        con la guardada: los trabajos sin cambios no se escriben (y conservan su
+        `processed`), los nuevos o modificados se guardan con `processed: False`.
+        Devuelve el resultado de cada documento con el índice que ocupaba en `jobs`.
+        """
+        chunk_size = chunk_size or settings.MONGO_BULK_CHUNK_SIZE
+        result = BulkUpsertResult()
+
+        documents = [
+            self.build_job_document(job) if isinstance(job, RawJobData) else job
+            for job in jobs
+        ]
+
+        for offset in range(0, len(documents), chunk_size):
+            chunk = documents[offset:offset + chunk_size]
+            for document in chunk:
+                if "content_hash" not in document:
+                    document["content_hash"] = content_fingerprint(document)
+
+            # La caché resuelve los trabajos sin cambios recientes y los seguro nuevos;
+            # solo el resto necesita consultar las huellas guardadas
+            pending = []
+            unresolved = []
+            unclassified = set()
+            for index, document in enumerate(chunk):
+                seen = self.seen_cache.lookup(document["source"], document["url"], document["content_hash"]) \
+                    if self.seen_cache is not None else None
+                if seen == SEEN_UNCHANGED:
+                    result.unchanged += 1
+                    result.items.append(BulkUpsertItem(status=BulkUpsertStatus.UNCHANGED,
+                                                       index=offset + index, url=document.get("url")))
+                elif seen == SEEN_NEW:
+                    # Nuevo o modificado: se distingue tras escribir (upserted / matched)
+                    pending.append(index)
+                    unclassified.add(index)
+                else:
+                    unresolved.append(index)
+
+            stored_hashes = {}
+            if unresolved:
+                try:
+                    stored_hashes = await self._find_content_hashes([chunk[index] for index in unresolved])
+                except Exception as e:
+                    logging.error(f"Error reading content hashes, writing all {len(unresolved)} jobs: {str(e)}")
+
+            # Clasificar cada documento y escribir solo los nuevos o modificados
+            for index in unresolved:
+                document = chunk[index]
+                key = (document["source"], document["url"])
+                if key not in stored_hashes:
+                    result.new += 1
+                    pending.append(index)
+                elif stored_hashes[key] != document["content_hash"]:
+                    result.changed += 1
+                    pending.append(index)
+                else:
+                    result.unchanged += 1
+                    result.items.append(BulkUpsertItem(status=BulkUpsertStatus.UNCHANGED,
+                                                       index=offset + index, url=document.get("url")))
+                    if self.seen_cache is not None:
+                        self.seen_cache.add(document["source"], document["url"], document["content_hash"])
+
+            if not pending:
+                continue
+
+            operations = [UpdateOne(*self._build_upsert(chunk[index]), upsert=True) for index in pending]
 
-        jobs = []
-        async for doc in cursor:
             try:
-                # Función helper para limpiar campos que deberían ser strings
-                def clean_string_field(value):
-                    if isinstance(value, float) or value is None or str(value).lower() == 'nan':
-                        return ''
-                    return str(value)
-
-                # Limpiar los campos problemáticos
-                doc['description'] = clean_string_field(doc.get('description'))
-                doc['job_type'] = clean_string_field(doc.get('job_type'))
-                doc['experience_level'] = clean_string_field(doc.get('experience_level'))
-
-                # Asegurarse de que todos los campos requeridos existan
-                required_fields = {
-                    'source': doc.get('source'),
-                    'job_id': doc.get('job_id'),
-                    'title': clean_string_field(doc.get('title')),
-                    'company': clean_string_field(doc.get('company')),
-                    'description': clean_string_field(doc.get('description')),
-                    'location': clean_string_field(doc.get('location')),
-                    'url': clean_string_field(doc.get('url')),
-                    'salary_range': doc.get('salary_range'),
-                    'requirements': doc.get('requirements', []),
-                    'job_type': clean_string_field(doc.get('job_type')),
-                    'experience_level': clean_string_field(doc.get('experience_level')),
-                    'processed': doc.get('processed', False),
-                    'created_at': doc.get('created_at', datetime.utcnow()),
-                    'raw_data': doc.get('raw_data', {})
-                }
+                write_result = await self.raw_jobs_collection.bulk_write(operations, ordered=False)
+                details = write_result.bulk_api_result
+            except BulkWriteError as e:
+                details = e.details
+            except Exception as e:
+                logging.error(f"Error in bulk upsert of {len(operations)} jobs: {str(e)}", exc_info=True)
+                for index in pending:
+                    result.items.append(BulkUpsertItem(
+                        index=offset + index,
+                        url=chunk[index].get("url"),
+                        status=BulkUpsertStatus.FAILED,
+                        error=str(e)
+                    ))
+                result.failed += len(pending)
+                continue
 
-                # Crear el objeto RawJobData con los campos procesados
-                raw_job = RawJobData(**required_fields)
-                jobs.append(raw_job)
-                logging.debug(f"Successfully processed job: {doc.get('job_id')}")
+            # Los índices de bulk_api_result se refieren a `operations`
+            upserted = {item["index"]: item["_id"] for item in details.get("upserted", [])}
+            errors = {item["index"]: item.get("errmsg") for item in details.get("writeErrors", [])}
 
+            for op_index, index in enumerate(pending):
+                document = chunk[index]
+                if op_index in errors:
+                    item = BulkUpsertItem(status=BulkUpsertStatus.FAILED, error=errors[op_index],
+                                          index=offset + index, url=document.get("url"))
+                    result.failed += 1
+                elif op_index in upserted:
+                    item = BulkUpsertItem(status=BulkUpsertStatus.UPSERTED, upserted_id=str(upserted[op_index]),
+                                          index=offset + index, url=document.get("url"))
+                    result.upserted += 1
+                    if index in unclassified:
+                        result.new += 1
+                else:
+                    item = BulkUpsertItem(status=BulkUpsertStatus.MATCHED,
+                                          index=offset + index, url=document.get("url"))
+                    result.matched += 1
+                    if index in unclassified:
+                        result.changed += 1
+                result.items.append(item)
+
+                if item.status != BulkUpsertStatus.FAILED and self.seen_cache is not None:
+                    self.seen_cache.add(document["source"], document["url"], document["content_hash"])
+
+        result.items.sort(key=lambda item: item.index)
+        logging.info(
+            f"Bulk upsert finished: {result.new} new, {result.changed} changed, {result.unchanged} unchanged "
+            f"({result.upserted} upserted, {result.matched} matched, {result.failed} failed)."
+        )
+        return result
+
+    @staticmethod
+    def _raw_job_fields(doc: dict) -> dict:
+        """Campos de RawJobData de un documento de MongoDB, con los de texto limpios."""
+        fields = {field: _clean_string_field(doc.get(field)) for field in STRING_FIELDS}
+        fields.update(
+            source=doc.get('source'),
+            job_id=doc.get('job_id'),
+            salary_range=doc.get('salary_range'),
+            requirements=doc.get('requirements', []),
+            processed=doc.get('processed', False),
+            created_at=doc.get('created_at', datetime.utcnow()),
+            # Con la proyección del ETL no viene: no se usa para transformar
+            raw_data=doc.get('raw_data', {}),
+        )
+        if 'updated_at' in doc:
+            fields['updated_at'] = doc['updated_at']
+        return fields
+
+    def docs_to_raw_jobs(self, docs: List[dict]) -> List[RawJobData]:
+        """Convierte documentos de MongoDB en RawJobData, descartando los inválidos."""
+        fields = [self._raw_job_fields(doc) for doc in docs]
+        try:
+            return RAW_JOBS_ADAPTER.validate_python(fields)
+        except ValidationError:
+            pass
+
+        # Algún documento no es válido: se valida uno a uno para descartar solo esos
+        jobs = []
+        for doc, job_fields in zip(docs, fields):
+            try:
+                jobs.append(RawJobData(**job_fields))
             except Exception as e:
                 logging.error(f"Error processing document from MongoDB: {str(e)}",
                               extra={"document": str(doc)})
-                continue
+        return jobs
+
+    async def get_unprocessed_jobs(self, limit: int = 100) -> List[RawJobData]:
+        """Obtiene trabajos que no han sido procesados."""
+        cursor = self.raw_jobs_collection.find(
+            {"processed": False}, RAW_JOB_ETL_PROJECTION
+        ).sort("created_at", 1).limit(limit)
+
+        jobs = self.docs_to_raw_jobs(await cursor.to_list(length=limit))
 
         logging.info(f"Found {len(jobs)} unprocessed jobs.")
         return jobs
 
+    async def get_unprocessed_jobs_by_ids(self, ids: Sequence[ObjectId]) -> List[RawJobData]:
+        """Relee los trabajos indicados que siguen sin procesar (descarta los ya publicados)."""
+        if not ids:
+            return []
+        cursor = self.raw_jobs_collection.find(
+            {"_id": {"$in": list(ids)}, "processed": False}, RAW_JOB_ETL_PROJECTION
+        ).sort([("created_at", 1), ("_id", 1)])
+        return self.docs_to_raw_jobs(await cursor.to_list(length=len(ids)))
+
+    async def iter_unprocessed_jobs(
+            self,
+            chunk_size: int = 200,
+            after: Optional[StreamPosition] = None
+    ) -> AsyncIterator[Tuple[List[RawJobData], StreamPosition]]:
+        """
+        Recorre todos los trabajos sin procesar en orden (created_at, _id), por bloques.
+
+        Cada bloque es una consulta paginada por clave a partir de la última
+        posición, de modo que la memoria queda acotada a `chunk_size` documentos
+        y no se mantiene un cursor abierto mientras se publica. Devuelve, junto
+        a cada bloque, la posición de su último documento para usarla como checkpoint.
+        """
+        position = after
+        while True:
+            filter_query = {"processed": False}
+            if position is not None:
+                created_at, last_id = position
+                filter_query["$or"] = [
+                    {"created_at": {"$gt": created_at}},
+                    {"created_at": created_at, "_id": {"$gt": last_id}},
+                ]
+
+            cursor = self.raw_jobs_collection.find(filter_query, RAW_JOB_ETL_PROJECTION).sort(
+                [("created_at", 1), ("_id", 1)]
+            ).limit(chunk_size)
+            docs = await cursor.to_list(length=chunk_size)
+            if not docs:
+                return
+
+            position = (docs[-1].get("created_at"), docs[-1]["_id"])
+            yield self.docs_to_raw_jobs(docs), position
+
+            if len(docs) < chunk_size:
+                return
+
+    async def get_etl_checkpoint(self, name: str) -> Optional[StreamPosition]:
+        """Obtiene la última posición confirmada de un recorrido del ETL."""
+        doc = await self.db.etl_checkpoints.find_one({"_id": name})
+        if not doc:
+            return None
+        return doc["created_at"], doc["last_id"]
+
+    async def save_etl_checkpoint(self, name: str, position: StreamPosition):
+        created_at, last_id = position
+        await self.db.etl_checkpoints.update_one(
+            {"_id": name},
+            {"$set": {"created_at": created_at, "last_id": last_id, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    async def clear_etl_checkpoint(self, name: str):
+        await self.db.etl_checkpoints.delete_one({"_id": name})
+
+    async def get_resume_token(self, name: str) -> Optional[dict]:
+        """Obtiene el resume token guardado de un change stream."""
+        doc = await self.db.etl_checkpoints.find_one({"_id": name})
+        return doc.get("resume_token") if doc else None
+
+    async def save_resume_token(self, name: str, resume_token: Optional[dict]):
+        await self.db.etl_checkpoints.update_one(
+            {"_id": name},
+            {"$set": {"resume_token": resume_token, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    async def get_cluster_time(self) -> Optional[Timestamp]:
+        """Hora lógica actual del replica set (None si MongoDB no la informa, p. ej. standalone)."""
+        response = await self.db.command("hello")
+        return response.get("operationTime") or response.get("$clusterTime", {}).get("clusterTime")
+
+    def watch_unprocessed_jobs(
+            self,
+            resume_after: Optional[dict] = None,
+            max_await_time_ms: int = 500,
+            start_at_operation_time: Optional[Timestamp] = None
+    ):
+        """
+        Abre un change stream sobre raw_jobs filtrado a inserciones/actualizaciones
+        de trabajos con `processed: False`. Requiere un replica set. Sin resume
+        token, `start_at_operation_time` fija desde qué momento se reciben cambios.
+        """
+        pipeline = [
+            {"$match": {
+                "operationType": {"$in": ["insert", "update", "replace"]},
+                "fullDocument.processed": False,
+            }},
+            # El worker relee los documentos antes de publicar: del evento solo usa el _id
+            {"$project": {"operationType": 1, "fullDocument._id": 1}},
+        ]
+        return self.raw_jobs_collection.watch(
+            pipeline,
+            full_document="updateLookup",
+            resume_after=resume_after,
+            start_at_operation_time=None if resume_after is not None else start_at_operation_time,
+            max_await_time_ms=max_await_time_ms
+        )
+
     async def mark_job_as_processed(self, job_id: str) -> bool:
         """Marca un trabajo como procesado."""
         result = await self.raw_jobs_collection.update_one(
-            {"_id": job_id},
+            {"job_id": job_id},
             {
                 "$set": {
                     "processed": True,
@@ -161,6 +516,42 @@ class MongoDBRepository:
         )
         return result.modified_count > 0
 
+    async def mark_jobs_as_processed(self, job_ids: List[str]) -> int:
+        """Marca varios trabajos como procesados con un único `update_many`."""
+        job_ids = [job_id for job_id in job_ids if job_id]
+        if not job_ids:
+            return 0
+
+        result = await self.raw_jobs_collection.update_many(
+            {"job_id": {"$in": job_ids}},
+            {
+                "$set": {
+                    "processed": True,
+                    "updated_at": datetime.utcnow()
+                }
+            }
+        )
+        return result.modified_count
+
+    async def mark_jobs_as_duplicates(self, duplicates: Dict[str, str]) -> int:
+        """
+        Marca como procesados los casi duplicados ({job_id: job_id original})
+        guardando en `duplicate_of` la oferta que sí se publicó.
+        """
+        if not duplicates:
+            return 0
+
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"job_id": job_id},
+                {"$set": {"processed": True, "duplicate_of": original_id, "updated_at": now}}
+            )
+            for job_id, original_id in duplicates.items()
+        ]
+        result = await self.raw_jobs_collection.bulk_write(operations, ordered=False)
+        return result.modified_count
+
     async def get_jobs_by_source(
             self,
             source: JobSource,
@@ -172,5 +563,5 @@ class MongoDBRepository:
         if processed is not None:
             filter_query["processed"] = processed
 
-        cursor = self.raw_jobs_collection.find(filter_query).limit(limit)
-        return [RawJobData(**doc) async for doc in cursor]
+        cursor = self.raw_jobs_collection.find(filter_query, {"_id": 0}).limit(limit)
+        return self.docs_to_raw_jobs(await cursor.to_list(length=limit))
@@ -0,0 +1,31 @@
+from typing import Dict, List
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+
+class ProxyStatsRepository:
+    """Estadísticas de salud de los proxies, para conservarlas entre reinicios."""
+
+    def __init__(self, database: AsyncIOMotorDatabase, collection_name: str = "proxy_stats"):
+        self.collection: AsyncIOMotorCollection = database[collection_name]
+
+    async def load(self, labels: List[str]) -> Dict[str, dict]:
+        """Devuelve las estadísticas guardadas de los proxies indicados, por etiqueta."""
+        cursor = self.collection.find({"_id": {"$in": labels}})
+        return {doc["_id"]: doc async for doc in cursor}
+
+    async def save(self, documents: List[dict]):
+        """Guarda (upsert) las estadísticas de varios proxies en una sola escritura."""
+        if not documents:
+            return
+        operations = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": doc}, upsert=True)
+            for doc in documents
+        ]
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            # Las estadísticas son orientativas: un fallo al guardarlas no debe romper el scraping
+            logging.error(f"Error saving proxy stats: {str(e)}")
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import hashlib
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.model.schemas import ScrapeJob, ScrapeJobStatus, ScrapingRequest
+
+ACTIVE_STATUSES = [ScrapeJobStatus.PENDING.value, ScrapeJobStatus.RUNNING.value]
+
+
+def build_request_key(request: ScrapingRequest) -> str:
+    """Genera una clave estable para detectar solicitudes de scraping duplicadas."""
+    keywords = sorted(keyword.strip().lower() for keyword in request.keywords)
+    country = (request.country or "").strip().lower()
+    raw_key = "|".join(keywords) + "#" + country
+    return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()
+
+
+class ScrapeJobRepository:
+    """Cola persistente de trabajos de scraping respaldada por MongoDB."""
+
+    def __init__(self, database: AsyncIOMotorDatabase, collection_name: str = "scrape_jobs"):
+        self.collection: AsyncIOMotorCollection = database[collection_name]
+
+    async def initialize(self):
+        """Configura los índices de la cola."""
+        await self.collection.create_index("job_id", unique=True)
+        await self.collection.create_index([("status", 1), ("created_at", 1)])
+        # Solo los trabajos activos tienen `active_key`; evita encolar dos veces la misma solicitud
+        await self.collection.create_index("active_key", unique=True, sparse=True)
+
+    async def enqueue(self, request: ScrapingRequest) -> Tuple[ScrapeJob, bool]:
+        """
+        Encola una solicitud de scraping.
+
+        Returns:
+            (trabajo, creado): si ya existe un trabajo activo para la misma
+            solicitud se devuelve ese trabajo con `creado=False`.
+        """
+        request_key = build_request_key(request)
+        job = ScrapeJob(request=request, request_key=request_key)
+        document = {**job.dict(), "active_key": request_key}
+
+        try:
+            await self.collection.insert_one(document)
+            logging.info(f"Enqueued scrape job {job.job_id}")
+            return job, True
+        except DuplicateKeyError:
+            existing = await self.collection.find_one({"active_key": request_key})
+            if existing is None:
+                # El trabajo activo terminó entre el insert y la consulta; reintentar
+                return await self.enqueue(request)
+            logging.info(f"Scrape request already queued as job {existing['job_id']}")
+            return self._to_model(existing), False
+
+    async def claim_next(self, worker_id: str, lease_seconds: int) -> Optional[ScrapeJob]:
+        """
+        Reclama el trabajo pendiente más antiguo, o uno en ejecución cuyo lease
+        haya expirado (p. ej. tras un reinicio del servicio).
+        """
+        now = datetime.utcnow()
+        doc = await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": ScrapeJobStatus.PENDING.value},
+                    {"status": ScrapeJobStatus.RUNNING.value, "lease_expires_at": {"$lt": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": ScrapeJobStatus.RUNNING.value,
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._to_model(doc) if doc else None
+
+    async def update_progress(
+            self,
+            job_id: str,
+            lease_seconds: int,
+            **counters: int
+    ):
+        """Actualiza los contadores de progreso y renueva el lease del trabajo."""
+        update = {f"progress.{name}": value for name, value in counters.items()}
+        update["lease_expires_at"] = datetime.utcnow() + timedelta(seconds=lease_seconds)
+        await self.collection.update_one({"job_id": job_id}, {"$set": update})
+
+    async def complete(self, job_id: str, result: dict):
+        await self._finish(job_id, ScrapeJobStatus.COMPLETED, result=result)
+
+    async def fail(self, job_id: str, error: str):
+        await self._finish(job_id, ScrapeJobStatus.FAILED, error=error)
+
+    async def release(self, job_id: str):
+        """Devuelve a la cola un trabajo interrumpido (p. ej. al apagar el servicio)."""
+        await self.collection.update_one(
+            {"job_id": job_id, "status": ScrapeJobStatus.RUNNING.value},
+            {
+                "$set": {"status": ScrapeJobStatus.PENDING.value},
+                "$unset": {"lease_expires_at": "", "worker_id": ""},
+            }
+        )
+
+    async def get(self, job_id: str) -> Optional[ScrapeJob]:
+        doc = await self.collection.find_one({"job_id": job_id})
+        return self._to_model(doc) if doc else None
+
+    async def list_jobs(
+            self,
+            status: Optional[ScrapeJobStatus] = None,
+            limit: int = 50
+    ) -> List[ScrapeJob]:
+        filter_query = {}
+        if status is not None:
+            filter_query["status"] = status.value
+        cursor = self.collection.find(filter_query).sort("created_at", -1).limit(limit)
+        return [self._to_model(doc) async for doc in cursor]
+
+    async def _finish(
+            self,
+            job_id: str,
+            status: ScrapeJobStatus,
+            result: Optional[dict] = None,
+            error: Optional[str] = None
+    ):
+        await self.collection.update_one(
+            {"job_id": job_id},
+            {
+                "$set": {
+                    "status": status.value,
+                    "result": result,
+                    "error": error,
+                    "finished_at": datetime.utcnow(),
+                },
+                "$unset": {"active_key": "", "lease_expires_at": ""},
+            }
+        )
+
+    @staticmethod
+    def _to_model(doc: dict) -> ScrapeJob:
+        doc.pop("_id", None)
+        return ScrapeJob(**doc)
@@ -1,22 +1,69 @@
+import asyncio
 import json
 import logging
 from contextlib import asynccontextmanager
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 
 from aiokafka import AIOKafkaProducer
 from app.config.settings import settings
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin él se usa json de la librería estándar
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(value: Dict[str, Any]) -> bytes:
+    return json.dumps(value).encode('utf-8')
+
+
+def get_serializer(name: str) -> Callable[[Dict[str, Any]], bytes]:
+    """Devuelve la función de serialización configurada ("json" u "orjson")."""
+    if name == "orjson":
+        if orjson is not None:
+            return orjson.dumps
+        logger.warning("orjson is not installed; falling back to json serializer")
+    elif name != "json":
+        raise ValueError(f"Unknown Kafka serializer: {name}")
+    return _json_dumps
+
+
+def build_producer_config() -> Dict[str, Any]:
+    """Perfil del producer (compresión, linger, batching, acks, idempotencia) definido en settings."""
+    acks = settings.KAFKA_ACKS
+    return {
+        "request_timeout_ms": settings.KAFKA_REQUEST_TIMEOUT_MS,
+        "compression_type": settings.KAFKA_COMPRESSION_TYPE or None,
+        "linger_ms": settings.KAFKA_LINGER_MS,
+        "max_batch_size": settings.KAFKA_MAX_BATCH_SIZE,
+        "max_request_size": settings.KAFKA_MAX_REQUEST_SIZE,
+        "acks": acks if acks == "all" else int(acks),
+        "enable_idempotence": settings.KAFKA_ENABLE_IDEMPOTENCE,
+    }
+
+
 class KafkaProducer:
-    def __init__(self):
+    def __init__(
+            self,
+            serializer: Optional[str] = None,
+            **producer_options
+    ):
+        """
+        Args:
+            serializer: "json" u "orjson"; por defecto `settings.KAFKA_SERIALIZER`
+            producer_options: Sobrescriben el perfil de `build_producer_config`
+        """
+        config = {**build_producer_config(), **producer_options}
+        self._dumps = get_serializer(serializer or settings.KAFKA_SERIALIZER)
         self._producer = AIOKafkaProducer(
             bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
             value_serializer=self._serialize_value,
-            request_timeout_ms=10000
+            **config
         )
         self._started = False
+        logger.info(f"Kafka producer configured with profile: {config}")
 
     def _serialize_value(self, value: Dict[str, Any]) -> bytes:
         """
@@ -38,7 +85,7 @@ class KafkaProducer:
             if not isinstance(metadata, dict):
                 raise ValueError("Metadata must be a dictionary")
 
-            return json.dumps(value).encode('utf-8')
+            return self._dumps(value)
         except Exception as e:
             logger.error(f"Error serializing event: {str(e)}")
             raise
@@ -94,6 +141,49 @@ class KafkaProducer:
             logger.error(f"Event that failed: {event}")
             raise
 
+    async def send_events_batch(
+            self,
+            topic: str,
+            events: List[Dict[str, Any]],
+            max_in_flight: Optional[int] = None
+    ) -> List[Optional[BaseException]]:
+        """
+        Envía un lote de eventos sin esperar cada confirmación por separado.
+
+        Los envíos se encolan en el producer con `send` (que agrupa los mensajes
+        en batches) manteniendo como máximo `max_in_flight` mensajes sin
+        confirmar, y después se esperan todas las confirmaciones.
+
+        Returns:
+            list: Por cada evento, None si fue confirmado o la excepción del fallo
+        """
+        if not self._started:
+            await self.start()
+
+        in_flight = asyncio.Semaphore(max_in_flight or settings.KAFKA_MAX_IN_FLIGHT)
+        loop = asyncio.get_running_loop()
+        futures = []
+
+        for event in events:
+            await in_flight.acquire()
+            try:
+                future = await self._producer.send(topic, event)
+            except Exception as e:
+                in_flight.release()
+                logger.error(f"Failed to enqueue event to topic {topic}: {str(e)}")
+                future = loop.create_future()
+                future.set_exception(e)
+            else:
+                future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        errors = [result if isinstance(result, BaseException) else None for result in results]
+
+        failed = sum(1 for error in errors if error is not None)
+        logger.info(f"Sent batch of {len(events)} events to topic {topic} ({failed} failed)")
+        return errors
+
     async def __aenter__(self):
         await self.start()
         return self
@@ -22,3 +22,8 @@ class ETLError(ScraperException):
 class KafkaError(ScraperException):
     """Raised when there's an error with Kafka operations."""
     pass
+
+
+class CircuitOpenError(ScrapingError):
+    """Raised when a site's circuit breaker is open and requests are paused."""
+    pass
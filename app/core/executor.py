@@ -0,0 +1,133 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Optional
+
+from jobspy import scrape_jobs
+
+from app.config.settings import settings
+from app.core.exceptions import ScrapingError
+from app.core.proxy_pool import ProxyPool
+from app.core.rate_limit import RateLimiterRegistry, rate_limiter as default_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeExecutor:
+    """
+    Pool acotado de hilos para ejecutar llamadas bloqueantes de scraping
+    (p. ej. `jobspy.scrape_jobs`) fuera del event loop.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            timeout: Optional[float] = None,
+            rate_limiter: Optional[RateLimiterRegistry] = None,
+            proxy_pool: Optional[ProxyPool] = None
+    ):
+        self.max_workers = max_workers or settings.SCRAPE_EXECUTOR_MAX_WORKERS
+        self.timeout = timeout if timeout is not None else settings.SCRAPE_EXECUTOR_TIMEOUT_SECONDS
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.proxy_pool = proxy_pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="scrape-worker"
+        )
+        # Limita las llamadas en vuelo para no encolar trabajo sin límite en el pool
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._running = 0
+        self._closed = False
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Se crea perezosamente para enlazarse al loop en ejecución
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def run(
+            self,
+            func: Callable[..., Any],
+            *args,
+            timeout: Optional[float] = None,
+            **kwargs
+    ) -> Any:
+        """
+        Ejecuta `func(*args, **kwargs)` en el pool y espera el resultado sin bloquear el loop.
+
+        Si se supera el timeout se lanza `ScrapingError`. El hilo no puede
+        interrumpirse, pero su resultado se descarta.
+        """
+        if self._closed:
+            raise ScrapingError("Scrape executor is shut down")
+
+        call_timeout = timeout if timeout is not None else self.timeout
+        loop = asyncio.get_running_loop()
+
+        async with self._get_semaphore():
+            self._running += 1
+            try:
+                future = loop.run_in_executor(
+                    self._executor,
+                    functools.partial(func, *args, **kwargs)
+                )
+                return await asyncio.wait_for(future, timeout=call_timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Scrape call {getattr(func, '__name__', func)} timed out after {call_timeout}s")
+                raise ScrapingError(f"Scrape call timed out after {call_timeout} seconds")
+            finally:
+                self._running -= 1
+
+    async def scrape_jobs(self, **kwargs):
+        """
+        Ejecuta `jobspy.scrape_jobs` en el pool con los parámetros dados,
+        respetando el límite de peticiones de cada sitio de `site_name`.
+
+        Si no se pasan `proxies` y hay un pool configurado, se usan los
+        proxies que este asigne; con un único proxy el límite se aplica por
+        sitio y proxy, de modo que el ritmo total escala con los proxies sanos.
+        """
+        site_name = kwargs.get("site_name") or []
+        sites = [site_name] if isinstance(site_name, str) else [str(site) for site in site_name]
+
+        async with AsyncExitStack() as stack:
+            lease = None
+            if kwargs.get("proxies") is None and self.proxy_pool is not None and self.proxy_pool.enabled:
+                lease = await stack.enter_async_context(self.proxy_pool.lease())
+                kwargs["proxies"] = lease.proxies
+
+            suffix = f":{lease.label}" if lease is not None and lease.label else ""
+            attempts = {
+                site: await stack.enter_async_context(self.rate_limiter.limit(site + suffix))
+                for site in sites
+            }
+            jobs_df = await self.run(scrape_jobs, **kwargs)
+
+            # JobSpy registra los 429 y devuelve filas vacías, así que un sitio sin filas cuenta como vacío
+            found_sites = set()
+            if jobs_df is not None and not jobs_df.empty and "site" in jobs_df.columns:
+                found_sites = set(jobs_df["site"].astype(str).str.lower())
+            for site, attempt in attempts.items():
+                attempt.empty = site.lower() not in found_sites
+            if lease is not None:
+                lease.empty = not found_sites
+            return jobs_df
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def shutdown(self, wait: bool = False):
+        """Detiene el pool. Las llamadas en curso terminan en segundo plano si `wait` es False."""
+        if not self._closed:
+            self._closed = True
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("Scrape executor shut down.")
+
+
+# Instancia compartida por el proceso: un único límite de concurrencia para
+# todos los scrapers, con el limitador de peticiones compartido. El pool de
+# proxies se asigna al arrancar la aplicación (`main.py`).
+scrape_executor = ScrapeExecutor()
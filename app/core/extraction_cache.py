@@ -0,0 +1,197 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from app.config.settings import settings
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis es opcional
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+_SCRIPT_STYLE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_html(html: str) -> str:
+    """Quita scripts/estilos (tokens y timestamps que cambian en cada visita) y colapsa espacios."""
+    return _WHITESPACE.sub(" ", _SCRIPT_STYLE.sub("", html)).strip()
+
+
+def extraction_key(prompt: str, html: Optional[str] = None, url: Optional[str] = None) -> str:
+    """Clave por contenido: hash del HTML normalizado (o de la URL si no hay HTML) y del prompt."""
+    digest = hashlib.sha256()
+    digest.update(_WHITESPACE.sub(" ", prompt).strip().encode("utf-8"))
+    digest.update(b"\x1f")
+    if html is not None:
+        digest.update(b"html:" + normalize_html(html).encode("utf-8"))
+    else:
+        digest.update(b"url:" + (url or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _MemoryBackend:
+    """LRU en memoria con expiración, usado si no hay Redis configurado o disponible."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int):
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+    async def close(self):
+        self._entries.clear()
+
+
+class _RedisBackend:
+    """
+    Valores con TTL en Redis más un sorted set (clave -> último uso) que
+    acota el número de entradas: al superar `max_entries` se expulsan las
+    menos usadas.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str, max_entries: int):
+        self.client = client
+        self.prefix = prefix
+        self.index_key = f"{prefix}index"
+        self.max_entries = max_entries
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            await self.client.zrem(self.index_key, key)
+            return None
+        await self.client.zadd(self.index_key, {key: time.time()})
+        return value
+
+    async def set(self, key: str, value: str, ttl: int):
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + key, value, ex=ttl)
+            pipe.zadd(self.index_key, {key: time.time()})
+            pipe.zcard(self.index_key)
+            *_, size = await pipe.execute()
+
+        overflow = size - self.max_entries
+        if overflow > 0:
+            evicted = await self.client.zpopmin(self.index_key, overflow)
+            if evicted:
+                await self.client.delete(*(self.prefix + member for member, _ in evicted))
+
+    async def size(self) -> int:
+        return await self.client.zcard(self.index_key)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class ExtractionCache:
+    """
+    Caché de resultados de extracción con LLM (SmartScraperTool), direccionada
+    por contenido: una página sin cambios con el mismo prompt no vuelve a
+    llamar al LLM. Usa Redis si `REDIS_URL` está configurado y, si no, o si
+    Redis falla, un LRU en memoria.
+    """
+
+    def __init__(
+            self,
+            redis_url: Optional[str] = None,
+            ttl_seconds: Optional[int] = None,
+            max_entries: Optional[int] = None
+    ):
+        self.redis_url = redis_url if redis_url is not None else settings.REDIS_URL
+        self.ttl_seconds = ttl_seconds or settings.EXTRACTION_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.EXTRACTION_CACHE_MAX_ENTRIES
+        self._backend = None
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _get_backend(self):
+        # Se crea perezosamente para enlazar el cliente de Redis al loop en ejecución
+        if self._backend is None:
+            if self.redis_url and redis_asyncio is not None:
+                client = redis_asyncio.from_url(self.redis_url, decode_responses=True)
+                self._backend = _RedisBackend(client, settings.EXTRACTION_CACHE_PREFIX, self.max_entries)
+            else:
+                self._backend = _MemoryBackend(self.max_entries)
+        return self._backend
+
+    def _fall_back_to_memory(self, error: Exception):
+        logger.error(f"Extraction cache backend failed, using in-memory cache: {str(error)}")
+        self.errors += 1
+        self._backend = _MemoryBackend(self.max_entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            value = await self._get_backend().get(key)
+        except Exception as e:
+            self._fall_back_to_memory(e)
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        try:
+            await self._get_backend().set(key, json.dumps(value, default=str), ttl or self.ttl_seconds)
+        except Exception as e:
+            self._fall_back_to_memory(e)
+
+    async def close(self):
+        if self._backend is not None:
+            await self._backend.close()
+            self._backend = None
+
+    async def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        backend = self._get_backend()
+        try:
+            entries = await backend.size()
+        except Exception:
+            entries = None
+        return {
+            "backend": backend.name,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Instancia compartida por el proceso, como `rate_limiter`
+extraction_cache = ExtractionCache()
@@ -0,0 +1,39 @@
+import hashlib
+import math
+from typing import Any
+
+# Campos que definen el contenido de una oferta; otros cambios (fechas, ids) no cuentan
+FINGERPRINT_FIELDS = ("title", "company", "description", "salary_range", "location", "job_type")
+
+
+def _normalize_value(value: Any) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    # Colapsar espacios para que el formato del scraping no genere cambios falsos
+    return " ".join(str(value).split())
+
+
+def content_fingerprint(document: dict) -> str:
+    """
+    Calcula una huella estable del contenido de un documento de trabajo
+    (título, empresa, descripción, salario, ubicación y tipo).
+    """
+    payload = "\x1f".join(_normalize_value(document.get(field)) for field in FINGERPRINT_FIELDS)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# Campos del listado de JobSpy (sin descripción) que delatan un cambio en la oferta
+LISTING_FIELDS = ("title", "company", "location", "job_type", "date_posted", "min_amount", "max_amount", "interval")
+
+
+def listing_fingerprint(record: dict) -> str:
+    """
+    Huella barata de una fila del listado, comparable con la de su `raw_data`
+    guardado: las fechas se reducen a "AAAA-MM-DD" porque en `raw_data` se
+    guardan como ISO y en el listado llegan como `date`.
+    """
+    values = []
+    for field in LISTING_FIELDS:
+        value = _normalize_value(record.get(field))
+        values.append(value[:10] if field == "date_posted" else value)
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()
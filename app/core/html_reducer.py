@@ -0,0 +1,201 @@
+import logging
+import re
+from dataclasses import dataclass
+from html import escape
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# Etiquetas que se descartan con todo su contenido
+DROP_TAGS = {"script", "style", "svg", "noscript", "iframe", "template", "head", "canvas", "picture", "video"}
+# Etiquetas sin cierre
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# Atributos que aportan algo a la extracción; el resto (clases, estilos, tracking) se elimina
+KEEP_ATTRS = {"href", "data-jk", "datetime", "title"}
+
+# Único parámetro de los enlaces de Indeed que identifica la oferta; el resto es tracking
+INDEED_LINK_PARAMS = {"jk", "vjk"}
+
+# Contenedores de tarjetas de oferta en Indeed y LinkedIn
+CARD_CLASSES = {
+    "job_seen_beacon", "cardOutline", "resultContent",
+    "base-card", "base-search-card", "job-search-card",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _is_card(tag: str, attrs: List[Tuple[str, Optional[str]]]) -> bool:
+    for name, value in attrs:
+        if name == "class" and value and CARD_CLASSES.intersection(value.split()):
+            return True
+        if name == "data-jk" and tag != "a":
+            return True
+    return False
+
+
+def _canonical_href(href: str) -> str:
+    """
+    Quita de los enlaces los parámetros de tracking, que cambian en cada
+    descarga y harían distinta la clave de `extraction_cache` de dos páginas
+    iguales: en LinkedIn se descarta la query entera y en los enlaces de
+    Indeed solo se conservan `jk` y `vjk`.
+    """
+    parts = urlsplit(href)
+    if not parts.query:
+        return href
+    if parts.netloc.endswith("linkedin.com"):
+        return urlunsplit(parts._replace(query="", fragment=""))
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    if any(name in INDEED_LINK_PARAMS for name, _ in params):
+        query = urlencode([(name, value) for name, value in params if name in INDEED_LINK_PARAMS])
+        return urlunsplit(parts._replace(query=query, fragment=""))
+    return href
+
+
+@dataclass
+class ReducedHTML:
+    html: str
+    original_bytes: int
+    reduced_bytes: int
+    cards: int
+
+    @property
+    def ratio(self) -> float:
+        """Fracción del tamaño original que queda tras la reducción."""
+        return self.reduced_bytes / self.original_bytes if self.original_bytes else 1.0
+
+
+class _Reducer(HTMLParser):
+    """
+    Recorre el HTML una sola vez: descarta DROP_TAGS y comentarios, reduce
+    atributos a KEEP_ATTRS (con los enlaces sin tracking) y, si encuentra
+    tarjetas de oferta, conserva solo su contenido.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: List[str] = []
+        self.drop_depth: Optional[int] = None
+        self.card_depth: Optional[int] = None
+        self.cards = 0
+        self.card_parts: List[str] = []
+        self.page_parts: List[str] = []
+
+    def _emit(self, part: str):
+        self.page_parts.append(part)
+        if self.card_depth is not None:
+            self.card_parts.append(part)
+
+    def handle_starttag(self, tag, attrs):
+        if self.drop_depth is not None:
+            if tag not in VOID_TAGS:
+                self.stack.append(tag)
+            return
+        if tag in DROP_TAGS:
+            self.drop_depth = len(self.stack)
+            self.stack.append(tag)
+            return
+
+        if self.card_depth is None and _is_card(tag, attrs):
+            self.card_depth = len(self.stack)
+            self.cards += 1
+
+        kept = "".join(
+            f' {name}="{escape(_canonical_href(value) if name == "href" else value, quote=True)}"'
+            for name, value in attrs if name in KEEP_ATTRS and value
+        )
+        self._emit(f"<{tag}{kept}>")
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.stack and self.stack[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return
+        # Cierra también las etiquetas que quedaron abiertas (HTML mal formado)
+        while self.stack:
+            open_tag = self.stack.pop()
+            depth = len(self.stack)
+            if self.drop_depth is not None:
+                if depth == self.drop_depth:
+                    self.drop_depth = None
+            else:
+                self._emit(f"</{open_tag}>")
+                if depth == self.card_depth:
+                    self.card_depth = None
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.drop_depth is not None:
+            return
+        text = _WHITESPACE.sub(" ", data)
+        if text.strip():
+            self._emit(escape(text, quote=False))
+
+    def handle_comment(self, data):
+        pass
+
+
+class ReductionStats:
+    """Bytes acumulados antes y después de reducir, para medir el ahorro en producción."""
+
+    def __init__(self):
+        self.pages = 0
+        self.original_bytes = 0
+        self.reduced_bytes = 0
+        self.pages_without_cards = 0
+
+    def record(self, result: ReducedHTML):
+        self.pages += 1
+        self.original_bytes += result.original_bytes
+        self.reduced_bytes += result.reduced_bytes
+        if not result.cards:
+            self.pages_without_cards += 1
+
+    def stats(self) -> dict:
+        return {
+            "pages": self.pages,
+            "pages_without_cards": self.pages_without_cards,
+            "original_bytes": self.original_bytes,
+            "reduced_bytes": self.reduced_bytes,
+            "ratio": round(self.reduced_bytes / self.original_bytes, 4) if self.original_bytes else 1.0,
+            "avg_reduced_bytes": self.reduced_bytes // self.pages if self.pages else 0,
+        }
+
+
+# Instancia compartida por el proceso, como `extraction_cache`
+reduction_stats = ReductionStats()
+
+
+def reduce_html(html: str) -> ReducedHTML:
+    """
+    Reduce una página de resultados antes de enviarla al LLM: sin scripts,
+    estilos, SVG ni comentarios, sin atributos de presentación y, si hay
+    tarjetas de oferta, solo con ellas.
+    """
+    reducer = _Reducer()
+    reducer.feed(html)
+    reducer.close()
+
+    parts = reducer.card_parts if reducer.cards else reducer.page_parts
+    reduced = _WHITESPACE.sub(" ", "".join(parts)).strip()
+    result = ReducedHTML(
+        html=reduced,
+        original_bytes=len(html.encode("utf-8")),
+        reduced_bytes=len(reduced.encode("utf-8")),
+        cards=reducer.cards,
+    )
+    reduction_stats.record(result)
+    logger.info(
+        f"HTML reduced from {result.original_bytes} to {result.reduced_bytes} bytes "
+        f"({result.ratio:.1%}, {result.cards} job cards)"
+    )
+    return result
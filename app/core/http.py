@@ -0,0 +1,143 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.config.settings import settings
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - h2 es opcional (pip install httpx[http2])
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+# Cabeceras de navegador para los sitios de empleo, que bloquean el user-agent de httpx
+BROWSER_HEADERS = {
+    "user-agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "accept-language": "es-ES,es;q=0.9,en;q=0.8",
+}
+
+
+class HTTPClientRegistry:
+    """
+    Un `httpx.AsyncClient` por destino (indeed, linkedin, ms_job, ...) que se
+    reutiliza entre peticiones: las conexiones quedan abiertas (keep-alive)
+    y no se repite DNS, TCP y TLS en cada llamada. Usa HTTP/2 si `h2` está
+    instalado y `HTTP2_ENABLED` lo permite.
+    """
+
+    def __init__(
+            self,
+            max_connections: Optional[int] = None,
+            max_keepalive_connections: Optional[int] = None,
+            http2: Optional[bool] = None
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        http2 = settings.HTTP2_ENABLED if http2 is None else http2
+        if http2 and h2 is None:
+            logger.info("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1.")
+        self.http2 = http2 and h2 is not None
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        # Cabeceras y follow_redirects con los que se creó el cliente de cada destino
+        self._options: Dict[str, Tuple[tuple, bool]] = {}
+        self._requests: Dict[str, int] = {}
+
+    @staticmethod
+    def timeout_for(destination: str) -> httpx.Timeout:
+        return httpx.Timeout(
+            settings.HTTP_TIMEOUTS.get(destination, settings.HTTP_DEFAULT_TIMEOUT_SECONDS),
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        )
+
+    def client(
+            self,
+            destination: str,
+            headers: Optional[Dict[str, str]] = None,
+            follow_redirects: bool = False
+    ) -> httpx.AsyncClient:
+        """
+        Cliente compartido del destino, creado en el primer uso. Las cabeceras
+        y `follow_redirects` se fijan al crearlo: pedir el mismo destino con
+        otras opciones es un error (ValueError), porque se ignorarían.
+        """
+        options = (
+            tuple(sorted((name.lower(), value) for name, value in (headers or {}).items())),
+            follow_redirects,
+        )
+        client = self._clients.get(destination)
+        if client is not None and not client.is_closed and self._options[destination] != options:
+            raise ValueError(
+                f"HTTP client for {destination} already exists with different headers or follow_redirects; "
+                f"use the same options for every request to a destination"
+            )
+        if client is None or client.is_closed:
+            self._requests.setdefault(destination, 0)
+
+            async def count_request(request: httpx.Request):
+                self._requests[destination] += 1
+
+            client = httpx.AsyncClient(
+                headers=headers,
+                follow_redirects=follow_redirects,
+                timeout=self.timeout_for(destination),
+                limits=self.limits,
+                http2=self.http2,
+                event_hooks={"request": [count_request]},
+            )
+            self._clients[destination] = client
+            self._options[destination] = options
+        return client
+
+    async def close(self):
+        for destination, client in self._clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client for {destination}: {str(e)}")
+        self._clients.clear()
+        self._options.clear()
+
+    @staticmethod
+    def _pool_stats(client: httpx.AsyncClient) -> dict:
+        # httpx no expone el pool: se lee de los atributos internos de httpcore
+        # y, si otra versión los cambia, simplemente no se informa
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        if pool is None:
+            return {}
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if getattr(connection, "is_idle", lambda: False)())
+        return {
+            "connections": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+            "in_flight_requests": len(getattr(pool, "_requests", [])),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry_seconds": self.limits.keepalive_expiry,
+            "clients": {
+                destination: {
+                    "requests": self._requests.get(destination, 0),
+                    "timeout_seconds": client.timeout.read,
+                    "closed": client.is_closed,
+                    **self._pool_stats(client),
+                }
+                for destination, client in self._clients.items()
+            },
+        }
+
+
+# Instancia compartida por el proceso, como `rate_limiter`
+http_clients = HTTPClientRegistry()
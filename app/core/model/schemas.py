@@ -2,7 +2,7 @@ from enum import Enum
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -24,6 +24,52 @@ class ScrapingRequest(BaseModel):
     country: Optional[str] = None
 
 
+class ScrapeJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ScrapeJobProgress(BaseModel):
+    """Contadores de avance de un trabajo de scraping asíncrono."""
+    scraped: int = 0
+    stored: int = 0
+    published: int = 0
+    failed: int = 0
+
+
+class ScrapeJob(BaseModel):
+    """Trabajo de scraping encolado en MongoDB y ejecutado por los workers en segundo plano."""
+    job_id: str = Field(default_factory=lambda: str(uuid4()))
+    request: ScrapingRequest
+    request_key: str
+    status: ScrapeJobStatus = ScrapeJobStatus.PENDING
+    progress: ScrapeJobProgress = Field(default_factory=ScrapeJobProgress)
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class ETLRunResult(BaseModel):
+    """Resultado de una ejecución del ETL."""
+    published: int = 0
+    failed: int = 0
+    duplicates: int = 0  # casi duplicados: se marcan como procesados sin publicarse
+    failures: Dict[str, str] = {}  # job_id -> error
+    elapsed_seconds: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.published / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
 class ScrapingStats(BaseModel):
     total_jobs_scraped: int
     jobs_scraped_today: int
@@ -69,6 +115,46 @@ class RawJobData(BaseModel):
         use_enum_values = True
 
 
+class BulkUpsertStatus(str, Enum):
+    UPSERTED = "upserted"
+    MATCHED = "matched"
+    UNCHANGED = "unchanged"
+    FAILED = "failed"
+
+
+class BulkUpsertItem(BaseModel):
+    """Resultado de la escritura de un documento dentro de un bulk_write."""
+    index: int
+    url: Optional[str] = None
+    status: BulkUpsertStatus
+    upserted_id: Optional[str] = None
+    error: Optional[str] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class BulkUpsertResult(BaseModel):
+    """
+    Resumen de un guardado masivo de trabajos crudos.
+
+    `new`/`changed`/`unchanged` clasifican los trabajos según su huella de
+    contenido; `upserted`/`matched`/`failed` describen el resultado de las
+    escrituras (los trabajos sin cambios no se escriben).
+    """
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    upserted: int = 0
+    matched: int = 0
+    failed: int = 0
+    items: List[BulkUpsertItem] = []
+
+    @property
+    def stored(self) -> int:
+        return self.upserted + self.matched + self.unchanged
+
+
 class ProcessedJobData(BaseModel):
     """Modelo para los datos procesados que serán enviados a ms-job."""
     source_job_id: str
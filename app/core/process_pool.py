@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TransformExecutor:
+    """
+    Pool opcional de procesos para transformaciones CPU-bound (normalización,
+    extracción de requisitos) fuera del event loop que también atiende la API.
+
+    `func` recibe una lista de dicts planos y devuelve una lista alineada con
+    ella: a los workers solo viajan datos simples, baratos de serializar. Los
+    lotes menores que `min_batch_size`, o con el pool desactivado
+    (`workers=0`), se ejecutan en línea, donde el coste de enviar los datos a
+    otro proceso superaría al de transformarlos.
+    """
+
+    def __init__(
+            self,
+            workers: Optional[int] = None,
+            min_batch_size: Optional[int] = None
+    ):
+        self.workers = settings.ETL_PROCESS_POOL_WORKERS if workers is None else workers
+        self.min_batch_size = min_batch_size or settings.ETL_PROCESS_POOL_MIN_BATCH_SIZE
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.inline_batches = 0
+        self.pool_batches = 0
+        self.pool_errors = 0
+        self.records = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # spawn: hacer fork de un proceso con hilos de Motor/Kafka y un loop activo no es seguro
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Transform process pool started with {self.workers} workers.")
+        return self._executor
+
+    def _chunks(self, items: List[Any]) -> List[List[Any]]:
+        # Un trozo por worker, sin bajar de `min_batch_size` registros por trozo
+        parts = max(1, min(self.workers, len(items) // self.min_batch_size))
+        size = -(-len(items) // parts)
+        return [items[start:start + size] for start in range(0, len(items), size)]
+
+    async def map(self, func: Callable[[List[Any]], List[Any]], items: List[Any]) -> List[Any]:
+        """Aplica `func` al lote, repartido entre los workers si compensa."""
+        self.records += len(items)
+        if not self.enabled or len(items) < self.min_batch_size:
+            self.inline_batches += 1
+            return func(items)
+
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._get_executor()
+            parts = await asyncio.gather(*(
+                loop.run_in_executor(executor, func, chunk) for chunk in self._chunks(items)
+            ))
+        except BrokenProcessPool as e:
+            # Un worker murió: se recrea el pool en la próxima llamada y este lote va en línea
+            logger.error(f"Transform process pool is broken, running batch inline: {str(e)}")
+            self.pool_errors += 1
+            self._executor = None
+            self.inline_batches += 1
+            return func(items)
+
+        self.pool_batches += 1
+        return [result for part in parts for result in part]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "min_batch_size": self.min_batch_size,
+            "started": self._executor is not None,
+            "pool_batches": self.pool_batches,
+            "inline_batches": self.inline_batches,
+            "pool_errors": self.pool_errors,
+            "records": self.records,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("Transform process pool shut down.")
+
+
+# Instancia compartida por el proceso: un único pool para todos los servicios ETL
+transform_executor = TransformExecutor()
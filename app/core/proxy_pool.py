@@ -0,0 +1,230 @@
+import hashlib
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from app.config.settings import settings
+from app.core.datastore.repository.proxy_stats import ProxyStatsRepository
+from app.core.exceptions import CircuitOpenError
+from app.core.rate_limit import is_throttle_error
+
+logger = logging.getLogger(__name__)
+
+
+def proxy_label(proxy: str) -> str:
+    """Identificador estable del proxy que no expone sus credenciales."""
+    return "proxy-" + hashlib.sha1(proxy.encode("utf-8")).hexdigest()[:10]
+
+
+def mask_proxy(proxy: str) -> str:
+    """Quita usuario y contraseña del proxy para logs y estadísticas."""
+    parts = urlsplit(proxy if "://" in proxy else f"//{proxy}")
+    host = parts.hostname or "?"
+    return f"{host}:{parts.port}" if parts.port else host
+
+
+@dataclass
+class ProxyState:
+    proxy: str
+    successes: int = 0
+    failures: int = 0
+    bans: int = 0
+    consecutive_failures: int = 0
+    latency_ewma: Optional[float] = None
+    quarantine_count: int = 0
+    quarantined_until: Optional[datetime] = None
+    in_flight: int = 0  # no se persiste
+
+    @property
+    def label(self) -> str:
+        return proxy_label(self.proxy)
+
+    @property
+    def success_rate(self) -> float:
+        # Suavizado de Laplace para que un proxy nuevo no empiece en 0 ni en 1
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    @property
+    def score(self) -> float:
+        """Tasa de éxito penalizada por la latencia media (segundos)."""
+        return self.success_rate / (1 + (self.latency_ewma or 0.0))
+
+    def is_available(self, now: datetime) -> bool:
+        return self.quarantined_until is None or self.quarantined_until <= now
+
+    def to_document(self) -> dict:
+        return {
+            "_id": self.label,
+            "proxy": mask_proxy(self.proxy),
+            "successes": self.successes,
+            "failures": self.failures,
+            "bans": self.bans,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ewma": self.latency_ewma,
+            "quarantine_count": self.quarantine_count,
+            "quarantined_until": self.quarantined_until,
+            "updated_at": datetime.utcnow(),
+        }
+
+    @classmethod
+    def from_document(cls, proxy: str, doc: dict) -> "ProxyState":
+        return cls(
+            proxy=proxy,
+            successes=doc.get("successes", 0),
+            failures=doc.get("failures", 0),
+            bans=doc.get("bans", 0),
+            consecutive_failures=doc.get("consecutive_failures", 0),
+            latency_ewma=doc.get("latency_ewma"),
+            quarantine_count=doc.get("quarantine_count", 0),
+            quarantined_until=doc.get("quarantined_until"),
+        )
+
+
+class ProxyLease:
+    """Proxies asignados a una llamada; el llamador marca `empty` si no obtuvo resultados."""
+
+    def __init__(self, states: List[ProxyState]):
+        self.states = states
+        self.empty = False
+
+    @property
+    def proxies(self) -> Optional[List[str]]:
+        return [state.proxy for state in self.states] or None
+
+    @property
+    def label(self) -> Optional[str]:
+        """Etiqueta del proxy cuando la llamada usa uno solo (para limitar por IP)."""
+        return self.states[0].label if len(self.states) == 1 else None
+
+
+class ProxyPool:
+    """
+    Pool de proxies con puntuación de salud.
+
+    Cada llamada recibe los `per_call` proxies disponibles con menos llamadas
+    en curso y mejor puntuación (tasa de éxito y latencia), de modo que las
+    llamadas concurrentes se reparten entre IPs distintas. Un 429/403 o
+    `PROXY_FAILURE_THRESHOLD` fallos seguidos ponen el proxy en cuarentena
+    durante un tiempo que se duplica en cada cuarentena consecutiva.
+    """
+
+    def __init__(
+            self,
+            proxies: Optional[List[str]] = None,
+            stats_repository: Optional[ProxyStatsRepository] = None,
+            per_call: Optional[int] = None
+    ):
+        proxies = settings.SCRAPE_PROXIES if proxies is None else proxies
+        self.states: Dict[str, ProxyState] = {proxy: ProxyState(proxy) for proxy in dict.fromkeys(proxies)}
+        self.stats_repository = stats_repository
+        self.per_call = per_call or settings.PROXY_PER_CALL
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.states)
+
+    async def load(self):
+        """Recupera las estadísticas guardadas de los proxies configurados."""
+        if not self.enabled or self.stats_repository is None:
+            return
+        labels = {proxy_label(proxy): proxy for proxy in self.states}
+        stored = await self.stats_repository.load(list(labels))
+        for label, doc in stored.items():
+            proxy = labels[label]
+            self.states[proxy] = ProxyState.from_document(proxy, doc)
+        logger.info(f"Proxy pool loaded with {len(self.states)} proxies ({len(stored)} with stored stats).")
+
+    async def save(self, states: Optional[List[ProxyState]] = None):
+        if self.stats_repository is None:
+            return
+        states = list(self.states.values()) if states is None else states
+        await self.stats_repository.save([state.to_document() for state in states])
+
+    def select(self) -> List[ProxyState]:
+        """Elige los proxies disponibles menos ocupados y con mejor puntuación."""
+        now = datetime.utcnow()
+        available = [state for state in self.states.values() if state.is_available(now)]
+        available.sort(key=lambda state: (state.in_flight, -state.score))
+        return available[:self.per_call]
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Asigna proxies a una llamada y registra su resultado al salir:
+        excepción, 429/403 o resultado vacío cuentan en contra de los proxies.
+        """
+        states = self.select()
+        if self.enabled and not states:
+            logger.warning("All proxies are quarantined; scraping without proxy.")
+
+        lease = ProxyLease(states)
+        for state in states:
+            state.in_flight += 1
+        started = time.perf_counter()
+        try:
+            yield lease
+        except CircuitOpenError:
+            # La llamada no llegó a salir: no dice nada de la salud del proxy
+            raise
+        except Exception as e:
+            self._record(states, time.perf_counter() - started, ok=False, banned=is_throttle_error(e))
+            raise
+        else:
+            self._record(states, time.perf_counter() - started, ok=not lease.empty, banned=False)
+        finally:
+            for state in states:
+                state.in_flight -= 1
+            if states:
+                await self.save(states)
+
+    def _record(self, states: List[ProxyState], latency: float, ok: bool, banned: bool):
+        alpha = settings.PROXY_LATENCY_ALPHA
+        for state in states:
+            if ok:
+                state.successes += 1
+                state.consecutive_failures = 0
+                state.quarantine_count = 0
+                state.latency_ewma = latency if state.latency_ewma is None else (
+                    alpha * latency + (1 - alpha) * state.latency_ewma
+                )
+                continue
+
+            state.failures += 1
+            state.consecutive_failures += 1
+            if banned:
+                state.bans += 1
+            if banned or state.consecutive_failures >= settings.PROXY_FAILURE_THRESHOLD:
+                self._quarantine(state)
+
+    def _quarantine(self, state: ProxyState):
+        seconds = min(
+            settings.PROXY_QUARANTINE_BASE_SECONDS * 2 ** state.quarantine_count,
+            settings.PROXY_QUARANTINE_MAX_SECONDS
+        )
+        state.quarantine_count += 1
+        state.consecutive_failures = 0
+        state.quarantined_until = datetime.utcnow() + timedelta(seconds=seconds)
+        logger.warning(f"Proxy {mask_proxy(state.proxy)} quarantined for {seconds:.0f} seconds")
+
+    def stats(self) -> dict:
+        now = datetime.utcnow()
+        return {
+            "total": len(self.states),
+            "healthy": sum(1 for state in self.states.values() if state.is_available(now)),
+            "proxies": {
+                state.label: {
+                    "proxy": mask_proxy(state.proxy),
+                    "available": state.is_available(now),
+                    "success_rate": round(state.success_rate, 3),
+                    "latency_ewma": round(state.latency_ewma, 2) if state.latency_ewma is not None else None,
+                    "bans": state.bans,
+                    "in_flight": state.in_flight,
+                    "quarantined_until": state.quarantined_until,
+                }
+                for state in self.states.values()
+            },
+        }
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from app.config.settings import settings
+from app.core.exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# Códigos HTTP con los que los sitios indican que estamos yendo demasiado rápido o bloqueados
+THROTTLE_STATUS_CODES = (403, 429)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    # httpx y requests lo llevan en `error.response`; otras librerías en `error.status_code`
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code is None:
+        status_code = getattr(error, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """
+    Detecta respuestas 429/403 por el código HTTP de la excepción (o de la
+    que la causó). El texto del mensaje no se mira: ids, puertos o contadores
+    con esos dígitos darían falsos positivos.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status_code = _status_code(error)
+        if status_code is not None:
+            return status_code in THROTTLE_STATUS_CODES
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class TokenBucket:
+    """Token bucket asíncrono: `rate` tokens por segundo con ráfagas de hasta `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # El lock atiende a los que esperan en orden de llegada
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por sitio: tras `failure_threshold` fallos seguidos se
+    abre durante `cooldown` segundos; después deja pasar una sola petición de
+    prueba (half-open) que lo cierra si va bien o lo reabre si falla.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def retry_in(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN and self.retry_in == 0.0:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return self.state != self.OPEN
+
+    def release(self):
+        self._trial_in_flight = False
+
+    def record_success(self):
+        self.release()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> bool:
+        """Anota un fallo; devuelve True si el circuito acaba de abrirse."""
+        self.release()
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            was_open = self.state == self.OPEN
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            return not was_open
+        return False
+
+
+class RateLimitAttempt:
+    """Resultado de una petición limitada; el llamador marca `empty` si no obtuvo datos."""
+
+    def __init__(self):
+        self.empty = False
+
+
+class SiteLimiter:
+    """
+    Token bucket y circuit breaker de un sitio, con ritmo adaptativo: 429/403
+    y resultados vacíos reducen el ritmo y cada petición correcta lo recupera poco a poco.
+    """
+
+    def __init__(self, site: str, requests_per_minute: float):
+        self.site = site
+        self.base_rate = requests_per_minute / 60
+        self.factor = 1.0
+        self.bucket = TokenBucket(self.base_rate, settings.RATE_LIMIT_BURST)
+        self.breaker = CircuitBreaker(
+            settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS
+        )
+
+        self.requests = 0
+        self.successes = 0
+        self.empty = 0
+        self.throttled = 0
+        self.errors = 0
+        self.rejected = 0
+
+    def _set_factor(self, factor: float):
+        self.factor = min(1.0, max(settings.RATE_LIMIT_MIN_FACTOR, factor))
+        self.bucket.rate = self.base_rate * self.factor
+
+    async def acquire(self):
+        """Espera un token; lanza `CircuitOpenError` si el sitio está en pausa."""
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"Circuit open for {self.site}; retry in {self.breaker.retry_in:.0f} seconds"
+            )
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            # Cancelado o con timeout esperando el token: libera la prueba half-open,
+            # o el circuito quedaría esperando para siempre un resultado que no llega
+            self.breaker.release()
+            raise
+        self.requests += 1
+
+    def record_success(self, empty: bool = False):
+        self.breaker.record_success()
+        if empty:
+            self.empty += 1
+            self._set_factor(self.factor * settings.RATE_LIMIT_EMPTY_SLOWDOWN_FACTOR)
+        else:
+            self.successes += 1
+            self._set_factor(self.factor + settings.RATE_LIMIT_RECOVERY_STEP)
+
+    def record_error(self, error: BaseException):
+        if is_throttle_error(error):
+            self.throttled += 1
+            self._set_factor(self.factor * settings.RATE_LIMIT_SLOWDOWN_FACTOR)
+            logger.warning(f"{self.site} is throttling requests; slowing down to "
+                           f"{self.bucket.rate * 60:.1f} requests/min")
+        else:
+            self.errors += 1
+        if self.breaker.record_failure():
+            logger.error(f"Circuit opened for {self.site} after {self.breaker.consecutive_failures} "
+                         f"consecutive failures; pausing for {self.breaker.cooldown:.0f} seconds")
+
+    def stats(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "retry_in_seconds": round(self.breaker.retry_in, 1),
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "base_requests_per_minute": round(self.base_rate * 60, 2),
+            "requests_per_minute": round(self.bucket.rate * 60, 2),
+            "slowdown_factor": round(self.factor, 3),
+            "requests": self.requests,
+            "successes": self.successes,
+            "empty": self.empty,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "rejected": self.rejected,
+        }
+
+
+class RateLimiterRegistry:
+    """Limitadores por sitio compartidos por todos los scrapers del proceso."""
+
+    def __init__(self):
+        self._limiters: Dict[str, SiteLimiter] = {}
+
+    def get(self, site: str) -> SiteLimiter:
+        site = site.lower()
+        if site not in self._limiters:
+            # Las claves "sitio:proxy" usan el límite configurado para el sitio
+            requests_per_minute = settings.RATE_LIMIT_PER_MINUTE.get(
+                site.split(":", 1)[0], settings.RATE_LIMIT_DEFAULT_PER_MINUTE
+            )
+            self._limiters[site] = SiteLimiter(site, requests_per_minute)
+        return self._limiters[site]
+
+    @asynccontextmanager
+    async def limit(self, site: str):
+        """
+        Reserva un token para `site` y registra el resultado del bloque:
+        las excepciones cuentan como fallo (429/403 reducen además el ritmo).
+        """
+        limiter = self.get(site)
+        await limiter.acquire()
+        attempt = RateLimitAttempt()
+        try:
+            yield attempt
+        except Exception as e:
+            limiter.record_error(e)
+            raise
+        except BaseException:
+            # Cancelación: no cuenta como resultado, pero libera la prueba half-open
+            limiter.breaker.release()
+            raise
+        limiter.record_success(empty=attempt.empty)
+
+    def stats(self) -> dict:
+        return {site: limiter.stats() for site, limiter in self._limiters.items()}
+
+
+# Instancia compartida por el proceso, como `settings`
+rate_limiter = RateLimiterRegistry()
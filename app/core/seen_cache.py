@@ -0,0 +1,151 @@
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config.settings import settings
+
+# Resultado de una consulta a la caché
+SEEN_UNCHANGED = "unchanged"  # guardado con la misma huella: no hace falta escribir
+SEEN_NEW = "new"  # seguro que no está guardado con esta huella: escribir sin consultar MongoDB
+SEEN_UNKNOWN = "unknown"  # posible falso positivo del Bloom: consultar MongoDB
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un bytearray con doble hashing (blake2b).
+
+    Para `capacity` elementos y una tasa de falsos positivos objetivo `p`:
+
+        m = -n * ln(p) / ln(2)^2   bits
+        k = (m / n) * ln(2)        funciones hash
+
+    y con `n` elementos insertados la tasa real estimada es
+    `(1 - e^(-k*n/m))^k`. Con n = 1M y p = 1% ocupa ~1,2 MB y usa k = 7.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def estimated_false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class SeenCache:
+    """
+    Caché en proceso de los (source, url, content_hash) ya guardados en `raw_jobs`.
+
+    - Un LRU acotado guarda la huella reciente de cada (source, url): si
+      coincide, el trabajo no ha cambiado y no se toca MongoDB.
+    - Un filtro de Bloom con todas las huellas guardadas responde "seguro que
+      es nuevo o ha cambiado", lo que permite escribir sin consultar antes.
+      Solo es concluyente si el calentamiento recorrió toda la colección
+      (`authoritative`); si no, o si da positivo, se consulta MongoDB.
+
+    Un falso positivo del Bloom solo cuesta una consulta, nunca un trabajo omitido.
+    """
+
+    def __init__(
+            self,
+            capacity: Optional[int] = None,
+            error_rate: Optional[float] = None,
+            lru_size: Optional[int] = None
+    ):
+        self.bloom = BloomFilter(
+            capacity or settings.SEEN_CACHE_CAPACITY,
+            error_rate or settings.SEEN_CACHE_ERROR_RATE
+        )
+        self.lru_size = lru_size or settings.SEEN_CACHE_LRU_SIZE
+        self._recent: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self.authoritative = False
+
+        self.hits = 0
+        self.new = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(source: str, url: str, content_hash: str) -> str:
+        return f"{source}\x1f{url}\x1f{content_hash}"
+
+    def add(self, source: str, url: Optional[str], content_hash: Optional[str]):
+        """Anota un trabajo guardado (o leído de MongoDB) con su huella actual."""
+        if not url or not content_hash:
+            return
+        bloom_key = self._key(source, url, content_hash)
+        if bloom_key not in self.bloom:
+            self.bloom.add(bloom_key)
+        key = (source, url)
+        self._recent[key] = content_hash
+        self._recent.move_to_end(key)
+        if len(self._recent) > self.lru_size:
+            self._recent.popitem(last=False)
+
+    def lookup(self, source: str, url: Optional[str], content_hash: Optional[str]) -> str:
+        """Devuelve SEEN_UNCHANGED, SEEN_NEW o SEEN_UNKNOWN para el trabajo."""
+        if not url or not content_hash:
+            self.misses += 1
+            return SEEN_UNKNOWN
+
+        key = (source, url)
+        stored_hash = self._recent.get(key)
+        if stored_hash == content_hash:
+            self._recent.move_to_end(key)
+            self.hits += 1
+            return SEEN_UNCHANGED
+
+        if self.authoritative and self._key(source, url, content_hash) not in self.bloom:
+            self.new += 1
+            return SEEN_NEW
+
+        self.misses += 1
+        return SEEN_UNKNOWN
+
+    def is_unchanged(self, source: str, url: Optional[str], content_hash: Optional[str]) -> bool:
+        """
+        Comprobación rápida solo contra el LRU, para filtrar antes de construir
+        documentos; los que no aciertan se cuentan después en `lookup`.
+        """
+        if url and content_hash and self._recent.get((source, url)) == content_hash:
+            self._recent.move_to_end((source, url))
+            self.hits += 1
+            return True
+        return False
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.new + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "definitely_new": self.new,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "lru_entries": len(self._recent),
+            "lru_capacity": self.lru_size,
+            "bloom_items": self.bloom.count,
+            "bloom_capacity": self.bloom.capacity,
+            "bloom_bits": self.bloom.size,
+            "bloom_hash_count": self.bloom.hash_count,
+            "bloom_target_false_positive_rate": self.bloom.error_rate,
+            "bloom_estimated_false_positive_rate": round(self.bloom.estimated_false_positive_rate, 6),
+            "authoritative": self.authoritative,
+        }
@@ -2,13 +2,27 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
-from app.config.database import initialize_database
+from app.config.database import create_mongo_repository, initialize_database
 from app.config.settings import settings
 from dotenv import load_dotenv
 import logging
 import os
 
+from app.core.datastore.repository.job_signatures import JobSignatureRepository
+from app.core.datastore.repository.proxy_stats import ProxyStatsRepository
+from app.core.datastore.repository.scrape_jobs import ScrapeJobRepository
 from app.core.event.kafka.producer import KafkaProducer
+from app.core.executor import scrape_executor
+from app.core.extraction_cache import extraction_cache
+from app.core.http import http_clients
+from app.core.process_pool import transform_executor
+from app.core.proxy_pool import ProxyPool
+from app.core.rate_limit import rate_limiter
+from app.service.duplicate_detector import DuplicateDetector
+from app.service.etl import JobETLService
+from app.service.etl_worker import ETLWorker
+from app.service.job_pipeline import JobPipeline
+from app.service.scrape_jobs import ScrapeJobService
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -40,7 +54,32 @@ kafka_producer: KafkaProducer | None = None
 @app.on_event("startup")
 async def startup_event():
     #print(">>> DEBUG: Entrando a startup_event() <<<")
-    await initialize_database()
+    # Cliente de MongoDB compartido por todas las peticiones y servicios
+    app.state.mongo_repository = create_mongo_repository()
+    await initialize_database(app.state.mongo_repository)
+
+    # Límites de peticiones por sitio compartidos por todos los scrapers
+    app.state.rate_limiter = rate_limiter
+
+    # Clientes HTTP con keep-alive por destino, compartidos por scrapers y servicios
+    app.state.http_clients = http_clients
+
+    # Caché de extracciones con LLM compartida por los scrapers de ScrapeGraph
+    app.state.extraction_cache = extraction_cache
+
+    # Pool de proxies con estadísticas de salud persistidas en MongoDB
+    app.state.proxy_pool = ProxyPool(
+        stats_repository=ProxyStatsRepository(
+            app.state.mongo_repository.db, settings.MONGO_PROXY_STATS_COLLECTION
+        )
+    )
+    await app.state.proxy_pool.load()
+
+    # Pool compartido para las llamadas bloqueantes de scraping: la misma
+    # instancia que usan por defecto los scrapers creados fuera de aquí
+    scrape_executor.proxy_pool = app.state.proxy_pool
+    app.state.scrape_executor = scrape_executor
+    logger.info(f"Scrape executor started with {app.state.scrape_executor.max_workers} workers.")
 
     try:
         # Inicializar el producer de Kafka
@@ -53,14 +92,100 @@ async def startup_event():
         ##print(f"ERROR en startup_event: {str(e)}")
         logger.exception("Excepción inicializando el KafkaProducer")
 
+    # Pool de procesos opcional para la transformación ETL, compartido por los servicios ETL
+    app.state.transform_executor = transform_executor
+
+    # Índice de casi duplicados compartido por los servicios ETL, reconstruido desde MongoDB
+    app.state.duplicate_detector = DuplicateDetector(
+        repository=JobSignatureRepository(
+            app.state.mongo_repository.db, settings.MONGO_JOB_SIGNATURES_COLLECTION
+        )
+    )
+    if settings.DEDUP_ENABLED:
+        await app.state.duplicate_detector.load()
+
+    # Pipeline scrape → normalize → store → transform → publish compartido. Con el
+    # ETLWorker activo el pipeline solo guarda y publica únicamente el worker
+    app.state.job_pipeline = JobPipeline(
+        mongo_repository=app.state.mongo_repository,
+        etl_service=JobETLService(
+            app.state.mongo_repository,
+            getattr(app.state, "kafka_producer", None),
+            transform_executor=app.state.transform_executor,
+            duplicate_detector=app.state.duplicate_detector
+        )
+    )
+    await app.state.job_pipeline.start()
+
+    # Cola de trabajos de scraping y workers que la drenan
+    scrape_job_repository = ScrapeJobRepository(app.state.mongo_repository.db)
+    await scrape_job_repository.initialize()
+    app.state.scrape_job_service = ScrapeJobService(
+        job_repository=scrape_job_repository,
+        mongo_repository=app.state.mongo_repository,
+        kafka_producer=getattr(app.state, "kafka_producer", None),
+        scrape_executor=app.state.scrape_executor,
+        job_pipeline=app.state.job_pipeline
+    )
+    await app.state.scrape_job_service.start()
+
+    # Worker ETL opcional (change stream o polling)
+    app.state.etl_worker = ETLWorker(
+        mongo_repository=app.state.mongo_repository,
+        etl_service=JobETLService(
+            app.state.mongo_repository,
+            getattr(app.state, "kafka_producer", None),
+            transform_executor=app.state.transform_executor,
+            duplicate_detector=app.state.duplicate_detector
+        )
+    )
+    await app.state.etl_worker.start()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    scrape_job_service = getattr(app.state, "scrape_job_service", None)
+    if scrape_job_service:
+        await scrape_job_service.stop()
+
+    etl_worker = getattr(app.state, "etl_worker", None)
+    if etl_worker:
+        await etl_worker.stop()
+
+    # Terminar lo que ya está en el pipeline antes de cerrar Kafka y MongoDB
+    job_pipeline = getattr(app.state, "job_pipeline", None)
+    if job_pipeline:
+        await job_pipeline.stop(drain=True)
+
     kafka_producer = app.state.kafka_producer
     if kafka_producer:
         await kafka_producer.stop()
         logger.info("Kafka producer stopped.")
 
+    scrape_executor = getattr(app.state, "scrape_executor", None)
+    if scrape_executor:
+        scrape_executor.shutdown()
+
+    transform_executor = getattr(app.state, "transform_executor", None)
+    if transform_executor:
+        transform_executor.shutdown()
+
+    proxy_pool = getattr(app.state, "proxy_pool", None)
+    if proxy_pool and proxy_pool.enabled:
+        await proxy_pool.save()
+
+    extraction_cache = getattr(app.state, "extraction_cache", None)
+    if extraction_cache:
+        await extraction_cache.close()
+
+    http_clients = getattr(app.state, "http_clients", None)
+    if http_clients:
+        await http_clients.close()
+
+    mongo_repository = getattr(app.state, "mongo_repository", None)
+    if mongo_repository:
+        mongo_repository.close()
+
 
 # Health check endpoint
 @app.get("/health")
@@ -0,0 +1,207 @@
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+INDEED_BASE_URL = "https://pe.indeed.com"
+INDEED_VIEW_URL = "https://pe.indeed.com/viewjob?jk={job_key}"
+
+# Campos sin los que una tarjeta no sirve: si faltan en muchas, el HTML cambió
+INDEED_REQUIRED_FIELDS = ("title", "company", "location", "url")
+LINKEDIN_REQUIRED_FIELDS = ("title", "company", "location", "url")
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Motivos para volver al LLM
+FALLBACK_ERROR = "error"
+FALLBACK_NO_CARDS = "no_cards"
+FALLBACK_LOW_COVERAGE = "low_coverage"
+FALLBACK_MISSING_DESCRIPTIONS = "missing_descriptions"
+FALLBACK_DESCRIPTION_BUDGET = "description_budget"
+
+
+def _text(node) -> str:
+    return _WHITESPACE.sub(" ", node.get_text(" ", strip=True)).strip() if node else ""
+
+
+def _first_text(card, *selectors: str) -> str:
+    for selector in selectors:
+        text = _text(card.select_one(selector))
+        if text:
+            return text
+    return ""
+
+
+def parse_indeed_cards(html: str) -> List[Dict]:
+    """
+    Lee las tarjetas de la página de resultados de Indeed con selectores CSS.
+    Devuelve dicts con los campos de `IndeedJobData` salvo `posted_at`, que
+    pone el scraper igual que en la extracción con LLM.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    jobs = []
+    for card in soup.select("div.job_seen_beacon, div.cardOutline"):
+        # Las tarjetas pueden venir anidadas (cardOutline > job_seen_beacon)
+        if card.find_parent("div", class_=["job_seen_beacon", "cardOutline"]):
+            continue
+
+        link = card.select_one("h2.jobTitle a, a.jcs-JobTitle, a[data-jk]")
+        title = ""
+        if link is not None:
+            title_span = link.select_one("span[title]")
+            title = title_span["title"].strip() if title_span else _text(link)
+
+        url = ""
+        job_key = link.get("data-jk") if link is not None else None
+        if job_key:
+            url = INDEED_VIEW_URL.format(job_key=job_key)
+        elif link is not None and link.get("href"):
+            url = urljoin(INDEED_BASE_URL, link["href"])
+
+        snippet = card.select_one("div.job-snippet, [data-testid='jobsnippet_footer'], div.underShelfFooter")
+        summary = " ".join(_text(item) for item in snippet.select("li")) if snippet else ""
+
+        jobs.append({
+            "title": title,
+            "company": _first_text(card, "[data-testid='company-name']", "span.companyName", "span.css-1h7lukg"),
+            "location": _first_text(card, "[data-testid='text-location']", "div.companyLocation"),
+            "summary": summary or _text(snippet),
+            "url": url,
+        })
+    return jobs
+
+
+def parse_linkedin_cards(html: str) -> List[Dict]:
+    """
+    Lee las tarjetas de la búsqueda pública de LinkedIn con selectores CSS.
+    Devuelve los mismos campos que se piden al LLM; la tarjeta no incluye la
+    descripción ni los requisitos, que quedan vacíos: `LinkedInScraper` descarga
+    después las descripciones y vuelve al LLM si faltan demasiadas.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    jobs = []
+    for card in soup.select("div.base-card, div.base-search-card, div.job-search-card"):
+        if card.find_parent("div", class_=["base-card", "base-search-card", "job-search-card"]):
+            continue
+
+        link = card.select_one("a.base-card__full-link, a[href*='/jobs/view/']")
+        url = link["href"].split("?", 1)[0] if link is not None and link.get("href") else ""
+        posted = card.select_one("time[datetime]")
+
+        jobs.append({
+            "title": _first_text(card, "h3.base-search-card__title", ".base-search-card__title"),
+            "company": _first_text(card, "h4.base-search-card__subtitle", ".base-search-card__subtitle"),
+            "description": "",
+            "requirements": [],
+            "location": _first_text(card, "span.job-search-card__location", ".job-search-card__location"),
+            "job_type": None,
+            "experience_level": None,
+            "salary_range": _first_text(card, "span.job-search-card__salary-info") or None,
+            "url": url,
+            "posted_at": posted["datetime"] if posted is not None else None,
+        })
+    return jobs
+
+
+def split_by_coverage(jobs: List[Dict], required_fields: Tuple[str, ...]) -> Tuple[List[Dict], float]:
+    """Separa las tarjetas completas y devuelve también qué fracción lo está."""
+    complete = [job for job in jobs if all(job.get(field) for field in required_fields)]
+    return complete, (len(complete) / len(jobs) if jobs else 0.0)
+
+
+class CardParserStats:
+    """Cuántas páginas resolvió el parser y cuántas tuvieron que pasar por el LLM, por fuente."""
+
+    def __init__(self):
+        self._sources: Dict[str, Dict[str, int]] = {}
+
+    def _counters(self, source: str) -> Dict[str, int]:
+        return self._sources.setdefault(source, {
+            "fast_path": 0,
+            "fallback": 0,
+            FALLBACK_ERROR: 0,
+            FALLBACK_NO_CARDS: 0,
+            FALLBACK_LOW_COVERAGE: 0,
+            FALLBACK_MISSING_DESCRIPTIONS: 0,
+            FALLBACK_DESCRIPTION_BUDGET: 0,
+            "jobs_parsed": 0,
+            "jobs_incomplete": 0,
+        })
+
+    def record_fast_path(self, source: str, parsed: int, incomplete: int):
+        counters = self._counters(source)
+        counters["fast_path"] += 1
+        counters["jobs_parsed"] += parsed
+        counters["jobs_incomplete"] += incomplete
+
+    def record_fallback(self, source: str, reason: str):
+        counters = self._counters(source)
+        counters["fallback"] += 1
+        counters[reason] += 1
+
+    def demote_fast_path(self, source: str, reason: str, parsed: int):
+        """Una página que el parser leyó pero que al final tuvo que pasar por el LLM."""
+        counters = self._counters(source)
+        counters["fast_path"] -= 1
+        counters["jobs_parsed"] -= parsed
+        self.record_fallback(source, reason)
+
+    def stats(self) -> dict:
+        result = {}
+        for source, counters in self._sources.items():
+            pages = counters["fast_path"] + counters["fallback"]
+            result[source] = {
+                **counters,
+                "fast_path_ratio": round(counters["fast_path"] / pages, 4) if pages else 0.0,
+            }
+        return result
+
+
+# Instancia compartida por el proceso, como `extraction_cache`
+card_parser_stats = CardParserStats()
+
+
+def parse_cards(
+        source: str,
+        html: str,
+        min_coverage: Optional[float] = None
+) -> Optional[List[Dict]]:
+    """
+    Camino rápido sin LLM: devuelve las tarjetas completas de la página, o
+    None si el parser falla, no encuentra tarjetas o demasiadas están
+    incompletas (probable cambio de maquetación), y entonces se usa el LLM.
+    """
+    if source == "indeed":
+        parser, required_fields = parse_indeed_cards, INDEED_REQUIRED_FIELDS
+    else:
+        parser, required_fields = parse_linkedin_cards, LINKEDIN_REQUIRED_FIELDS
+    min_coverage = settings.CARD_PARSER_MIN_COVERAGE if min_coverage is None else min_coverage
+
+    try:
+        jobs = parser(html)
+    except Exception as e:
+        logger.error(f"Error parsing {source} job cards, falling back to LLM extraction: {str(e)}")
+        card_parser_stats.record_fallback(source, FALLBACK_ERROR)
+        return None
+
+    if not jobs:
+        logger.info(f"No {source} job cards found, falling back to LLM extraction")
+        card_parser_stats.record_fallback(source, FALLBACK_NO_CARDS)
+        return None
+
+    complete, coverage = split_by_coverage(jobs, required_fields)
+    if coverage < min_coverage:
+        logger.warning(f"Only {coverage:.0%} of {len(jobs)} {source} job cards are complete, "
+                       f"falling back to LLM extraction")
+        card_parser_stats.record_fallback(source, FALLBACK_LOW_COVERAGE)
+        return None
+
+    card_parser_stats.record_fast_path(source, len(complete), len(jobs) - len(complete))
+    logger.info(f"Parsed {len(complete)} {source} job cards without LLM ({coverage:.0%} complete)")
+    return complete
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import re
+from typing import Dict, List, Optional
+
+import httpx
+from bs4 import BeautifulSoup
+from markdownify import markdownify
+
+from app.config.settings import settings
+from app.core.exceptions import CircuitOpenError
+from app.core.http import BROWSER_HEADERS, HTTPClientRegistry, http_clients as default_http_clients
+from app.core.rate_limit import RateLimiterRegistry, rate_limiter as default_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+LINKEDIN_JOB_ID = re.compile(r"/jobs/view/(?:[^/?]*-)?(\d+)")
+LINKEDIN_POSTING_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+LINKEDIN_DESCRIPTION_CLASS = "show-more-less-html__markup"
+
+
+class DescriptionFetcher:
+    """
+    Segunda fase del scraping: descarga la descripción completa solo de las
+    ofertas nuevas. Indeed ya incluye la descripción en el listado de JobSpy,
+    así que aquí solo se resuelven las de LinkedIn (endpoint público de ofertas).
+    """
+
+    def __init__(
+            self,
+            rate_limiter: Optional[RateLimiterRegistry] = None,
+            concurrency: Optional[int] = None,
+            timeout: Optional[float] = None,
+            http_clients: Optional[HTTPClientRegistry] = None
+    ):
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.http_clients = http_clients or default_http_clients
+        self.concurrency = concurrency or settings.DESCRIPTION_FETCH_CONCURRENCY
+        self.timeout = timeout or settings.DESCRIPTION_FETCH_TIMEOUT_SECONDS
+
+    async def fetch_linkedin(self, urls: List[str]) -> Dict[str, str]:
+        """Devuelve {url: descripción en markdown} de las ofertas que se pudieron leer."""
+        if not urls:
+            return {}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        descriptions: Dict[str, str] = {}
+        circuit_open = asyncio.Event()
+
+        client = self.http_clients.client("linkedin", headers=BROWSER_HEADERS, follow_redirects=True)
+
+        async def fetch(url: str):
+            async with semaphore:
+                if circuit_open.is_set():
+                    return
+                try:
+                    description = await self._fetch_linkedin_posting(client, url)
+                    if description:
+                        descriptions[url] = description
+                except CircuitOpenError as e:
+                    logger.warning(f"Stopping LinkedIn description fetch: {str(e)}")
+                    circuit_open.set()
+                except Exception as e:
+                    logger.error(f"Error fetching LinkedIn description for {url}: {str(e)}")
+
+        await asyncio.gather(*(fetch(url) for url in urls))
+
+        logger.info(f"Fetched {len(descriptions)} of {len(urls)} LinkedIn descriptions")
+        return descriptions
+
+    async def _fetch_linkedin_posting(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        match = LINKEDIN_JOB_ID.search(url)
+        if not match:
+            return None
+
+        async with self.rate_limiter.limit("linkedin") as attempt:
+            response = await client.get(LINKEDIN_POSTING_URL.format(job_id=match.group(1)), timeout=self.timeout)
+            response.raise_for_status()
+            description = self.parse_linkedin_description(response.text)
+            attempt.empty = description is None
+        return description
+
+    @staticmethod
+    def parse_linkedin_description(html: str) -> Optional[str]:
+        soup = BeautifulSoup(html, "html.parser")
+        markup = soup.find("div", class_=LINKEDIN_DESCRIPTION_CLASS)
+        if markup is None:
+            return None
+        return markdownify(str(markup)).strip() or None
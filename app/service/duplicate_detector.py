@@ -0,0 +1,244 @@
+import hashlib
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config.settings import settings
+from app.core.datastore.repository.job_signatures import JobSignatureRepository
+from app.core.model.schemas import ProcessedJobData, RawJobData
+from app.service.skills_extractor import fold_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_BITS = 64
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    # El vocabulario de las ofertas se repite mucho: el hash de cada palabra se calcula una vez
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(tokens: List[str]) -> int:
+    """
+    SimHash de 64 bits sobre las palabras del texto (las repetidas pesan
+    más). Textos casi iguales dan firmas a pocos bits de distancia. Con
+    palabras sueltas cada cambio toca un solo rasgo; con pares de palabras
+    tocaba dos y una edición de un par de palabras ya superaba la distancia.
+    """
+    hashes = np.fromiter(map(_token_hash, tokens), dtype=np.uint64, count=len(tokens))
+    # Cada bit de la firma es el voto mayoritario de ese bit entre los hashes
+    bits = np.unpackbits(hashes.view(np.uint8), bitorder="little").reshape(-1, SIGNATURE_BITS)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 > len(tokens)
+    return int(np.packbits(votes, bitorder="little").view(np.uint64)[0])
+
+
+def _band_layout(bands: int) -> List[Tuple[int, int]]:
+    """(desplazamiento, máscara) de cada banda al repartir los 64 bits en `bands` tramos."""
+    layout = []
+    shift = 0
+    for band in range(bands):
+        width = SIGNATURE_BITS // bands + (1 if band < SIGNATURE_BITS % bands else 0)
+        layout.append((shift, (1 << width) - 1))
+        shift += width
+    return layout
+
+
+def _to_int64(signature: int) -> int:
+    # MongoDB guarda enteros de 64 bits con signo
+    return signature - (1 << SIGNATURE_BITS) if signature >= 1 << (SIGNATURE_BITS - 1) else signature
+
+
+def _from_int64(value: int) -> int:
+    return value + (1 << SIGNATURE_BITS) if value < 0 else value
+
+
+class SimHashIndex:
+    """
+    Índice LSH de firmas SimHash: los 64 bits se reparten en
+    `max_distance + 1` bandas y cada banda indexa los trabajos por su valor.
+    Dos firmas a distancia de Hamming <= `max_distance` coinciden por fuerza
+    en al menos una banda (no hay bits distintos suficientes para cambiarlas
+    todas), así que basta con comparar los trabajos que comparten alguna.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self._layout = _band_layout(max_distance + 1)
+        self._signatures: Dict[str, int] = {}
+        self._buckets: List[Dict[int, List[str]]] = [defaultdict(list) for _ in self._layout]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _bands(self, signature: int) -> List[int]:
+        return [(signature >> shift) & mask for shift, mask in self._layout]
+
+    def add(self, key: str, signature: int):
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            bucket[band].append(key)
+
+    def remove(self, key: str):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            keys = bucket[band]
+            keys.remove(key)
+            if not keys:
+                del bucket[band]
+
+    def find(self, signature: int, exclude: Optional[str] = None) -> Optional[str]:
+        """Devuelve el trabajo indexado más parecido dentro de `max_distance`, si lo hay."""
+        best: Optional[Tuple[int, str]] = None
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            for key in bucket.get(band, ()):
+                if key == exclude:
+                    continue
+                distance = (signature ^ self._signatures[key]).bit_count()
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, key)
+        return best[1] if best else None
+
+
+class DuplicateDetector:
+    """
+    Detecta ofertas casi idénticas entre fuentes o republicadas con otra URL
+    antes de publicarlas. La firma se calcula sobre título, empresa y
+    descripción normalizados; el índice vive en memoria y sus firmas se
+    guardan en MongoDB para reconstruirlo al arrancar.
+
+    Solo se indexan las ofertas cuya publicación confirmó Kafka (`confirm`):
+    hasta entonces sus firmas quedan pendientes, y los duplicados de una
+    oferta pendiente del mismo lote esperan a saber si el original se publicó.
+    """
+
+    def __init__(
+            self,
+            repository: Optional[JobSignatureRepository] = None,
+            max_distance: Optional[int] = None,
+            min_tokens: Optional[int] = None
+    ):
+        self.repository = repository
+        self.index = SimHashIndex(settings.DEDUP_MAX_HAMMING_DISTANCE if max_distance is None else max_distance)
+        self.min_tokens = settings.DEDUP_MIN_TOKENS if min_tokens is None else min_tokens
+        # job_id -> (fuente, firma) de los únicos aún sin confirmar
+        self._pending: Dict[str, Tuple[str, int]] = {}
+        # job_id duplicado -> (job_id original pendiente, fuente)
+        self._waiting: Dict[str, Tuple[str, str]] = {}
+
+        self.checked: Dict[str, int] = defaultdict(int)
+        self.duplicates: Dict[str, int] = defaultdict(int)
+        self.skipped = 0
+
+    async def load(self):
+        """Reconstruye el índice con las firmas guardadas."""
+        if self.repository is None:
+            return
+        async for doc in self.repository.iter_all():
+            self.index.add(doc["_id"], _from_int64(doc["simhash"]))
+        logger.info(f"Duplicate index loaded with {len(self.index)} job signatures.")
+
+    def signature(self, job: ProcessedJobData) -> Optional[int]:
+        text = f"{job.title}\n{job.company}\n{job.description}"
+        tokens = tokenize(fold_text(text))
+        # Con muy poco texto dos ofertas distintas de la misma empresa parecerían iguales
+        if len(tokens) < self.min_tokens:
+            return None
+        return simhash(tokens)
+
+    def filter_duplicates(
+            self,
+            processed: List[Tuple[RawJobData, ProcessedJobData]]
+    ) -> Tuple[List[Tuple[RawJobData, ProcessedJobData]], Dict[str, str]]:
+        """
+        Separa los trabajos del lote que no hay que publicar. Devuelve los
+        únicos y {job_id duplicado: job_id original} de los que duplican una
+        oferta ya publicada. Los que duplican a otro único del mismo lote no
+        se devuelven en ninguno de los dos: se resuelven en `confirm`.
+        """
+        unique = []
+        duplicates: Dict[str, str] = {}
+        batch = SimHashIndex(self.index.max_distance)
+        for raw_job, processed_job in processed:
+            source = processed_job.source.value
+            signature = self.signature(processed_job)
+            if signature is None:
+                self.skipped += 1
+                unique.append((raw_job, processed_job))
+                continue
+
+            self.checked[source] += 1
+            original = self.index.find(signature, exclude=raw_job.job_id)
+            if original is not None:
+                self.duplicates[source] += 1
+                duplicates[raw_job.job_id] = original
+                continue
+
+            original = batch.find(signature)
+            if original is not None:
+                self._waiting[raw_job.job_id] = (original, source)
+                continue
+
+            batch.add(raw_job.job_id, signature)
+            self._pending[raw_job.job_id] = (source, signature)
+            unique.append((raw_job, processed_job))
+
+        if duplicates:
+            logger.info(f"Flagged {len(duplicates)} near-duplicate jobs out of {len(processed)}")
+        return unique, duplicates
+
+    async def confirm(self, published: List[str], failed: List[str]) -> Dict[str, str]:
+        """
+        Indexa (y guarda) las firmas de los trabajos publicados y olvida las
+        de los fallidos. Devuelve {job_id duplicado: job_id original} de los
+        duplicados del lote cuyo original acaba de publicarse; los de un
+        original fallido quedan sin procesar y se evaluarán de nuevo.
+        """
+        documents = []
+        for job_id in published:
+            pending = self._pending.pop(job_id, None)
+            if pending is None:
+                continue
+            source, signature = pending
+            self.index.add(job_id, signature)
+            documents.append({"_id": job_id, "source": source, "simhash": _to_int64(signature)})
+        for job_id in failed:
+            self._pending.pop(job_id, None)
+
+        published_ids = set(published)
+        failed_ids = set(failed)
+        duplicates: Dict[str, str] = {}
+        for job_id, (original, source) in list(self._waiting.items()):
+            if original in published_ids:
+                self.duplicates[source] += 1
+                duplicates[job_id] = original
+                del self._waiting[job_id]
+            elif original in failed_ids:
+                del self._waiting[job_id]
+
+        if self.repository is not None:
+            await self.repository.save(documents)
+        return duplicates
+
+    def stats(self) -> dict:
+        return {
+            "indexed": len(self.index),
+            "max_hamming_distance": self.index.max_distance,
+            "pending": len(self._pending),
+            "skipped_short_texts": self.skipped,
+            "sources": {
+                source: {
+                    "checked": checked,
+                    "duplicates": self.duplicates[source],
+                    "duplicate_rate": round(self.duplicates[source] / checked, 4) if checked else 0.0,
+                }
+                for source, checked in self.checked.items()
+            },
+        }
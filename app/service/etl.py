@@ -1,14 +1,33 @@
+import asyncio
 import logging
-from typing import List, Optional
+import time
+from contextlib import aclosing
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from pydantic import TypeAdapter, ValidationError
+
+from app.config.settings import settings
 from app.core.datastore.repository.mongodb import MongoDBRepository
-from app.core.model.schemas import RawJobData, ProcessedJobData
+from app.core.model.schemas import RawJobData, ProcessedJobData, ETLRunResult
+from app.core.process_pool import TransformExecutor, transform_executor as default_transform_executor
+from app.service.duplicate_detector import DuplicateDetector
 
 from app.core.event.kafka.producer import KafkaProducer
+from app.service.job_transform import (
+    detect_remote_job, extract_requirements, normalize_job_type, raw_job_record, transform_record, transform_records
+)
 
 logger = logging.getLogger(__name__)
 
+JOB_EVENTS_TOPIC = "job-events"
+STREAM_CHECKPOINT = "job-etl-stream"
+# Todos los recorridos comparten STREAM_CHECKPOINT: solo puede haber uno a la vez por proceso
+_stream_lock = asyncio.Lock()
+
+# Valida un lote de ProcessedJobData en una sola llamada
+PROCESSED_JOBS_ADAPTER = TypeAdapter(List[ProcessedJobData])
+
 
 class JobETLService:
     """Servicio ETL para transformar datos crudos en formato para ms-job."""
@@ -17,107 +36,339 @@ class JobETLService:
             self,
             mongo_repository: MongoDBRepository,
             kafka_producer: KafkaProducer,
-            batch_size: int = 100
+            batch_size: int = 100,
+            transform_executor: Optional[TransformExecutor] = None,
+            duplicate_detector: Optional[DuplicateDetector] = None
     ):
         self.mongo_repository = mongo_repository
         self.kafka_producer = kafka_producer
         self.batch_size = batch_size
+        self.transform_executor = transform_executor or default_transform_executor
+        # Sin detector (o con DEDUP_ENABLED=False) se publican todos los trabajos
+        self.duplicate_detector = duplicate_detector
 
     def transform_job_data(self, raw_job: RawJobData) -> ProcessedJobData:
         """Transforma datos crudos al formato esperado por ms-job."""
         try:
-            # Extraer requisitos del texto de la descripción usando NLP
-            requirements = self._extract_requirements(raw_job.description)
-
-            # Determinar si es remoto basado en la descripción y ubicación
-            is_remote = self._detect_remote_job(raw_job.description, raw_job.location)
-
-            # Normalizar el tipo de trabajo
-            job_type = self._normalize_job_type(raw_job.job_type)
-
-            return ProcessedJobData(
-                source_job_id=raw_job.job_id,
-                title=raw_job.title,
-                company=raw_job.company,
-                description=raw_job.description,
-                requirements=requirements,
-                location=raw_job.location,
-                is_remote=is_remote,
-                source_url=raw_job.url,
-                salary_range=raw_job.salary_range,
-                job_type=job_type,
-                level=raw_job.experience_level or "NOT_SPECIFIED",
-                source=raw_job.source
-            )
+            return ProcessedJobData(**transform_record(raw_job_record(raw_job)))
         except Exception as e:
             logger.error(f"Error transforming job data: {str(e)}")
             raise
 
+    def transform_batch(
+            self,
+            raw_jobs: List[RawJobData]
+    ) -> Tuple[List[Tuple[RawJobData, ProcessedJobData]], Dict[str, str]]:
+        """
+        Transforma un lote con `transform_records` y valida los resultados en
+        bloque. Devuelve los pares (crudo, procesado) y los errores por job_id.
+        """
+        records = transform_records([raw_job_record(raw_job) for raw_job in raw_jobs])
+        return self._validate_batch(raw_jobs, records)
+
+    async def transform_batch_async(
+            self,
+            raw_jobs: List[RawJobData]
+    ) -> Tuple[List[Tuple[RawJobData, ProcessedJobData]], Dict[str, str]]:
+        """
+        Como `transform_batch`, pero `transform_records` se ejecuta en el pool
+        de procesos si está activo y el lote es suficientemente grande. Solo
+        viajan dicts planos; la validación con Pydantic se hace aquí.
+        """
+        records = await self.transform_executor.map(
+            transform_records, [raw_job_record(raw_job) for raw_job in raw_jobs]
+        )
+        return self._validate_batch(raw_jobs, records)
+
+    def _validate_batch(
+            self,
+            raw_jobs: List[RawJobData],
+            records: List[Tuple[Optional[dict], Optional[str]]]
+    ) -> Tuple[List[Tuple[RawJobData, ProcessedJobData]], Dict[str, str]]:
+        transformed = []
+        failures = {}
+        for raw_job, (record, error) in zip(raw_jobs, records):
+            if error is None:
+                transformed.append((raw_job, record))
+            else:
+                failures[raw_job.job_id] = error
+
+        try:
+            processed_jobs = PROCESSED_JOBS_ADAPTER.validate_python([record for _, record in transformed])
+            return [(raw_job, job) for (raw_job, _), job in zip(transformed, processed_jobs)], failures
+        except ValidationError:
+            pass
+
+        # Un registro inválido invalida todo el lote: se validan uno a uno para aislarlo
+        processed = []
+        for raw_job, record in transformed:
+            try:
+                processed.append((raw_job, ProcessedJobData.model_validate(record)))
+            except ValidationError as e:
+                failures[raw_job.job_id] = str(e)
+        return processed, failures
+
     def _extract_requirements(self, description: str) -> List[str]:
-        """Extrae requisitos del texto de la descripción usando NLP."""
-        # Aquí implementarías la lógica de extracción de requisitos
-        # Por ahora retornamos una lista vacía
-        return []
+        """Extrae requisitos del texto de la descripción."""
+        return extract_requirements(description)
 
     def _detect_remote_job(self, description: str, location: str) -> bool:
         """Detecta si un trabajo es remoto basado en la descripción y ubicación."""
-        description_lower = description.lower()
-        location_lower = location.lower()
-
-        remote_keywords = {"remote", "remoto", "trabajo a distancia", "home office", "teletrabajo"}
-        return any(keyword in description_lower or keyword in location_lower
-                   for keyword in remote_keywords)
+        return detect_remote_job(description, location)
 
     def _normalize_job_type(self, job_type: Optional[str]) -> str:
         """Normaliza el tipo de trabajo a los valores aceptados por ms-job."""
-        if not job_type:
-            return "FULL_TIME"
+        return normalize_job_type(job_type)
 
-        job_type_lower = job_type.lower()
+    def _build_event(self, raw_job: RawJobData, processed_job: ProcessedJobData) -> dict:
+        """Crea el evento Kafka JOB_CREATED para un trabajo transformado."""
+        return {
+            "type": "JOB_CREATED",
+            "data": processed_job.dict(),
+            "metadata": {
+                "source": raw_job.source,
+                "processed_at": datetime.utcnow().isoformat(),
+                "raw_job_id": raw_job.job_id
+            }
+        }
 
-        if "full" in job_type_lower or "tiempo completo" in job_type_lower:
-            return "FULL_TIME"
-        elif "part" in job_type_lower or "medio tiempo" in job_type_lower:
-            return "PART_TIME"
-        elif "contract" in job_type_lower or "contrato" in job_type_lower:
-            return "CONTRACT"
-        else:
-            return "FULL_TIME"
+    async def process_pending_jobs(
+            self,
+            batched: Optional[bool] = None,
+            streaming: Optional[bool] = None
+    ) -> ETLRunResult:
+        """
+        Procesa trabajos pendientes y los envía a Kafka.
+
+        Args:
+            batched: Publica el lote completo en paralelo y lo marca como procesado
+                con un único `update_many`. Con False se usa el envío uno a uno.
+                Por defecto `settings.ETL_BATCHED_PUBLISH`.
+            streaming: Recorre todos los pendientes por bloques hasta vaciarlos
+                (ver `stream_pending_jobs`) en lugar de un único lote de
+                `batch_size`. Por defecto `settings.ETL_STREAMING`.
+        """
+        if batched is None:
+            batched = settings.ETL_BATCHED_PUBLISH
+        if streaming is None:
+            streaming = settings.ETL_STREAMING
 
-    async def process_pending_jobs(self):
-        """Procesa trabajos pendientes y los envía a Kafka."""
+        if streaming:
+            return await self.stream_pending_jobs(batched=batched)
+
+        result = ETLRunResult()
+        started = time.perf_counter()
         try:
             # Obtener trabajos sin procesar
             raw_jobs = await self.mongo_repository.get_unprocessed_jobs(self.batch_size)
             #print(f"Found {len(raw_jobs)} unprocessed jobs.")
-            for raw_job in raw_jobs:
-                try:
-                    # Transformar datos
-                    processed_job = self.transform_job_data(raw_job)
-
-                    # Crear evento Kafka
-                    event = {
-                        "type": "JOB_CREATED",
-                        "data": processed_job.dict(),
-                        "metadata": {
-                            "source": raw_job.source,
-                            "processed_at": datetime.utcnow().isoformat(),
-                            "raw_job_id": raw_job.job_id
-                        }
-                    }
-
-                    # Enviar a Kafka
-                    await self.kafka_producer.send_event("job-events", event)
-
-                    # Marcar como procesado
-                    await self.mongo_repository.mark_job_as_processed(raw_job.job_id)
-
-                    logger.info(f"Successfully processed and sent job {raw_job.job_id}")
-
-                except Exception as e:
-                    logger.error(f"Error processing job {raw_job.job_id}: {str(e)}")
-                    continue
+            await self._publish(raw_jobs, result, batched)
+
+            result.elapsed_seconds = time.perf_counter() - started
+            logger.info(
+                f"ETL run finished: {result.published} published, {result.duplicates} duplicates, {result.failed} failed "
+                f"in {result.elapsed_seconds:.2f}s ({result.events_per_second:.1f} events/sec)"
+            )
+            return result
 
         except Exception as e:
             logger.error(f"Error in process_pending_jobs: {str(e)}")
             raise
+
+    async def stream_pending_jobs(
+            self,
+            batched: bool = True,
+            chunk_size: Optional[int] = None,
+            max_records: Optional[int] = None,
+            max_seconds: Optional[float] = None
+    ) -> ETLRunResult:
+        """
+        Procesa todos los trabajos pendientes por bloques hasta vaciarlos o
+        agotar el presupuesto de registros/tiempo.
+
+        Tras cada bloque publicado se guarda un checkpoint (created_at, _id) en
+        MongoDB; si el proceso se interrumpe, la siguiente ejecución continúa
+        desde ahí. Al vaciar la cola el checkpoint se borra, de modo que la
+        siguiente pasada vuelve a empezar por el principio y recoge los
+        trabajos que fallaron o cambiaron detrás de la posición guardada.
+
+        Las llamadas concurrentes (ETLWorker, JobSpyScraper, endpoints) se
+        ejecutan una detrás de otra: en paralelo se pisarían el checkpoint y
+        publicarían los mismos documentos.
+        """
+        if _stream_lock.locked():
+            logger.info("Another ETL stream is running, waiting for it to finish")
+        async with _stream_lock:
+            return await self._stream_pending_jobs(batched, chunk_size, max_records, max_seconds)
+
+    async def _stream_pending_jobs(
+            self,
+            batched: bool,
+            chunk_size: Optional[int],
+            max_records: Optional[int],
+            max_seconds: Optional[float]
+    ) -> ETLRunResult:
+        chunk_size = chunk_size or settings.ETL_STREAM_CHUNK_SIZE
+        max_records = max_records or settings.ETL_STREAM_MAX_RECORDS
+        max_seconds = max_seconds or settings.ETL_STREAM_MAX_SECONDS
+
+        result = ETLRunResult()
+        started = time.perf_counter()
+        seen = 0
+        drained = True
+
+        try:
+            checkpoint = await self.mongo_repository.get_etl_checkpoint(STREAM_CHECKPOINT)
+            if checkpoint:
+                logger.info(f"Resuming ETL stream from checkpoint {checkpoint}")
+
+            chunks = self.mongo_repository.iter_unprocessed_jobs(chunk_size, after=checkpoint)
+            async with aclosing(chunks):
+                async for raw_jobs, position in chunks:
+                    await self._publish(raw_jobs, result, batched)
+                    await self.mongo_repository.save_etl_checkpoint(STREAM_CHECKPOINT, position)
+                    seen += len(raw_jobs)
+
+                    elapsed = time.perf_counter() - started
+                    if (max_records and seen >= max_records) or (max_seconds and elapsed >= max_seconds):
+                        logger.info(f"ETL stream budget reached after {seen} jobs in {elapsed:.2f}s")
+                        drained = False
+                        break
+
+            if drained:
+                await self.mongo_repository.clear_etl_checkpoint(STREAM_CHECKPOINT)
+
+            result.elapsed_seconds = time.perf_counter() - started
+            logger.info(
+                f"ETL stream finished ({'drained' if drained else 'budget reached'}): "
+                f"{result.published} published, {result.duplicates} duplicates, {result.failed} failed "
+                f"in {result.elapsed_seconds:.2f}s ({result.events_per_second:.1f} events/sec)"
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in stream_pending_jobs: {str(e)}")
+            raise
+
+    async def publish_raw_jobs(self, raw_jobs: List[RawJobData], batched: Optional[bool] = None) -> ETLRunResult:
+        """Transforma y publica una lista de trabajos ya leídos de MongoDB."""
+        if batched is None:
+            batched = settings.ETL_BATCHED_PUBLISH
+
+        result = ETLRunResult()
+        started = time.perf_counter()
+        await self._publish(raw_jobs, result, batched)
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
+
+    async def _publish(self, raw_jobs: List[RawJobData], result: ETLRunResult, batched: bool):
+        if batched:
+            await self._publish_batch(raw_jobs, result)
+        else:
+            await self._publish_one_by_one(raw_jobs, result)
+
+    async def build_events(
+            self,
+            raw_jobs: List[RawJobData],
+            result: ETLRunResult
+    ) -> Tuple[List[dict], List[str]]:
+        """
+        Transforma un lote y crea sus eventos; los fallos se anotan en
+        `result`. Los casi duplicados de una oferta ya publicada no generan evento.
+        """
+        processed, failures = await self.transform_batch_async(raw_jobs)
+        for job_id, error in failures.items():
+            logger.error(f"Error processing job {job_id}: {error}")
+            result.failed += 1
+            result.failures[job_id] = error
+
+        if self.duplicate_detector is not None and settings.DEDUP_ENABLED:
+            processed, duplicates = self.duplicate_detector.filter_duplicates(processed)
+            await self._mark_duplicates(duplicates, result)
+
+        events = []
+        job_ids = []
+        for raw_job, processed_job in processed:
+            events.append(self._build_event(raw_job, processed_job))
+            job_ids.append(raw_job.job_id)
+        return events, job_ids
+
+    async def send_events(self, events: List[dict], job_ids: List[str], result: ETLRunResult):
+        """Publica los eventos en paralelo y marca los confirmados en una sola escritura."""
+        errors = await self.kafka_producer.send_events_batch(JOB_EVENTS_TOPIC, events)
+
+        acknowledged = []
+        for job_id, error in zip(job_ids, errors):
+            if error is None:
+                acknowledged.append(job_id)
+            else:
+                logger.error(f"Error sending job {job_id}: {str(error)}")
+                result.failed += 1
+                result.failures[job_id] = str(error)
+
+        # Marcar como procesados todos los confirmados
+        await self.mongo_repository.mark_jobs_as_processed(acknowledged)
+        result.published += len(acknowledged)
+
+        if self.duplicate_detector is not None and settings.DEDUP_ENABLED:
+            # Solo lo confirmado entra en el índice de duplicados
+            failed = [job_id for job_id, error in zip(job_ids, errors) if error is not None]
+            duplicates = await self.duplicate_detector.confirm(acknowledged, failed)
+            await self._mark_duplicates(duplicates, result)
+
+    async def _mark_duplicates(self, duplicates: Dict[str, str], result: ETLRunResult):
+        if duplicates:
+            # No se publican: quedan procesados y apuntando a la oferta original
+            await self.mongo_repository.mark_jobs_as_duplicates(duplicates)
+            result.duplicates += len(duplicates)
+
+    async def _publish_batch(self, raw_jobs: List[RawJobData], result: ETLRunResult):
+        """
+        Transforma y publica un lote completo, y marca los confirmados en una
+        sola escritura. Un error del lote se cuenta en `result` y no detiene
+        la ejecución: sus trabajos siguen pendientes para la siguiente pasada.
+        """
+        published = result.published
+        try:
+            events, job_ids = await self.build_events(raw_jobs, result)
+            if events:
+                await self.send_events(events, job_ids, result)
+        except Exception as e:
+            if result.published > published:
+                # Los eventos ya se publicaron y marcaron; falló solo el registro de duplicados
+                logger.error(f"Error recording duplicates after publishing batch: {str(e)}")
+                return
+
+            logger.error(f"Error publishing batch of {len(raw_jobs)} jobs: {str(e)}")
+            pending = [raw_job.job_id for raw_job in raw_jobs if raw_job.job_id not in result.failures]
+            for job_id in pending:
+                result.failed += 1
+                result.failures[job_id] = str(e)
+            if self.duplicate_detector is not None and settings.DEDUP_ENABLED:
+                # Liberar las firmas pendientes del lote: se evaluarán de nuevo al reintentarlo
+                await self.duplicate_detector.confirm([], pending)
+
+    async def _publish_one_by_one(self, raw_jobs: List[RawJobData], result: ETLRunResult):
+        """Envía cada trabajo esperando su confirmación antes del siguiente."""
+        for raw_job in raw_jobs:
+            try:
+                # Transformar datos
+                processed_job = self.transform_job_data(raw_job)
+
+                # Crear evento Kafka
+                event = self._build_event(raw_job, processed_job)
+
+                # Enviar a Kafka
+                await self.kafka_producer.send_event(JOB_EVENTS_TOPIC, event)
+
+                # Marcar como procesado
+                await self.mongo_repository.mark_job_as_processed(raw_job.job_id)
+
+                logger.info(f"Successfully processed and sent job {raw_job.job_id}")
+                result.published += 1
+
+            except Exception as e:
+                logger.error(f"Error processing job {raw_job.job_id}: {str(e)}")
+                result.failed += 1
+                result.failures[raw_job.job_id] = str(e)
+                continue
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from bson import Timestamp
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.config.settings import settings
+from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.service.etl import JobETLService
+
+logger = logging.getLogger(__name__)
+
+CHANGE_STREAM_CHECKPOINT = "job-etl-change-stream"
+
+# Códigos de MongoDB: change streams no soportados (standalone) e historial perdido
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class ETLWorker:
+    """
+    Worker ETL continuo que publica los trabajos en cuanto llegan a `raw_jobs`.
+
+    En modo "change_stream" observa la colección con un change stream y
+    guarda el resume token tras cada lote publicado para reanudar sin perder
+    cambios. Sin token (primer arranque o historial perdido) el stream empieza
+    en la hora del cluster tomada antes de publicar los pendientes, para no
+    perder lo insertado entre ambos pasos. Los eventos repetidos al reanudar
+    traen `processed: False` aunque el trabajo ya se publicó, así que cada
+    lote se relee y solo se publican los que siguen pendientes.
+
+    Si MongoDB no es un replica set se recurre al modo "poll", que ejecuta
+    `process_pending_jobs` cada `poll_interval` segundos.
+    """
+
+    def __init__(
+            self,
+            mongo_repository: MongoDBRepository,
+            etl_service: JobETLService,
+            mode: Optional[str] = None,
+            batch_size: Optional[int] = None,
+            max_wait_ms: Optional[int] = None,
+            poll_interval: Optional[float] = None
+    ):
+        self.mongo_repository = mongo_repository
+        self.etl_service = etl_service
+        self.mode = mode or settings.ETL_WORKER_MODE
+        self.batch_size = batch_size or settings.ETL_WORKER_BATCH_SIZE
+        self.max_wait_ms = max_wait_ms or settings.ETL_WORKER_MAX_WAIT_MS
+        self.poll_interval = poll_interval or settings.ETL_WORKER_POLL_INTERVAL_SECONDS
+
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    async def start(self):
+        if self.mode == "off":
+            logger.info("ETL worker disabled.")
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"ETL worker started in {self.mode} mode.")
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info("ETL worker stopped.")
+
+    async def _run(self):
+        if self.mode == "change_stream":
+            try:
+                await self._run_change_stream()
+                return
+            except OperationFailure as e:
+                if e.code != CHANGE_STREAM_NOT_SUPPORTED:
+                    raise
+                logger.warning("Change streams require a replica set; falling back to polling ETL.")
+
+        await self._run_polling()
+
+    async def _run_polling(self):
+        while not self._stopping.is_set():
+            try:
+                await self.etl_service.process_pending_jobs()
+            except Exception as e:
+                logger.error(f"Error in polling ETL worker: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _run_change_stream(self):
+        while not self._stopping.is_set():
+            resume_token = await self.mongo_repository.get_resume_token(CHANGE_STREAM_CHECKPOINT)
+            # Antes de publicar los pendientes: lo que llegue mientras tanto lo verá el stream
+            start_at = None if resume_token is not None else await self.mongo_repository.get_cluster_time()
+
+            # Publicar primero lo que quedó pendiente mientras el worker no observaba
+            try:
+                await self.etl_service.process_pending_jobs()
+            except Exception as e:
+                logger.error(f"Error publishing pending jobs before watching: {str(e)}", exc_info=True)
+
+            try:
+                await self._consume_changes(resume_token, start_at)
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_NOT_SUPPORTED:
+                    raise
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    logger.warning("Change stream resume token is no longer in the oplog; restarting from now.")
+                    await self.mongo_repository.save_resume_token(CHANGE_STREAM_CHECKPOINT, None)
+                else:
+                    logger.error(f"Change stream failed: {str(e)}", exc_info=True)
+                    await asyncio.sleep(self.poll_interval)
+            except PyMongoError as e:
+                logger.error(f"Change stream interrupted: {str(e)}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _consume_changes(self, resume_token: Optional[dict], start_at: Optional[Timestamp] = None):
+        async with self.mongo_repository.watch_unprocessed_jobs(
+                resume_after=resume_token,
+                max_await_time_ms=self.max_wait_ms,
+                start_at_operation_time=start_at
+        ) as stream:
+            logger.info("Watching raw_jobs change stream.")
+            saved_token = resume_token
+            while not self._stopping.is_set():
+                # Agrupar cambios hasta completar el lote o agotar la espera máxima
+                documents = {}
+                deadline = time.monotonic() + self.max_wait_ms / 1000
+                while len(documents) < self.batch_size and time.monotonic() < deadline:
+                    change = await stream.try_next()
+                    if change is None:
+                        break
+                    document = change.get("fullDocument")
+                    if document is not None:
+                        documents[document["_id"]] = document
+
+                # fullDocument de una inserción es el de entonces: se relee para no
+                # publicar otra vez lo que ya publicó la pasada de pendientes
+                raw_jobs = await self.mongo_repository.get_unprocessed_jobs_by_ids(list(documents))
+                if raw_jobs:
+                    result = await self.etl_service.publish_raw_jobs(raw_jobs)
+                    logger.info(
+                        f"Change stream batch: {result.published} published, {result.failed} failed "
+                        f"({result.events_per_second:.1f} events/sec)"
+                    )
+
+                # Guardar el token solo tras publicar, para reanudar sin perder cambios
+                if stream.resume_token is not None and stream.resume_token != saved_token:
+                    await self.mongo_repository.save_resume_token(CHANGE_STREAM_CHECKPOINT, stream.resume_token)
+                    saved_token = stream.resume_token
@@ -1,9 +1,15 @@
-import httpx
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
 
+from app.config.settings import settings
+from app.core.exceptions import CircuitOpenError
+from app.core.extraction_cache import ExtractionCache, extraction_cache as default_extraction_cache, extraction_key
+from app.core.http import HTTPClientRegistry, http_clients as default_http_clients
+from app.core.html_reducer import reduce_html
 from app.core.model.schemas import IndeedJobData  # Importa el modelo
+from app.core.rate_limit import RateLimiterRegistry, rate_limiter as default_rate_limiter
+from app.service.card_parser import parse_cards
 from langchain_scrapegraph.tools import SmartScraperTool  # Asegúrate de tener SmartScraperTool instalado
 
 logger = logging.getLogger(__name__)
@@ -11,12 +17,21 @@ logger = logging.getLogger(__name__)
 
 class IndeedScraperSG:
     """
-    Scraper para Indeed que utiliza ScrapeGraph (SmartScraperTool) para extraer
-    datos estructurados del HTML usando prompts.
+    Scraper para Indeed: lee las tarjetas de resultados con selectores y, si
+    el parser falla o su cobertura es baja, usa ScrapeGraph (SmartScraperTool)
+    para extraer los datos del HTML con un prompt.
     """
 
-    def __init__(self):
+    def __init__(
+            self,
+            rate_limiter: Optional[RateLimiterRegistry] = None,
+            extraction_cache: Optional[ExtractionCache] = None,
+            http_clients: Optional[HTTPClientRegistry] = None
+    ):
         self.smart_scraper = SmartScraperTool()
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.extraction_cache = extraction_cache or default_extraction_cache
+        self.http_clients = http_clients or default_http_clients
 
     async def scrape_jobs(self, keywords: str, location: str) -> List[Dict]:
         """
@@ -30,10 +45,19 @@ class IndeedScraperSG:
                 "sort": "date",
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(base_url, params=params)
+            async with self.rate_limiter.limit("indeed") as attempt:
+                response = await self.http_clients.client("indeed").get(base_url, params=params)
                 response.raise_for_status()
                 page_html = response.text
+                attempt.empty = not page_html.strip()
+
+            if settings.CARD_PARSER_ENABLED:
+                parsed = parse_cards("indeed", page_html)
+                if parsed is not None:
+                    return [
+                        IndeedJobData(**job, posted_at=datetime.utcnow()).dict()
+                        for job in parsed
+                    ]
 
             user_prompt = """
             Extract a list of job postings from the HTML. 
@@ -45,12 +69,20 @@ class IndeedScraperSG:
               5) posted_at
               6) url
             """
+            # Al LLM solo le llegan las tarjetas de oferta, sin scripts, estilos ni atributos
+            reduced = reduce_html(page_html)
             tool_input = {
                 "user_prompt": user_prompt,
-                "website_html": page_html,
+                "website_html": reduced.html,
             }
 
-            result = self.smart_scraper.invoke(tool_input)
+            # Misma página (reducida) y mismo prompt: se reutiliza la extracción anterior
+            cache_key = extraction_key(user_prompt, html=reduced.html)
+            result = await self.extraction_cache.get(cache_key)
+            if result is None:
+                result = await self.smart_scraper.ainvoke(tool_input)
+                if isinstance(result, dict) and result.get("items"):
+                    await self.extraction_cache.set(cache_key, result)
 
             job_list = []
             if isinstance(result, dict) and "items" in result:
@@ -69,6 +101,10 @@ class IndeedScraperSG:
 
             return job_list
 
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping Indeed scraping: {str(e)}")
+            return []
+
         except Exception as e:
             logger.error(f"Error en IndeedScraperSG: {str(e)}")
             return []
@@ -3,11 +3,13 @@ from datetime import datetime
 
 from sqlalchemy.orm import Session
 
-import httpx
 import json
 import logging
+from typing import Optional
+
 from app.config.settings import settings
 from app.core.event.kafka.producer import KafkaProducer
+from app.core.http import HTTPClientRegistry, http_clients as default_http_clients
 from app.core.model.job_offer import JobOffer
 from app.core.model.schemas import LinkedInJobCreate
 
@@ -15,9 +17,10 @@ logger = logging.getLogger(__name__)
 
 
 class JobCRUD:
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
         self.kafka_producer = KafkaProducer()
         self.ms_job_api_url = settings.MS_JOB_API_URL
+        self.http_clients = http_clients or default_http_clients
 
     async def create_job(
             self,
@@ -59,14 +62,13 @@ class JobCRUD:
 
     async def _create_job_api(self, job_data: LinkedInJobCreate) -> JobOffer:
         """Crea una oferta usando la API REST de ms-job"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.ms_job_api_url}/jobs",
-                json=job_data.dict()
-            )
-            if response.status_code == 201:
-                return JobOffer(**response.json())
-            raise Exception(f"Error creating job via API: {response.text}")
+        response = await self.http_clients.client("ms_job").post(
+            f"{self.ms_job_api_url}/jobs",
+            json=job_data.dict()
+        )
+        if response.status_code == 201:
+            return JobOffer(**response.json())
+        raise Exception(f"Error creating job via API: {response.text}")
 
     def _create_local_job(self, db: Session, job_data: LinkedInJobCreate) -> JobOffer:
         """
@@ -104,4 +106,14 @@ class JobCRUD:
             logger.error(f"Error updating job: {str(e)}")
             if prefer_kafka:
                 return await self._update_job_api(job_id, job_data)
-            raise
\ No newline at end of file
+            raise
+
+    async def _update_job_api(self, job_id: str, job_data: dict) -> JobOffer:
+        """Actualiza una oferta usando la API REST de ms-job"""
+        response = await self.http_clients.client("ms_job").put(
+            f"{self.ms_job_api_url}/jobs/{job_id}",
+            json=job_data
+        )
+        if response.status_code == 200:
+            return JobOffer(**response.json())
+        raise Exception(f"Error updating job via API: {response.text}")
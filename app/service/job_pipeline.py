@@ -0,0 +1,164 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+import pandas as pd
+
+from app.config.settings import settings
+from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.core.model.schemas import BulkUpsertStatus, ETLRunResult, JobSource, RawJobData
+from app.service.etl import JobETLService
+from app.service.normalizer import filter_seen_jobs, jobs_frame_to_documents
+from app.service.pipeline import Pipeline, PipelineRun, Stage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScrapeTask:
+    """Una búsqueda a ejecutar: `fetch` devuelve un DataFrame de JobSpy o una lista de dicts."""
+    source: JobSource
+    keyword: str
+    location: str
+    fetch: Optional[Callable[[], Awaitable[Any]]] = None
+
+
+class JobPipeline:
+    """
+    Pipeline scrape → normalize → store → transform → publish.
+
+    Cada etapa es un pool de workers con su propia concurrencia, conectado a
+    la siguiente por una cola acotada: si Kafka o MongoDB se ralentizan, las
+    colas se llenan y el scraping espera en lugar de acumular trabajo.
+
+    Con `publish=False` el pipeline termina en `store` y la publicación queda
+    en manos del `ETLWorker`. Es el valor por defecto cuando el worker está
+    activo (`ETL_WORKER_MODE` distinto de "off"): si publicaran los dos, el
+    worker vería con `processed: False` los trabajos que el pipeline está
+    publicando y emitiría JOB_CREATED dos veces.
+    """
+
+    def __init__(
+            self,
+            mongo_repository: MongoDBRepository,
+            etl_service: JobETLService,
+            queue_size: Optional[int] = None,
+            publish: Optional[bool] = None
+    ):
+        self.mongo_repository = mongo_repository
+        self.etl_service = etl_service
+        self.publish = settings.ETL_WORKER_MODE == "off" if publish is None else publish
+        queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+
+        self.pipeline = Pipeline([
+            Stage("scrape", self._scrape, settings.PIPELINE_SCRAPE_CONCURRENCY, queue_size),
+            Stage("normalize", self._normalize, settings.PIPELINE_NORMALIZE_CONCURRENCY, queue_size),
+            Stage("store", self._store, settings.PIPELINE_STORE_CONCURRENCY, queue_size),
+            Stage("transform", self._transform, settings.PIPELINE_TRANSFORM_CONCURRENCY, queue_size),
+            Stage("publish", self._publish, settings.PIPELINE_PUBLISH_CONCURRENCY, queue_size),
+        ])
+
+    async def start(self):
+        await self.pipeline.start()
+
+    async def stop(self, drain: bool = True):
+        await self.pipeline.stop(drain=drain)
+
+    def stats(self) -> dict:
+        return self.pipeline.stats()
+
+    async def submit(self, task: ScrapeTask, run: PipelineRun):
+        await self.pipeline.submit(task, run)
+
+    async def submit_scraped(self, task: ScrapeTask, result: Any, run: PipelineRun):
+        """Envía un resultado ya scrapeado directamente a la etapa `normalize`."""
+        scraped = 0 if result is None else len(result)
+        run.add("scraped", scraped)
+        if scraped:
+            await self.pipeline.submit((task, result), run, stage="normalize")
+
+    async def run_tasks(self, tasks: List[ScrapeTask], name: str = "") -> PipelineRun:
+        """Envía las tareas al pipeline y espera a que terminen todas sus etapas."""
+        run = PipelineRun(name)
+        for task in tasks:
+            await self.submit(task, run)
+        await run.wait()
+        return run
+
+    async def _scrape(self, task: ScrapeTask, run: PipelineRun) -> List[Tuple[ScrapeTask, Any]]:
+        logger.info(f"Scraping '{task.keyword}' in {task.location} from {task.source}")
+        result = await task.fetch()
+        scraped = 0 if result is None else len(result)
+        run.add("scraped", scraped)
+        if not scraped:
+            logger.info(f"No jobs found for '{task.keyword}' from {task.source}")
+            return []
+        return [(task, result)]
+
+    async def _normalize(self, item: Tuple[ScrapeTask, Any], run: PipelineRun) -> List[List[dict]]:
+        task, result = item
+        if isinstance(result, pd.DataFrame):
+            pending_df = filter_seen_jobs(result, self.mongo_repository.seen_cache)
+            # Los omitidos ya están guardados sin cambios
+            run.add("stored", len(result) - len(pending_df))
+            documents = jobs_frame_to_documents(pending_df)
+        else:
+            documents = []
+            for job in result:
+                try:
+                    documents.append(self.mongo_repository.build_job_document(RawJobData(
+                        source=task.source,
+                        title=job.get("title"),
+                        company=job.get("company"),
+                        description=job.get("description"),
+                        location=job.get("location"),
+                        url=job.get("url"),
+                        salary_range=job.get("salary_range"),
+                        requirements=job.get("requirements", []),
+                        job_type=job.get("job_type"),
+                        experience_level=job.get("experience_level"),
+                        raw_data=job,
+                        processed=False
+                    )))
+                except Exception as e:
+                    logger.error(f"Error normalizing job {job.get('url')}: {str(e)}")
+                    run.add("failed")
+
+        # Repartir en bloques para que varios workers de `store` escriban en paralelo
+        chunk_size = settings.MONGO_BULK_CHUNK_SIZE
+        return [documents[offset:offset + chunk_size] for offset in range(0, len(documents), chunk_size)]
+
+    async def _store(self, documents: List[dict], run: PipelineRun) -> List[List[dict]]:
+        result = await self.mongo_repository.save_raw_jobs_bulk(documents)
+        run.add("stored", result.stored)
+        run.add("failed", result.failed)
+
+        if not self.publish:
+            # Los publica el ETLWorker a partir de raw_jobs
+            return []
+
+        # Solo los trabajos nuevos o modificados siguen hacia la publicación
+        written = [
+            documents[item.index] for item in result.items
+            if item.status in (BulkUpsertStatus.UPSERTED, BulkUpsertStatus.MATCHED)
+        ]
+        return [written] if written else []
+
+    async def _transform(self, documents: List[dict], run: PipelineRun) -> List[Tuple[List[dict], List[str]]]:
+        result = ETLRunResult()
+        raw_jobs = self.mongo_repository.docs_to_raw_jobs(documents)
+        run.add("failed", len(documents) - len(raw_jobs))
+
+        events, job_ids = await self.etl_service.build_events(raw_jobs, result)
+        run.add("failed", result.failed)
+        run.add("duplicates", result.duplicates)
+        return [(events, job_ids)] if events else []
+
+    async def _publish(self, item: Tuple[List[dict], List[str]], run: PipelineRun) -> List:
+        events, job_ids = item
+        result = ETLRunResult()
+        await self.etl_service.send_events(events, job_ids, result)
+        run.add("published", result.published)
+        run.add("failed", result.failed)
+        run.add("duplicates", result.duplicates)
+        return []
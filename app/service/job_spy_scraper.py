@@ -1,14 +1,19 @@
 from datetime import datetime, date, timezone, time
 import asyncio
 import logging
+import time as time_module
 from typing import List, Optional
-from jobspy import scrape_jobs
 import pandas as pd
 
+from app.config.settings import settings
 from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.core.executor import ScrapeExecutor, scrape_executor as default_scrape_executor
 from app.core.model.schemas import RawJobData, JobSource
 
 from app.service.etl import JobETLService
+from app.service.job_transform import extract_requirements
+from app.service.normalizer import filter_seen_jobs, jobs_frame_to_documents
+from app.service.two_phase_scraper import TwoPhaseScraper
 from app.core.exceptions import ScraperException
 import logging
 
@@ -22,13 +27,18 @@ class JobSpyScraper:
             etl_service: JobETLService,
             scraping_interval: int = 3600,  # 1 hora por defecto
             proxies: List[str] = None,
-            results_wanted: int = 1000
+            results_wanted: int = 1000,
+            scrape_executor: Optional[ScrapeExecutor] = None
     ):
         self.mongo_repository = mongo_repository
         self.etl_service = etl_service
         self.scraping_interval = scraping_interval
         self.proxies = proxies
         self.results_wanted = results_wanted
+        # Por defecto el pool compartido: un pool propio saltaría el límite global,
+        # el limitador de peticiones y el pool de proxies
+        self.scrape_executor = scrape_executor or default_scrape_executor
+        self.two_phase_scraper = TwoPhaseScraper(self.scrape_executor, mongo_repository)
 
         self.default_search_terms = [
             "python developer",
@@ -44,38 +54,49 @@ class JobSpyScraper:
         while True:
             try:
                 await self.run_scraping_cycle()
-                # Procesar trabajos pendientes con el ETL
-                #print("Processing ETL jobs...")
-                await self.etl_service.process_pending_jobs()
-                #print("ETL jobs processed.")
+                # Procesar trabajos pendientes con el ETL, salvo que ya lo haga el ETLWorker
+                if settings.ETL_WORKER_MODE == "off":
+                    await self.etl_service.process_pending_jobs()
                 await asyncio.sleep(self.scraping_interval)
             except Exception as e:
                 logging.error(f"Error in scraping cycle: {str(e)}")
                 await asyncio.sleep(60)
 
     async def run_scraping_cycle(self):
-        """Ejecuta un ciclo completo de scraping para todos los términos de búsqueda."""
-        for search_term in self.default_search_terms:
-            try:
-                logging.info(f"Starting scraping for term: {search_term}")
-                jobs_df = scrape_jobs(
-                    site_name=["indeed"],
-                    search_term=search_term,
-                    location="Remote",
-                    results_wanted=self.results_wanted,
-                    hours_old=120,  # Últimas 72 horas
-                    proxies=self.proxies,
-                    description_format="markdown",
-                    enforce_annual_salary=False,
-                    verbose=2,
-                )
-                print(f"Scraping completed. Found {len(jobs_df)} jobs.")
-                print(f"Scraping results: {jobs_df}")
-                await self.process_scraped_jobs(jobs_df)
+        """
+        Ejecuta un ciclo completo de scraping para todos los términos de búsqueda.
 
-            except Exception as e:
-                logging.error(f"Error scraping term '{search_term}': {str(e)}")
-                continue
+        Los términos se lanzan en paralelo; el pool de `scrape_executor` limita
+        cuántas llamadas a JobSpy corren a la vez.
+        """
+        started = time_module.monotonic()
+        await asyncio.gather(*(self._scrape_term(search_term) for search_term in self.default_search_terms))
+        logging.info(
+            f"Scraping cycle for {len(self.default_search_terms)} terms finished in "
+            f"{time_module.monotonic() - started:.1f}s"
+        )
+
+    async def _scrape_term(self, search_term: str):
+        try:
+            logging.info(f"Starting scraping for term: {search_term}")
+            # En dos fases solo se descargan las descripciones de las ofertas nuevas
+            scrape = self.two_phase_scraper if settings.SCRAPE_TWO_PHASE else self.scrape_executor
+            jobs_df = await scrape.scrape_jobs(
+                site_name=["indeed"],
+                search_term=search_term,
+                location="Remote",
+                results_wanted=self.results_wanted,
+                hours_old=120,  # Últimas 72 horas
+                proxies=self.proxies,  # None: el executor asigna proxies de su pool
+                description_format="markdown",
+                enforce_annual_salary=False,
+                verbose=2,
+            )
+            logging.info(f"Scraping completed for '{search_term}'. Found {len(jobs_df)} jobs.")
+            await self.process_scraped_jobs(jobs_df)
+
+        except Exception as e:
+            logging.error(f"Error scraping term '{search_term}': {str(e)}")
 
     def _prepare_raw_data(self, job_series: pd.Series) -> dict:
         """Prepara los datos crudos para MongoDB convirtiendo fechas a formato ISO."""
@@ -89,17 +110,43 @@ class JobSpyScraper:
                 raw_data[key] = value
         return raw_data
 
-    async def process_scraped_jobs(self, jobs_df: pd.DataFrame):
-        """Procesa los trabajos scrapeados y los guarda en MongoDB."""
+    async def process_scraped_jobs(self, jobs_df: pd.DataFrame) -> int:
+        """
+        Procesa los trabajos scrapeados y los guarda en MongoDB.
+
+        Returns:
+            int: Número de trabajos guardados
+        """
         if jobs_df.empty:
             logging.warning("No jobs found in this scraping cycle")
-            return
+            return 0
 
         # Verificar conexión a MongoDB
         if not await self.mongo_repository.verify_connection():
             ##print("MongoDB connection is not available")
             logging.error("MongoDB connection is not available")
-            return
+            return 0
+
+        # Los trabajos que la caché sabe sin cambios no llegan a convertirse ni a MongoDB
+        pending_df = filter_seen_jobs(jobs_df, self.mongo_repository.seen_cache)
+        skipped = len(jobs_df) - len(pending_df)
+        if pending_df.empty:
+            return skipped
+
+        # Conversión por columnas del DataFrame a documentos listos para escribir
+        documents = jobs_frame_to_documents(pending_df)
+
+        # Guardar todos los trabajos con upserts masivos
+        result = await self.mongo_repository.save_raw_jobs_bulk(documents)
+        return result.stored + skipped
+
+    def build_raw_jobs_per_row(self, jobs_df: pd.DataFrame) -> List[RawJobData]:
+        """
+        Implementación de referencia fila a fila (iterrows) de la conversión
+        del DataFrame. Se conserva para comprobar la equivalencia con
+        `jobs_frame_to_documents`.
+        """
+        raw_jobs = []
 
         ##print(f"Processing {len(jobs_df)} jobs.")
         for _, job in jobs_df.iterrows():
@@ -142,13 +189,15 @@ class JobSpyScraper:
                     created_at=datetime.now(timezone.utc)
                 )
                 ##print(f"raw_job: {raw_job}")
-                await self.mongo_repository.save_raw_job(raw_job)
+                raw_jobs.append(raw_job)
 
             except Exception as e:
                 #print(f"Error processing job: {str(e)}")
                 logging.error(f"Error processing job: {str(e)}", exc_info=True)
                 continue
 
+        return raw_jobs
+
     def _map_source(self, site_name: str) -> JobSource:
         """Mapea el nombre del sitio a nuestro enum JobSource."""
         mapping = {
@@ -192,7 +241,6 @@ class JobSpyScraper:
         Formatea la información de salario para trabajos, ajustando valores predeterminados si hay datos faltantes.
         """
         try:
-            print(f"job: {job}")
             # Extraer datos directamente del trabajo
             min_amount = job.get("min_amount")
             max_amount = job.get("max_amount")
@@ -201,21 +249,16 @@ class JobSpyScraper:
             location = job.get("location", "").replace(",", "").strip().lower()
             # Extraer el país usando el nuevo algoritmo
             country = self.extract_country_from_location(location).lower()
-            print(f"country: {country}")
             # Reemplazar NaN o None con valores predeterminados
             min_amount = float(min_amount) if pd.notna(min_amount) else None
             max_amount = float(max_amount) if pd.notna(max_amount) else None
             interval = str(interval).lower() if pd.notna(interval) else None
             currency = currency if pd.notna(currency) else None
-            print(f"location: {country}")
             # Detectar ubicación y ajustar moneda e intervalo
             if "peru" in country or "pe" in country:  # Detectar trabajos en PerúPerú
-                print("Trabajo en Perú detectado.")
                 if currency is None or currency == "USD":  # Cambiar a Soles si no está definido o es USD
-                    print("Cambiando moneda a PEN (Soles) para trabajos en Perú.")
                     currency = "PEN"  # Cambiar moneda a Soles
                 if interval == "yearly":  # Convertir salario anual a mensual
-                    print("Convirtiendo salario anual a mensual (PEN).")
                     if min_amount:
                         min_amount /= 12
                     if max_amount:
@@ -251,6 +294,6 @@ class JobSpyScraper:
 
     def _extract_requirements(self, job: pd.Series) -> List[str]:
         """Extrae requisitos del trabajo basados en la descripción."""
-        # Aquí podrías implementar lógica más sofisticada de NLP
-        # Por ahora retornamos una lista vacía
-        return []
\ No newline at end of file
+        # JobSpy nombra las columnas en minúsculas
+        description = job.get('description')
+        return extract_requirements(description) if isinstance(description, str) else []
\ No newline at end of file
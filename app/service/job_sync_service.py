@@ -1,13 +1,13 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 import logging
 
-from jobspy import scrape_jobs
-
 from app.core.datastore.repository.mongodb import MongoDBRepository
 from app.core.event.kafka.producer import KafkaProducer
+from app.core.executor import ScrapeExecutor, scrape_executor as default_scrape_executor
 from app.core.model.schemas import RawJobData, JobSource
 from app.service.etl import JobETLService
+from app.service.job_pipeline import JobPipeline, ScrapeTask
 from app.service.job_spy_scraper import JobSpyScraper
 
 logger = logging.getLogger(__name__)
@@ -18,16 +18,21 @@ class JobSyncService:
             self,
             mongo_repository: MongoDBRepository,
             kafka_producer: KafkaProducer,
-            proxies: List[str] = None
+            proxies: List[str] = None,
+            scrape_executor: Optional[ScrapeExecutor] = None,
+            job_pipeline: Optional[JobPipeline] = None
     ):
         self.mongo_repository = mongo_repository
+        self.scrape_executor = scrape_executor or default_scrape_executor
         #print("Initializing ETL service...")
         self.etl_service = JobETLService(mongo_repository, kafka_producer)
         #print("ETL service initialized.")
+        self.job_pipeline = job_pipeline or JobPipeline(mongo_repository, self.etl_service)
         self.scraper = JobSpyScraper(
             mongo_repository=mongo_repository,
             etl_service=self.etl_service,
-            proxies=proxies
+            proxies=proxies,
+            scrape_executor=self.scrape_executor
         )
 
     async def start_sync(self):
@@ -44,16 +49,29 @@ class JobSyncService:
         Realiza una sincronización manual con términos de búsqueda específicos.
         """
         try:
-            # Usamos la función scrape_jobs directamente de jobspy
-            jobs_df = scrape_jobs(
-                site_name=["indeed"],
-                search_term=search_term,
-                location=location,
-                results_wanted=10
+            scraped = {}
+
+            async def fetch():
+                # Ejecutamos scrape_jobs de jobspy en el pool compartido
+                scraped["jobs_df"] = await self.scrape_executor.scrape_jobs(
+                    site_name=["indeed"],
+                    search_term=search_term,
+                    location=location,
+                    results_wanted=10
+                )
+                return scraped["jobs_df"]
+
+            # Almacenamiento y publicación avanzan por el pipeline mientras se scrapea
+            run = await self.job_pipeline.run_tasks(
+                [ScrapeTask(source=JobSource.INDEED, keyword=search_term, location=location, fetch=fetch)],
+                name=f"manual-sync:{search_term}"
             )
+            if run.errors:
+                logger.error(f"Manual sync finished with errors: {run.errors}")
 
-            # Usamos el método a través de la instancia de scraper
-            await self.scraper.process_scraped_jobs(jobs_df)
+            jobs_df = scraped.get("jobs_df")
+            if jobs_df is None:
+                return []
             return [job.get('JOB_URL', '') for _, job in jobs_df.iterrows()]
 
         except Exception as e:
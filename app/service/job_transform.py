@@ -0,0 +1,90 @@
+from typing import List, Optional, Tuple
+
+from app.core.model.schemas import RawJobData
+from app.service.skills_extractor import fold_text, get_skills_extractor
+
+# Palabras clave precalculadas una vez por proceso. Se buscan con `in` sobre
+# el texto pasado a minúsculas una sola vez: en CPython es varias veces más
+# rápido que una alternancia de regex (con o sin IGNORECASE) sobre
+# descripciones largas.
+REMOTE_KEYWORDS = ("remote", "remoto", "trabajo a distancia", "home office", "teletrabajo")
+JOB_TYPE_KEYWORDS = (
+    # En orden de precedencia: "full-time / part-time" es FULL_TIME
+    ("FULL_TIME", ("full", "tiempo completo")),
+    ("PART_TIME", ("part", "medio tiempo")),
+    ("CONTRACT", ("contract", "contrato")),
+)
+DEFAULT_JOB_TYPE = "FULL_TIME"
+
+# Campos de RawJobData que necesita la transformación (raw_data no se copia)
+RECORD_FIELDS = (
+    "job_id", "title", "company", "description", "location", "url",
+    "salary_range", "job_type", "experience_level", "source",
+)
+
+
+def raw_job_record(raw_job: RawJobData) -> dict:
+    """Dict plano con los campos que usa `transform_record`."""
+    return {field: getattr(raw_job, field) for field in RECORD_FIELDS}
+
+
+def extract_requirements(description: Optional[str], folded: Optional[str] = None) -> List[str]:
+    """Extrae las habilidades de la descripción con la taxonomía de `skills_extractor`."""
+    return get_skills_extractor().extract(description, folded=folded)
+
+
+def _has_remote_keyword(text_lower: str) -> bool:
+    return any(keyword in text_lower for keyword in REMOTE_KEYWORDS)
+
+
+def detect_remote_job(description: Optional[str], location: Optional[str]) -> bool:
+    """Detecta si un trabajo es remoto basado en la descripción y ubicación."""
+    # La ubicación es corta: si ya lo indica, no hace falta recorrer la descripción
+    return _has_remote_keyword((location or "").lower()) or _has_remote_keyword((description or "").lower())
+
+
+def normalize_job_type(job_type: Optional[str]) -> str:
+    """Normaliza el tipo de trabajo a los valores aceptados por ms-job."""
+    if not job_type:
+        return DEFAULT_JOB_TYPE
+    job_type_lower = job_type.lower()
+    for normalized, keywords in JOB_TYPE_KEYWORDS:
+        if any(keyword in job_type_lower for keyword in keywords):
+            return normalized
+    return DEFAULT_JOB_TYPE
+
+
+def transform_record(record: dict) -> dict:
+    """Transforma un trabajo crudo (dict de `raw_job_record`) en los campos de `ProcessedJobData`."""
+    description = record["description"]
+    location = record["location"]
+    # Se pliega una sola vez y lo usan tanto los requisitos como la detección de remoto
+    folded = fold_text(description) if description else ""
+    return {
+        "source_job_id": record["job_id"],
+        "title": record["title"],
+        "company": record["company"],
+        "description": description,
+        "requirements": extract_requirements(description, folded=folded),
+        "location": location,
+        "is_remote": _has_remote_keyword((location or "").lower()) or _has_remote_keyword(folded),
+        "source_url": record["url"],
+        "salary_range": record["salary_range"],
+        "job_type": normalize_job_type(record["job_type"]),
+        "level": record["experience_level"] or "NOT_SPECIFIED",
+        "source": record["source"],
+    }
+
+
+def transform_records(records: List[dict]) -> List[Tuple[Optional[dict], Optional[str]]]:
+    """
+    Transforma un lote de dicts planos. Función pura de módulo, sin modelos
+    Pydantic: cada resultado es (dict transformado, None) o (None, error).
+    """
+    results = []
+    for record in records:
+        try:
+            results.append((transform_record(record), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
@@ -0,0 +1,210 @@
+from datetime import date, datetime, time
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_object_dtype
+
+from app.core.fingerprint import content_fingerprint
+from app.core.model.schemas import JobSource
+from app.core.seen_cache import SeenCache
+from app.service.job_transform import extract_requirements
+
+logger = logging.getLogger(__name__)
+
+SITE_TO_SOURCE = {
+    'linkedin': JobSource.LINKEDIN.value,
+    'indeed': JobSource.INDEED.value,
+    'glassdoor': JobSource.GLASSDOOR.value,
+    'google': JobSource.GOOGLE.value,
+}
+
+INTERVAL_LABELS = {
+    "monthly": "mensual",
+    "yearly": "anual",
+    "weekly": "semanal",
+    "daily": "diario",
+    "hourly": "por hora",
+}
+
+# Todos los identificadores de Perú ("pe", "peru", "perú") contienen "pe"
+PERU_IDENTIFIER = "pe"
+
+DEFAULT_MIN_SALARY = 1000.0
+DEFAULT_MAX_SALARY = 3000.0
+
+
+def _column(jobs_df: pd.DataFrame, name: str) -> pd.Series:
+    """Devuelve la columna o una serie vacía (NaN) si JobSpy no la incluyó."""
+    if name in jobs_df.columns:
+        return jobs_df[name]
+    return pd.Series(np.nan, index=jobs_df.index, dtype=object)
+
+
+def _iso_date(value):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time.min).isoformat()
+    return value
+
+
+def frame_to_records(jobs_df: pd.DataFrame) -> List[dict]:
+    """
+    Convierte el DataFrame en una lista de dicts: fechas a ISO y NaN/NaT a None.
+    """
+    frame = jobs_df.copy()
+    for column in frame.columns:
+        series = frame[column]
+        if is_datetime64_any_dtype(series):
+            frame[column] = series.map(lambda value: value.isoformat(), na_action="ignore")
+        elif is_object_dtype(series):
+            first_valid = series.first_valid_index()
+            if first_valid is not None and isinstance(series[first_valid], date):
+                frame[column] = series.map(_iso_date, na_action="ignore")
+
+    frame = frame.astype(object).where(frame.notna(), None)
+    # Construir los dicts desde listas por columna evita el boxing celda a celda de `to_dict`
+    columns = [str(column) for column in frame.columns]
+    values = [frame[column].tolist() for column in frame.columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def map_sources(sites: pd.Series) -> pd.Series:
+    """Mapea la columna `site` de JobSpy a los valores de `JobSource`."""
+    sources = sites.astype("string").str.lower().map(SITE_TO_SOURCE)
+    unrecognized = sites[sources.isna()].unique()
+    if len(unrecognized):
+        logger.warning(f"Unrecognized sites: {list(unrecognized)}. Defaulting to OTHER.")
+    return sources.fillna(JobSource.OTHER.value)
+
+
+def format_salaries(jobs_df: pd.DataFrame) -> List[str]:
+    """
+    Versión columnar de `JobSpyScraper._format_salary`: calcula la cadena de
+    salario de todas las filas, incluida la conversión a PEN mensual para Perú.
+    """
+    min_amount = pd.to_numeric(_column(jobs_df, "min_amount"), errors="coerce").to_numpy(dtype=float, copy=True)
+    max_amount = pd.to_numeric(_column(jobs_df, "max_amount"), errors="coerce").to_numpy(dtype=float, copy=True)
+
+    interval_col = _column(jobs_df, "interval")
+    interval = interval_col.astype(str).str.lower().where(interval_col.notna(), None).to_numpy(dtype=object)
+
+    currency_col = _column(jobs_df, "currency")
+    currency = currency_col.astype(object).where(currency_col.notna(), None).to_numpy(dtype=object)
+
+    location = (
+        _column(jobs_df, "location").fillna("").astype(str)
+        .str.replace(",", "", regex=False).str.strip().str.lower()
+    )
+    is_peru = location.str.contains(PERU_IDENTIFIER, regex=False).to_numpy(dtype=bool)
+
+    # Perú: moneda por defecto PEN y salario anual convertido a mensual
+    currency_missing = np.array([value is None or value == "USD" for value in currency], dtype=bool)
+    currency[is_peru & currency_missing] = "PEN"
+
+    yearly_peru = is_peru & (interval == "yearly")
+    min_amount[yearly_peru] /= 12
+    max_amount[yearly_peru] /= 12
+    interval[yearly_peru] = "monthly"
+
+    # Valores genéricos si falta información de salario (NaN o 0)
+    has_min = np.nan_to_num(min_amount) != 0
+    has_max = np.nan_to_num(max_amount) != 0
+    no_salary = ~has_min & ~has_max
+    min_amount[no_salary] = DEFAULT_MIN_SALARY
+    max_amount[no_salary] = DEFAULT_MAX_SALARY
+    has_min |= no_salary
+    has_max |= no_salary
+
+    salaries = []
+    for cur, low, high, interval_value, low_ok, high_ok in zip(
+            currency, min_amount, max_amount, interval, has_min, has_max
+    ):
+        interval_str = INTERVAL_LABELS.get(interval_value, "")
+        if low_ok and high_ok:
+            salaries.append(f"{cur} {low:,.2f} - {high:,.2f} {interval_str}")
+        elif low_ok:
+            salaries.append(f"{cur} {low:,.2f}+ {interval_str}")
+        elif high_ok:
+            salaries.append(f"Hasta {cur} {high:,.2f} {interval_str}")
+        else:
+            salaries.append("Salario no especificado.")
+    return salaries
+
+
+def _values(series: pd.Series) -> list:
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def frame_fingerprints(jobs_df: pd.DataFrame) -> Tuple[List[str], List[Optional[str]], List[str]]:
+    """
+    Calcula (sources, urls, content_hash) de cada fila sin construir los
+    documentos completos; las huellas coinciden con las de `jobs_frame_to_documents`.
+    """
+    sources = map_sources(_column(jobs_df, "site")).tolist()
+    urls = _values(_column(jobs_df, "job_url"))
+    salaries = format_salaries(jobs_df)
+    columns = {
+        field: _values(_column(jobs_df, field))
+        for field in ("title", "company", "description", "location", "job_type")
+    }
+
+    hashes = []
+    for position, salary_range in enumerate(salaries):
+        document = {field: values[position] for field, values in columns.items()}
+        document["salary_range"] = salary_range
+        hashes.append(content_fingerprint(document))
+    return sources, urls, hashes
+
+
+def filter_seen_jobs(jobs_df: pd.DataFrame, seen_cache: Optional[SeenCache]) -> pd.DataFrame:
+    """Descarta las filas que la caché sabe guardadas con el mismo contenido."""
+    if seen_cache is None or jobs_df.empty:
+        return jobs_df
+
+    sources, urls, hashes = frame_fingerprints(jobs_df)
+    keep = [
+        not seen_cache.is_unchanged(source, url, content_hash)
+        for source, url, content_hash in zip(sources, urls, hashes)
+    ]
+    skipped = len(keep) - sum(keep)
+    if skipped:
+        logger.info(f"Skipped {skipped} of {len(keep)} unchanged jobs using the seen cache")
+    return jobs_df[keep]
+
+
+def jobs_frame_to_documents(jobs_df: pd.DataFrame) -> List[dict]:
+    """
+    Convierte el DataFrame de JobSpy en documentos listos para
+    `MongoDBRepository.save_raw_jobs_bulk`, operando por columnas.
+
+    Produce la misma forma que `MongoDBRepository.build_job_document`
+    aplicado a la ruta por filas de `JobSpyScraper`, salvo que los NaN se
+    normalizan a None.
+    """
+    if jobs_df.empty:
+        return []
+
+    records = frame_to_records(jobs_df)
+    sources = map_sources(_column(jobs_df, "site")).tolist()
+    salaries = format_salaries(jobs_df)
+
+    documents = []
+    for raw_data, source, salary_range in zip(records, sources, salaries):
+        documents.append({
+            "source": source,
+            "job_id": raw_data.get('job_url'),
+            "title": raw_data.get('title'),
+            "company": raw_data.get('company'),
+            "description": raw_data.get('description'),
+            "location": raw_data.get('location'),
+            "url": raw_data.get('job_url'),
+            "salary_range": salary_range,
+            "requirements": extract_requirements(raw_data.get('description')),
+            "job_type": raw_data.get('job_type'),
+            "experience_level": raw_data.get('job_level'),
+            "raw_data": raw_data,
+            "processed": False
+        })
+        documents[-1]["content_hash"] = content_fingerprint(documents[-1])
+    return documents
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Un handler recibe un elemento y la ejecución a la que pertenece, y devuelve
+# los elementos que pasan a la siguiente etapa
+StageHandler = Callable[[Any, "PipelineRun"], Awaitable[List[Any]]]
+
+
+class PipelineRun:
+    """
+    Seguimiento de los elementos enviados al pipeline por un mismo llamador.
+
+    Lleva los contadores de progreso y sabe cuándo han terminado todos los
+    elementos derivados de sus envíos, en cualquier etapa.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.counters: Dict[str, int] = {"scraped": 0, "stored": 0, "published": 0, "failed": 0}
+        self.errors: List[str] = []
+        self._pending = 0
+        self._done = asyncio.Event()
+        self._done.set()
+
+    def add(self, counter: str, value: int = 1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def _retain(self):
+        self._pending += 1
+        self._done.clear()
+
+    def _release(self):
+        self._pending -= 1
+        if self._pending <= 0:
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    async def wait(self):
+        """Espera a que todos los elementos de la ejecución salgan del pipeline."""
+        await self._done.wait()
+
+
+class Stage:
+    """Etapa del pipeline: un pool de workers que consume una cola acotada."""
+
+    def __init__(self, name: str, handler: StageHandler, concurrency: int = 1, queue_size: int = 16):
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        self.processed = 0
+        self.failed = 0
+        self.emitted = 0
+        self.in_flight = 0
+        self.busy_seconds = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "emitted": self.emitted,
+            # Elementos por segundo de trabajo efectivo de la etapa
+            "throughput": round(self.processed / self.busy_seconds, 2) if self.busy_seconds else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    Pipeline asíncrono por etapas conectadas con colas acotadas.
+
+    Cuando una etapa se ralentiza su cola se llena y los workers de la etapa
+    anterior quedan bloqueados en `put`, de modo que la contrapresión llega
+    hasta `submit`.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        self._workers: List[asyncio.Task] = []
+        self._started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        if self.running:
+            return
+        self._started_at = time.monotonic()
+        for position, stage in enumerate(self.stages):
+            next_stage = self.stages[position + 1] if position + 1 < len(self.stages) else None
+            for index in range(stage.concurrency):
+                self._workers.append(asyncio.create_task(
+                    self._worker(stage, next_stage),
+                    name=f"pipeline-{stage.name}-{index}"
+                ))
+        logger.info(f"Pipeline started with stages: {[stage.name for stage in self.stages]}")
+
+    async def submit(self, item: Any, run: PipelineRun, stage: Optional[str] = None):
+        """
+        Envía un elemento a la primera etapa, o a `stage` si se indica;
+        espera si la cola está llena.
+        """
+        if not self.running:
+            await self.start()
+        target = self.stages[0] if stage is None else next(s for s in self.stages if s.name == stage)
+        run._retain()
+        await target.queue.put((item, run))
+
+    async def stop(self, drain: bool = True):
+        """Detiene el pipeline, terminando antes los elementos en curso si `drain` es True."""
+        if drain:
+            # Al vaciar cada etapa en orden, sus salidas ya están en la cola siguiente
+            for stage in self.stages:
+                await stage.queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        logger.info("Pipeline stopped.")
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "uptime_seconds": round(time.monotonic() - self._started_at, 1) if self._started_at else 0.0,
+            "stages": {stage.name: stage.stats() for stage in self.stages},
+        }
+
+    async def _worker(self, stage: Stage, next_stage: Optional[Stage]):
+        while True:
+            item, run = await stage.queue.get()
+            stage.in_flight += 1
+            started = time.perf_counter()
+            try:
+                try:
+                    outputs = await stage.handler(item, run)
+                finally:
+                    # Solo cuenta el tiempo del handler, no la espera por contrapresión
+                    stage.busy_seconds += time.perf_counter() - started
+                stage.processed += 1
+                if next_stage is not None:
+                    for output in outputs or []:
+                        run._retain()
+                        stage.emitted += 1
+                        await next_stage.queue.put((output, run))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stage.failed += 1
+                run.errors.append(f"{stage.name}: {str(e)}")
+                logger.error(f"Error in pipeline stage '{stage.name}': {str(e)}", exc_info=True)
+            finally:
+                stage.in_flight -= 1
+                run._release()
+                stage.queue.task_done()
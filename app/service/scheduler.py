@@ -1,38 +1,71 @@
 from datetime import datetime, timedelta
 import asyncio
 import logging
-from typing import List
+import random
+import time
+from typing import Dict, List, Optional
 
+from app.config.settings import settings
 from app.core.datastore.repository.mongodb import MongoDBRepository
-from app.core.model.schemas import JobSource, RawJobData
+from app.core.model.schemas import JobSource
 
 from app.service.etl import JobETLService
 from app.service.indeed_scraper import IndeedScraperSG
+from app.service.job_pipeline import JobPipeline, ScrapeTask
+from app.service.pipeline import PipelineRun
 from app.service.scraper import LinkedInScraper
 
 logger = logging.getLogger(__name__)
 
 
 class ScrapingScheduler:
-    """Servicio para programar y coordinar el scraping de múltiples fuentes."""
+    """
+    Servicio para programar y coordinar el scraping de múltiples fuentes.
+
+    Cada (fuente, keyword) tiene su propio calendario: empieza con un desfase
+    aleatorio dentro del intervalo y se repite cada `scraping_interval` ±
+    `jitter_seconds`, así las búsquedas no coinciden todas en el mismo
+    instante. Las búsquedas están limitadas por un semáforo por fuente y
+    otro global, y sus resultados entran en el pipeline a medida que llegan.
+    """
 
     def __init__(
             self,
             mongo_repository: MongoDBRepository,
             etl_service: JobETLService,
-            scraping_interval: int = 3600  # 1 hora por defecto
+            scraping_interval: int = 3600,  # 1 hora por defecto
+            job_pipeline: Optional[JobPipeline] = None,
+            max_concurrency: Optional[int] = None,
+            source_concurrency: Optional[Dict[str, int]] = None,
+            jitter_seconds: Optional[float] = None
     ):
         self.mongo_repository = mongo_repository
         self.etl_service = etl_service
         self.scraping_interval = scraping_interval
+        self.job_pipeline = job_pipeline or JobPipeline(mongo_repository, etl_service)
+        self.jitter_seconds = settings.SCHEDULER_JITTER_SECONDS if jitter_seconds is None else jitter_seconds
+        self.location = settings.SCHEDULER_LOCATION
 
         # Inicializar scrapers
         self.scrapers = {
-            JobSource.LINKEDIN: LinkedInScraper(),
+            JobSource.LINKEDIN: LinkedInScraper(mongo_repository=mongo_repository),
             JobSource.INDEED: IndeedScraperSG(),
             #JobSource.GLASSDOOR: GlassdoorScraper(),
         }
 
+        skipped = [source.value for source in JobSource if source not in self.scrapers]
+        if skipped:
+            logger.info(f"No scraper configured for sources {skipped}; they will be skipped.")
+
+        self._global_limit = asyncio.Semaphore(max_concurrency or settings.SCHEDULER_MAX_CONCURRENCY)
+        source_concurrency = source_concurrency or settings.SCHEDULER_SOURCE_CONCURRENCY
+        self._source_limits = {
+            source: asyncio.Semaphore(
+                source_concurrency.get(source.value, settings.SCHEDULER_DEFAULT_SOURCE_CONCURRENCY)
+            )
+            for source in self.scrapers
+        }
+
         self.default_keywords = [
             "python developer",
             "software engineer",
@@ -43,65 +76,101 @@ class ScrapingScheduler:
         ]
 
     async def start_scheduling(self):
-        """Inicia el proceso de scheduling."""
+        """Inicia el calendario independiente de cada (fuente, keyword)."""
+        loops = [
+            asyncio.create_task(self._schedule_task(source, keyword))
+            for source in self.scrapers
+            for keyword in self.default_keywords
+        ]
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            for loop in loops:
+                loop.cancel()
+
+    async def _schedule_task(self, source: JobSource, keyword: str):
+        """Repite una búsqueda cada `scraping_interval` ± `jitter_seconds`."""
+        # El desfase inicial reparte las búsquedas a lo largo de todo el intervalo
+        await asyncio.sleep(random.uniform(0, self.scraping_interval))
         while True:
+            started = time.monotonic()
             try:
-                # Ejecutar scraping para cada fuente
-                for source in JobSource:
-                    await self.run_scraping_for_source(source)
+                # El pipeline ya transforma y publica lo guardado; los trabajos que
+                # fallen al publicar quedan pendientes para el ETL
+                run = PipelineRun(f"scheduler:{source.value}/{keyword}")
+                await self._run_task(source, keyword, run, 0)
+                await run.wait()
+                self._log_run(run, time.monotonic() - started, 1)
+            except Exception as e:
+                logger.error(f"Error in scheduled search '{keyword}' from {source}: {str(e)}")
 
-                # Procesar trabajos pendientes con el ETL
-                await self.etl_service.process_pending_jobs()
+            jitter = random.uniform(-self.jitter_seconds, self.jitter_seconds)
+            await asyncio.sleep(max(0.0, self.scraping_interval - (time.monotonic() - started) + jitter))
 
-                # Esperar hasta el próximo ciclo
-                await asyncio.sleep(self.scraping_interval)
+    async def run_cycle(self) -> float:
+        """
+        Ejecuta ahora, una sola vez, todas las fuentes y keywords en paralelo
+        (con un retardo aleatorio de hasta `jitter_seconds` por búsqueda).
 
-            except Exception as e:
-                logger.error(f"Error in scraping cycle: {str(e)}")
-                await asyncio.sleep(60)  # Esperar un minuto antes de reintentar
+        Returns:
+            float: Duración del ciclo en segundos (reloj de pared)
+        """
+        return await self._run_sources(list(self.scrapers), "scheduler-cycle")
 
     async def run_scraping_for_source(self, source: JobSource):
         """Ejecuta el scraping para una fuente específica."""
+        if source not in self.scrapers:
+            logger.warning(f"No scraper found for source {source}")
+            return
+        await self._run_sources([source], f"scheduler:{source.value}")
+
+    async def _run_sources(self, sources: List[JobSource], name: str) -> float:
+        started = time.monotonic()
+        run = PipelineRun(name)
+
+        tasks = [
+            asyncio.create_task(self._run_task(source, keyword, run, random.uniform(0, self.jitter_seconds)))
+            for source in sources
+            for keyword in self.default_keywords
+        ]
+        await asyncio.gather(*tasks)
+        # Esperar también a que el pipeline termine de guardar y publicar
+        await run.wait()
+
+        elapsed = time.monotonic() - started
+        self._log_run(run, elapsed, len(tasks))
+        return elapsed
+
+    @staticmethod
+    def _log_run(run: PipelineRun, elapsed: float, tasks: int):
+        for error in run.errors:
+            logger.error(f"Error in {run.name}: {error}")
+        logger.info(
+            f"{run.name} finished in {elapsed:.1f}s ({tasks} tasks): "
+            f"{run.counters['scraped']} scraped, {run.counters['stored']} stored, "
+            f"{run.counters['published']} published, {run.counters['failed']} failed")
+
+    async def _run_task(self, source: JobSource, keyword: str, run: PipelineRun, delay: float):
+        """Scrapea una keyword de una fuente respetando los límites y envía el resultado al pipeline."""
+        await asyncio.sleep(delay)
+        task = ScrapeTask(source=source, keyword=keyword, location=self.location)
         try:
-            scraper = self.scrapers.get(source)
-            if not scraper:
-                logger.warning(f"No scraper found for source {source}")
-                return
-
-            logger.info(f"Starting scraping for {source}")
-
-            for keyword in self.default_keywords:
-                try:
-                    jobs = await scraper.scrape_jobs(
-                        keywords=[keyword],
-                        location="Remote"
-                    )
-
-                    # Guardar cada trabajo en MongoDB
-                    for job in jobs:
-                        await self.mongo_repository.save_raw_job(
-                            RawJobData(
-                                source=source,
-                                title=job.get("title"),
-                                company=job.get("company"),
-                                description=job.get("description"),
-                                location=job.get("location"),
-                                url=job.get("url"),
-                                salary_range=job.get("salary_range"),
-                                requirements=job.get("requirements", []),
-                                job_type=job.get("job_type"),
-                                experience_level=job.get("experience_level"),
-                                raw_data=job,  # Guardamos el objeto completo como datos crudos
-                                processed=False
-                            )
-                        )
-
-                    logger.info(
-                        f"Successfully scraped and saved {len(jobs)} jobs for keyword '{keyword}' from {source}")
-
-                except Exception as e:
-                    logger.error(f"Error scraping jobs for keyword '{keyword}' from {source}: {str(e)}")
-                    continue
-
+            # Primero el límite de la fuente: una búsqueda que espera a su fuente
+            # no debe ocupar una plaza global que podría usar otra fuente
+            async with self._source_limits[source], self._global_limit:
+                logger.info(f"Scraping '{keyword}' in {self.location} from {source}")
+                jobs = await self._scrape(source, keyword)
         except Exception as e:
-            logger.error(f"Error in run_scraping_for_source for {source}: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error scraping jobs for keyword '{keyword}' from {source}: {str(e)}")
+            run.errors.append(f"{source.value}/{keyword}: {str(e)}")
+            return
+
+        # Fuera de los semáforos: si el pipeline está lleno, esperar no bloquea otras búsquedas
+        await self.job_pipeline.submit_scraped(task, jobs, run)
+
+    async def _scrape(self, source: JobSource, keyword: str) -> List[dict]:
+        scraper = self.scrapers[source]
+        # LinkedInScraper recibe una lista de keywords; IndeedScraperSG, una sola cadena
+        if isinstance(scraper, LinkedInScraper):
+            return await scraper.scrape_jobs(keywords=[keyword], location=self.location)
+        return await scraper.scrape_jobs(keywords=keyword, location=self.location)
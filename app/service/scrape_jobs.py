@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import socket
+from typing import List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.core.datastore.repository.scrape_jobs import ScrapeJobRepository
+from app.core.event.kafka.producer import KafkaProducer
+from app.core.executor import ScrapeExecutor
+from app.core.model.schemas import JobSource, ScrapeJob, ScrapeJobStatus, ScrapingRequest
+from app.service.etl import JobETLService
+from app.service.job_pipeline import JobPipeline, ScrapeTask
+from app.service.pipeline import PipelineRun
+from app.service.two_phase_scraper import TwoPhaseScraper
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeJobService:
+    """
+    Encola solicitudes de scraping y las ejecuta con workers en segundo plano.
+
+    La cola vive en MongoDB, por lo que los trabajos sobreviven a reinicios:
+    un trabajo en ejecución cuyo lease expira vuelve a ser reclamado.
+    """
+
+    def __init__(
+            self,
+            job_repository: ScrapeJobRepository,
+            mongo_repository: MongoDBRepository,
+            kafka_producer: KafkaProducer,
+            scrape_executor: ScrapeExecutor,
+            workers: Optional[int] = None,
+            poll_interval: Optional[float] = None,
+            lease_seconds: Optional[int] = None,
+            job_pipeline: Optional[JobPipeline] = None
+    ):
+        self.job_repository = job_repository
+        self.mongo_repository = mongo_repository
+        self.kafka_producer = kafka_producer
+        self.scrape_executor = scrape_executor
+        self.workers = workers or settings.SCRAPE_JOB_WORKERS
+        self.poll_interval = poll_interval or settings.SCRAPE_JOB_POLL_INTERVAL_SECONDS
+        self.lease_seconds = lease_seconds or settings.SCRAPE_JOB_LEASE_SECONDS
+        self.two_phase_scraper = TwoPhaseScraper(scrape_executor, mongo_repository)
+        self.job_pipeline = job_pipeline or JobPipeline(
+            mongo_repository, JobETLService(mongo_repository, kafka_producer)
+        )
+
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    async def submit(self, request: ScrapingRequest) -> Tuple[ScrapeJob, bool]:
+        """Encola una solicitud. Devuelve el trabajo y si fue creado o ya existía."""
+        return await self.job_repository.enqueue(request)
+
+    async def get(self, job_id: str) -> Optional[ScrapeJob]:
+        return await self.job_repository.get(job_id)
+
+    async def list_jobs(self, status: Optional[ScrapeJobStatus] = None, limit: int = 50) -> List[ScrapeJob]:
+        return await self.job_repository.list_jobs(status, limit)
+
+    async def start(self):
+        """Arranca los workers que drenan la cola."""
+        self._stopping.clear()
+        hostname = socket.gethostname()
+        for index in range(self.workers):
+            worker_id = f"{hostname}-{index}"
+            self._tasks.append(asyncio.create_task(self._worker_loop(worker_id)))
+        logger.info(f"Started {self.workers} scrape job workers.")
+
+    async def stop(self):
+        """Detiene los workers; los trabajos interrumpidos vuelven a la cola."""
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        logger.info("Scrape job workers stopped.")
+
+    async def _worker_loop(self, worker_id: str):
+        while not self._stopping.is_set():
+            try:
+                job = await self.job_repository.claim_next(worker_id, self.lease_seconds)
+                if job is None:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                await self._execute(job)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in scrape job worker {worker_id}: {str(e)}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _execute(self, job: ScrapeJob):
+        if job.attempts > settings.SCRAPE_JOB_MAX_ATTEMPTS:
+            logger.error(f"Scrape job {job.job_id} exceeded {settings.SCRAPE_JOB_MAX_ATTEMPTS} attempts")
+            await self.job_repository.fail(job.job_id, "Maximum number of attempts exceeded")
+            return
+
+        logger.info(f"Running scrape job {job.job_id} (attempt {job.attempts})")
+        try:
+            result = await self.run_job(job)
+            await self.job_repository.complete(job.job_id, result)
+            logger.info(f"Scrape job {job.job_id} completed: {result}")
+        except asyncio.CancelledError:
+            await self.job_repository.release(job.job_id)
+            raise
+        except Exception as e:
+            logger.error(f"Scrape job {job.job_id} failed: {str(e)}", exc_info=True)
+            await self.job_repository.fail(job.job_id, str(e))
+
+    async def run_job(self, job: ScrapeJob) -> dict:
+        """Ejecuta scraping, almacenamiento en MongoDB y publicación en el pipeline por etapas."""
+        request = job.request
+        country = request.country.lower() if request.country else "peru"
+
+        scrape = self.two_phase_scraper if settings.SCRAPE_TWO_PHASE else self.scrape_executor
+        task = ScrapeTask(
+            source=JobSource.INDEED,
+            keyword=",".join(request.keywords),
+            location=country,
+            fetch=lambda: scrape.scrape_jobs(
+                site_name=["indeed"],
+                search_term=",".join(request.keywords),
+                location=country,
+                results_wanted=1000,
+                hours_old=1200,
+                enforce_annual_salary=False,
+                country_indeed='peru',
+                description_format="markdown",
+                verbose=2,
+            )
+        )
+
+        run = PipelineRun(job.job_id)
+        await self.job_pipeline.submit(task, run)
+
+        # Volcar los contadores periódicamente mientras las etapas avanzan; también renueva el lease
+        while True:
+            try:
+                await asyncio.wait_for(run.wait(), timeout=settings.PIPELINE_PROGRESS_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            await self.job_repository.update_progress(job.job_id, self.lease_seconds, **run.counters)
+            if run.done:
+                break
+
+        if run.errors:
+            raise RuntimeError("; ".join(run.errors))
+
+        scraped = run.counters["scraped"]
+        if scraped == 0:
+            return {"message": "No new jobs found in scraping", "jobs_processed": 0}
+
+        return {
+            "message": f"Scraping and synchronization completed successfully. Found {scraped} jobs.",
+            "jobs_processed": scraped,
+        }
@@ -5,6 +5,17 @@ import logging
 from typing import List, Optional
 
 from app.config.settings import settings
+from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.core.exceptions import CircuitOpenError
+from app.core.extraction_cache import ExtractionCache, extraction_cache as default_extraction_cache, extraction_key
+from app.core.fingerprint import listing_fingerprint
+from app.core.http import BROWSER_HEADERS, HTTPClientRegistry, http_clients as default_http_clients
+from app.core.rate_limit import RateLimiterRegistry, rate_limiter as default_rate_limiter
+from app.service.card_parser import (
+    FALLBACK_DESCRIPTION_BUDGET, FALLBACK_ERROR, FALLBACK_MISSING_DESCRIPTIONS, card_parser_stats, parse_cards,
+    split_by_coverage
+)
+from app.service.description_fetcher import DescriptionFetcher
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +35,25 @@ for var in required_env_vars:
 
 
 class LinkedInScraper:
-    def __init__(self):
+    def __init__(
+            self,
+            rate_limiter: Optional[RateLimiterRegistry] = None,
+            extraction_cache: Optional[ExtractionCache] = None,
+            http_clients: Optional[HTTPClientRegistry] = None,
+            description_fetcher: Optional[DescriptionFetcher] = None,
+            mongo_repository: Optional[MongoDBRepository] = None
+    ):
         self.scraper = SmartScraperTool()
         self.base_url = "https://www.linkedin.com/jobs/search"
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.extraction_cache = extraction_cache or default_extraction_cache
+        self.http_clients = http_clients or default_http_clients
+        # Las tarjetas de la búsqueda no traen descripción: se descarga aparte
+        self.description_fetcher = description_fetcher or DescriptionFetcher(
+            rate_limiter=self.rate_limiter, http_clients=self.http_clients
+        )
+        # Sin repositorio todas las tarjetas cuentan como nuevas
+        self.mongo_repository = mongo_repository
 
     async def scrape_jobs(
             self,
@@ -41,6 +68,13 @@ class LinkedInScraper:
             try:
                 search_url = f"{self.base_url}?keywords={keyword}&location={location}"
 
+                # Camino rápido: la búsqueda pública se lee con selectores, sin LLM
+                if settings.CARD_PARSER_ENABLED:
+                    parsed = await self._parse_search_page(keyword, location)
+                    if parsed is not None:
+                        jobs.extend(parsed)
+                        continue
+
                 # Prompt para extracción de datos
                 prompt = """
                 Extract from each job listing:
@@ -55,20 +89,112 @@ class LinkedInScraper:
                 Format as JSON array with these fields.
                 """
 
-                result = await self.scraper.ainvoke({
-                    "user_prompt": prompt,
-                    "website_url": search_url
-                })
-                logger.info(f"Scraping result: {result}")
-                # Supongamos que 'result' es un dict con la clave 'job_listings'
-                if isinstance(result, dict) and "job_listings" in result:
-                    # result["job_listings"] es una lista de dicts
-                    # Toma hasta MAX_JOBS_PER_QUERY
-                    job_listings = result["job_listings"][:settings.MAX_JOBS_PER_QUERY]
-                    jobs.extend(job_listings)
+                # ScrapeGraph descarga la página por su cuenta, así que la clave es URL + prompt
+                cache_key = extraction_key(prompt, url=search_url)
+                result = await self.extraction_cache.get(cache_key)
+                if result is None:
+                    async with self.rate_limiter.limit("linkedin") as attempt:
+                        result = await self.scraper.ainvoke({
+                            "user_prompt": prompt,
+                            "website_url": search_url
+                        })
+                        logger.info(f"Scraping result: {result}")
+                        attempt.empty = not self._job_listings(result)
+                    # Los resultados vacíos pueden ser un bloqueo: no se guardan
+                    if self._job_listings(result):
+                        await self.extraction_cache.set(
+                            cache_key, result, ttl=settings.EXTRACTION_CACHE_URL_TTL_SECONDS
+                        )
+
+                jobs.extend(self._job_listings(result))
+
+            except CircuitOpenError as e:
+                # El sitio está en pausa: no tiene sentido intentar las demás keywords
+                logger.warning(f"Skipping LinkedIn scraping: {str(e)}")
+                break
 
             except Exception as e:
                 logger.error(f"Error scraping jobs for {keyword}: {str(e)}")
                 continue
 
         return jobs
+
+    async def _parse_search_page(self, keyword: str, location: str) -> Optional[List[dict]]:
+        """
+        Descarga la búsqueda, lee sus tarjetas y completa las descripciones
+        de las ofertas nuevas o cambiadas, que son las únicas que devuelve;
+        None si hay que recurrir al LLM.
+        """
+        try:
+            async with self.rate_limiter.limit("linkedin") as attempt:
+                client = self.http_clients.client("linkedin", headers=BROWSER_HEADERS, follow_redirects=True)
+                response = await client.get(self.base_url, params={"keywords": keyword, "location": location})
+                response.raise_for_status()
+                attempt.empty = not response.text.strip()
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.warning(f"Error fetching LinkedIn search for {keyword}, falling back to LLM: {str(e)}")
+            card_parser_stats.record_fallback("linkedin", FALLBACK_ERROR)
+            return None
+
+        parsed = parse_cards("linkedin", response.text)
+        if parsed is None:
+            return None
+        pending = await self._new_or_changed(parsed[:settings.MAX_JOBS_PER_QUERY])
+        if len(pending) > settings.CARD_PARSER_MAX_DESCRIPTION_FETCHES:
+            # Cada descripción pasa por el rate limiter de "linkedin": no se bloquea la búsqueda minutos
+            logger.warning(f"{len(pending)} new or changed LinkedIn jobs for {keyword} exceed the description "
+                           f"budget of {settings.CARD_PARSER_MAX_DESCRIPTION_FETCHES}, falling back to LLM extraction")
+            card_parser_stats.demote_fast_path("linkedin", FALLBACK_DESCRIPTION_BUDGET, len(parsed))
+            return None
+
+        jobs = await self._fill_descriptions(pending)
+        if jobs is None:
+            card_parser_stats.demote_fast_path("linkedin", FALLBACK_MISSING_DESCRIPTIONS, len(parsed))
+            return None
+        logger.info(f"LinkedIn search for {keyword}: {len(parsed)} cards, {len(parsed) - len(jobs)} known and "
+                    f"unchanged, {len(jobs)} descriptions fetched")
+        return jobs
+
+    async def _new_or_changed(self, jobs: List[dict]) -> List[dict]:
+        """
+        Descarta las tarjetas ya guardadas cuya huella de listado no cambió,
+        con la misma consulta que `TwoPhaseScraper`; `raw_data` guarda la
+        tarjeta tal cual, así que las huellas son comparables.
+        """
+        if self.mongo_repository is None:
+            return jobs
+        stored = await self.mongo_repository.find_listing_fingerprints({"linkedin": [job["url"] for job in jobs]})
+        return [
+            job for job in jobs
+            if stored.get(("linkedin", job["url"])) != listing_fingerprint(job)
+        ]
+
+    async def _fill_descriptions(self, jobs: List[dict]) -> Optional[List[dict]]:
+        """
+        Añade a las tarjetas la descripción de cada oferta. Si faltan demasiadas
+        (bloqueo o cambio del endpoint) devuelve None y se usa el LLM, que sí
+        las extrae; las pocas que falten quedan vacías.
+        """
+        if not jobs:
+            return jobs
+        descriptions = await self.description_fetcher.fetch_linkedin([job["url"] for job in jobs])
+        for job in jobs:
+            job["description"] = descriptions.get(job["url"], "")
+
+        _, coverage = split_by_coverage(jobs, ("description",))
+        if coverage < settings.CARD_PARSER_MIN_COVERAGE:
+            logger.warning(f"Only {coverage:.0%} of {len(jobs)} LinkedIn descriptions were fetched, "
+                           f"falling back to LLM extraction")
+            return None
+        return jobs
+
+    @staticmethod
+    def _job_listings(result) -> List[dict]:
+        # Supongamos que 'result' es un dict con la clave 'job_listings'
+        if isinstance(result, dict) and "job_listings" in result:
+            # result["job_listings"] es una lista de dicts
+            # Toma hasta MAX_JOBS_PER_QUERY
+            return result["job_listings"][:settings.MAX_JOBS_PER_QUERY]
+        return []
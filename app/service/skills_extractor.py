@@ -0,0 +1,176 @@
+import json
+import logging
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "resources" / "skills_taxonomy.json"
+
+# Tokens: "c++", "c#", "node.js", ".net" y "asp.net" se mantienen enteros;
+# guiones, barras y demás signos separan ("ci/cd" -> "ci", "cd")
+_TOKEN = re.compile(r"\.?[a-z0-9][a-z0-9#+]*(?:\.[a-z0-9#+]+)*")
+
+# Encabezados de la sección de requisitos (texto ya plegado, sin tildes)
+_REQUIREMENTS_HEADING = re.compile(
+    r"(requisitos|requerimientos|requirements|requisites|qualifications|calificaciones|"
+    r"perfil|lo que buscamos|what you.?ll need|what we.?re looking for|must have|"
+    r"conocimientos|skills|habilidades)\b"
+)
+_BULLET = re.compile(r"^\s*(?:[-•+]|\*(?!\*)|\d+[.)])\s")
+_HEADING_MAX_LENGTH = 60
+
+_END = object()
+
+
+def _build_fold_table() -> Dict[str, str]:
+    table = {}
+    for codepoint in range(0xC0, 0x250):
+        char = chr(codepoint)
+        base = unicodedata.normalize("NFKD", char).encode("ascii", "ignore").decode("ascii")
+        if base and base != char:
+            table[char] = base.lower()
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _fold_char(match: re.Match) -> str:
+    char = match.group()
+    return _FOLD_TABLE.get(char, char)
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas y sin tildes ("Inglés Avanzado" -> "ingles avanzado")."""
+    lowered = text.lower()
+    if lowered.isascii():
+        return lowered
+    # Solo se sustituyen los caracteres no ASCII, que son pocos: str.translate
+    # con una tabla recorre todo el texto y es varias veces más lento
+    return _NON_ASCII.sub(_fold_char, lowered)
+
+
+def tokenize(folded: str) -> List[str]:
+    return _TOKEN.findall(folded)
+
+
+class SkillsExtractor:
+    """
+    Extractor determinista de habilidades (tecnologías, idiomas y
+    certificaciones) a partir de una taxonomía JSON con alias en español e
+    inglés.
+
+    Los alias se tokenizan y se guardan en un trie de tokens; cada
+    descripción se recorre una sola vez quedándose con la coincidencia más
+    larga en cada posición ("react native" antes que "react"). Las
+    habilidades que aparecen bajo un encabezado de requisitos
+    ("## Requisitos", "**Requirements:**", ...) van primero en el resultado.
+    """
+
+    def __init__(self, taxonomy: dict):
+        self.version = taxonomy.get("version")
+        self.categories: Dict[str, str] = {}
+        self._trie: dict = {}
+        for category, entries in taxonomy.get("categories", {}).items():
+            for entry in entries:
+                name = entry["name"]
+                self.categories[name] = category
+                for alias in [name, *entry.get("aliases", [])]:
+                    self._add(alias, name)
+
+    def _add(self, alias: str, name: str):
+        tokens = tokenize(fold_text(alias))
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = name
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "SkillsExtractor":
+        path = Path(path) if path else DEFAULT_TAXONOMY_PATH
+        with open(path, encoding="utf-8") as taxonomy_file:
+            extractor = cls(json.load(taxonomy_file))
+        logger.info(f"Loaded skills taxonomy v{extractor.version} with {len(extractor.categories)} skills "
+                    f"from {path}")
+        return extractor
+
+    def _match(self, tokens: List[str], found: Dict[str, None]):
+        trie = self._trie
+        position = 0
+        count = len(tokens)
+        while position < count:
+            node = trie.get(tokens[position])
+            if node is None:
+                position += 1
+                continue
+            match: Optional[Tuple[int, str]] = None
+            end = position
+            while node is not None:
+                if _END in node:
+                    match = (end, node[_END])
+                end += 1
+                node = node.get(tokens[end]) if end < count else None
+            if match is None:
+                position += 1
+            else:
+                found.setdefault(match[1], None)
+                position = match[0] + 1
+
+    @staticmethod
+    def _heading(line: str) -> Optional[str]:
+        """Devuelve el texto del encabezado si la línea lo es (markdown, negrita o "Texto:")."""
+        stripped = line.strip()
+        if not stripped or len(stripped) > _HEADING_MAX_LENGTH or _BULLET.match(stripped):
+            return None
+        is_heading = (
+                stripped.startswith("#")
+                or (stripped.startswith("**") and stripped.rstrip(":").endswith("**"))
+                or stripped.endswith(":")
+        )
+        return stripped.strip("#*_: \t") if is_heading else None
+
+    def extract(self, description: Optional[str], folded: Optional[str] = None) -> List[str]:
+        """
+        Habilidades de la descripción sin duplicados, primero las de la
+        sección de requisitos. `folded` permite reutilizar el texto ya plegado.
+        """
+        if not description:
+            return []
+        folded = folded if folded is not None else fold_text(description)
+
+        required: Dict[str, None] = {}
+        other: Dict[str, None] = {}
+        # Las líneas se agrupan por sección y cada tramo se tokeniza de una vez
+        in_requirements = False
+        section: List[str] = []
+        for line in folded.split("\n"):
+            heading = self._heading(line)
+            if heading is not None and bool(_REQUIREMENTS_HEADING.match(heading)) != in_requirements:
+                self._match(tokenize("\n".join(section)), required if in_requirements else other)
+                in_requirements = not in_requirements
+                section = []
+            section.append(line)
+        self._match(tokenize("\n".join(section)), required if in_requirements else other)
+
+        return list(required) + [name for name in other if name not in required]
+
+    def stats(self) -> dict:
+        by_category: Dict[str, int] = {}
+        for category in self.categories.values():
+            by_category[category] = by_category.get(category, 0) + 1
+        return {"version": self.version, "skills": len(self.categories), "categories": by_category}
+
+
+@lru_cache(maxsize=1)
+def get_skills_extractor() -> SkillsExtractor:
+    """Extractor compartido, construido una vez por proceso desde `SKILLS_TAXONOMY_PATH`."""
+    return SkillsExtractor.from_file(settings.SKILLS_TAXONOMY_PATH)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -8,8 +8,10 @@ import logging
 from app.config.settings import settings
 from app.core.datastore.repository.mongodb import MongoDBRepository
 from app.core.event.kafka.producer import KafkaProducer
+from app.core.executor import ScrapeExecutor, scrape_executor as default_scrape_executor
+from app.core.exceptions import MongoDBError
 from app.core.model.job_offer import JobOffer
-from app.core.model.schemas import LinkedInJobCreate, RawJobData, JobSource
+from app.core.model.schemas import LinkedInJobCreate, RawJobData, JobSource, BulkUpsertStatus
 from app.service.etl import JobETLService
 from app.service.indeed_scraper import IndeedScraperSG
 from app.service.job_crud import JobCRUD
@@ -17,6 +19,9 @@ from app.service.job_spy_scraper import JobSpyScraper
 
 logger = logging.getLogger(__name__)
 
+# Resultados del guardado que implican contenido nuevo o cambiado (como en `JobPipeline._store`)
+PUBLISHABLE_STATUSES = (BulkUpsertStatus.UPSERTED, BulkUpsertStatus.MATCHED)
+
 
 class JobSyncService:
     def __init__(
@@ -25,7 +30,8 @@ class JobSyncService:
             kafka_producer: KafkaProducer,
             proxies: List[str] = None,
             scraping_interval: int = 3600,  # 1 hora por defecto
-            results_wanted: int = 50
+            results_wanted: int = 50,
+            scrape_executor: Optional[ScrapeExecutor] = None
     ):
         self.mongo_repository = mongo_repository
         self.etl_service = JobETLService(mongo_repository, kafka_producer)
@@ -35,9 +41,49 @@ class JobSyncService:
             etl_service=self.etl_service,
             scraping_interval=scraping_interval,
             proxies=proxies,
-            results_wanted=results_wanted
+            results_wanted=results_wanted,
+            scrape_executor=scrape_executor or default_scrape_executor
+        )
+
+    def _build_raw_job(self, job_data: dict, source: JobSource) -> RawJobData:
+        """Crea el RawJobData a partir de un trabajo scrapeado."""
+        return RawJobData(
+            source=source,
+            title=job_data.get("title"),
+            company=job_data.get("company"),
+            description=job_data.get("description"),
+            location=job_data.get("location"),
+            url=job_data.get("url"),
+            salary_range=job_data.get("salary_range"),
+            requirements=job_data.get("requirements", []),
+            job_type=job_data.get("job_type"),
+            experience_level=job_data.get("experience_level"),
+            raw_data=job_data,
+            processed=False
         )
 
+    async def _publish_raw_job(self, raw_job: RawJobData, source: JobSource):
+        """Transforma un trabajo guardado, lo publica en Kafka y lo marca como procesado."""
+        # Procesar inmediatamente con ETL
+        processed_job = self.etl_service.transform_job_data(raw_job)
+
+        # Crear evento Kafka
+        event = {
+            "type": "JOB_CREATED",
+            "data": processed_job.dict(),
+            "metadata": {
+                "source": source,
+                "processed_at": datetime.utcnow().isoformat(),
+                "raw_job_id": raw_job.job_id
+            }
+        }
+
+        # Enviar a Kafka
+        await self.etl_service.kafka_producer.send_event("job-events", event)
+
+        # Marcar como procesado
+        await self.mongo_repository.mark_job_as_processed(raw_job.job_id)
+
     async def sync_job(
             self,
             job_data: dict,
@@ -49,43 +95,17 @@ class JobSyncService:
         """
         try:
             # Crear RawJobData
-            raw_job = RawJobData(
-                source=source,
-                title=job_data.get("title"),
-                company=job_data.get("company"),
-                description=job_data.get("description"),
-                location=job_data.get("location"),
-                url=job_data.get("url"),
-                salary_range=job_data.get("salary_range"),
-                requirements=job_data.get("requirements", []),
-                job_type=job_data.get("job_type"),
-                experience_level=job_data.get("experience_level"),
-                raw_data=job_data,
-                processed=False
-            )
+            raw_job = self._build_raw_job(job_data, source)
 
             # Guardar en MongoDB
-            await self.mongo_repository.save_raw_job(raw_job)
-
-            # Procesar inmediatamente con ETL
-            processed_job = self.etl_service.transform_job_data(raw_job)
-
-            # Crear evento Kafka
-            event = {
-                "type": "JOB_CREATED",
-                "data": processed_job.dict(),
-                "metadata": {
-                    "source": source,
-                    "processed_at": datetime.utcnow().isoformat(),
-                    "raw_job_id": raw_job.job_id
-                }
-            }
+            result = await self.mongo_repository.save_raw_jobs_bulk([raw_job])
+            item = result.items[0]
+            if item.status == BulkUpsertStatus.FAILED:
+                raise MongoDBError(item.error)
 
-            # Enviar a Kafka
-            await self.etl_service.kafka_producer.send_event("job-events", event)
-
-            # Marcar como procesado
-            await self.mongo_repository.mark_job_as_processed(raw_job.job_id)
+            # Sin cambios desde el último guardado: ya se publicó entonces
+            if item.status in PUBLISHABLE_STATUSES:
+                await self._publish_raw_job(raw_job, source)
 
             return True
 
@@ -99,19 +119,37 @@ class JobSyncService:
             source: JobSource
     ) -> List[str]:
         """
-        Sincroniza un lote de trabajos.
-        Retorna la lista de IDs de los trabajos guardados.
+        Sincroniza un lote de trabajos. Solo se publican los nuevos o
+        modificados; los que no cambiaron se publicaron en su momento.
+        Retorna la lista de IDs de los trabajos publicados.
         """
         synced_job_ids = []
 
+        raw_jobs = []
         for job_data in jobs_data:
             try:
-                await self.sync_job(job_data, source)
-                synced_job_ids.append(job_data.get("url"))
+                raw_jobs.append(self._build_raw_job(job_data, source))
             except Exception as e:
                 logger.error(f"Error syncing job {job_data.get('url')}: {str(e)}")
                 continue
 
+        # Guardar todo el lote en MongoDB con upserts masivos
+        result = await self.mongo_repository.save_raw_jobs_bulk(raw_jobs)
+
+        for item in result.items:
+            raw_job = raw_jobs[item.index]
+            if item.status == BulkUpsertStatus.FAILED:
+                logger.error(f"Error syncing job {raw_job.raw_data.get('url')}: {item.error}")
+                continue
+            if item.status not in PUBLISHABLE_STATUSES:
+                continue
+            try:
+                await self._publish_raw_job(raw_job, source)
+                synced_job_ids.append(raw_job.raw_data.get("url"))
+            except Exception as e:
+                logger.error(f"Error syncing job {raw_job.raw_data.get('url')}: {str(e)}")
+                continue
+
         return synced_job_ids
 
     # async def sync_indeed_jobs(self, db: Session, keywords: str, location: str):
@@ -0,0 +1,80 @@
+import logging
+from collections import defaultdict
+from typing import Optional
+
+import pandas as pd
+
+from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.core.executor import ScrapeExecutor
+from app.core.fingerprint import LISTING_FIELDS, listing_fingerprint
+from app.core.model.schemas import JobSource
+from app.service.description_fetcher import DescriptionFetcher
+from app.service.normalizer import map_sources
+
+logger = logging.getLogger(__name__)
+
+
+class TwoPhaseScraper:
+    """
+    Scraping en dos fases con JobSpy:
+
+    1. Listado sin descripciones (`fetch_description=False`): URLs y campos ligeros.
+    2. Una consulta `$in` trae la huella de listado de las URLs ya guardadas
+       en `raw_jobs` (título, empresa, ubicación, fecha, salario). Solo se
+       descartan las conocidas cuya huella no cambió; para las nuevas y las
+       cambiadas se descarga la descripción completa y siguen el camino
+       normal (huella de contenido, guardado y publicación).
+
+    Un cambio solo en la descripción, sin tocar los campos del listado, no
+    se detecta hasta el siguiente scraping completo.
+    """
+
+    def __init__(
+            self,
+            scrape_executor: ScrapeExecutor,
+            mongo_repository: MongoDBRepository,
+            description_fetcher: Optional[DescriptionFetcher] = None
+    ):
+        self.scrape_executor = scrape_executor
+        self.mongo_repository = mongo_repository
+        self.description_fetcher = description_fetcher or DescriptionFetcher()
+
+    async def scrape_jobs(self, **kwargs) -> pd.DataFrame:
+        """Mismos parámetros que `jobspy.scrape_jobs`; devuelve solo las ofertas nuevas o cambiadas."""
+        kwargs["fetch_description"] = False
+        jobs_df = await self.scrape_executor.scrape_jobs(**kwargs)
+        if jobs_df is None or jobs_df.empty:
+            return jobs_df
+
+        sources = map_sources(jobs_df["site"])
+        urls = jobs_df["job_url"]
+
+        urls_by_source = defaultdict(list)
+        for source, url in zip(sources, urls):
+            if isinstance(url, str):
+                urls_by_source[source].append(url)
+        stored = await self.mongo_repository.find_listing_fingerprints(urls_by_source)
+
+        columns = {field: jobs_df[field].tolist() for field in LISTING_FIELDS if field in jobs_df.columns}
+        keep = []
+        for position, (source, url) in enumerate(zip(sources, urls)):
+            stored_fingerprint = stored.get((source, url))
+            if stored_fingerprint is None:
+                keep.append(True)
+                continue
+            record = {field: values[position] for field, values in columns.items()}
+            keep.append(listing_fingerprint(record) != stored_fingerprint)
+        new_df = jobs_df[keep].copy()
+
+        # Segunda fase: descripciones solo de las nuevas o cambiadas que el listado no trae
+        descriptions = new_df["description"]
+        missing = descriptions.isna() & (sources[keep] == JobSource.LINKEDIN.value)
+        fetched = await self.description_fetcher.fetch_linkedin(list(new_df.loc[missing, "job_url"]))
+        if fetched:
+            new_df["description"] = descriptions.where(~missing, new_df["job_url"].map(fetched))
+
+        logger.info(
+            f"Two-phase scrape: {len(jobs_df)} listed, {len(jobs_df) - len(new_df)} known and unchanged, "
+            f"{len(new_df)} new or changed, {len(fetched)} descriptions fetched"
+        )
+        return new_df
@@ -0,0 +1,61 @@
+"""Ofertas sintéticas, reproducibles, con la forma de las que guarda el scraper."""
+import random
+from typing import List
+
+from app.core.model.schemas import JobSource, RawJobData
+
+WORDS = (
+    "equipo producto clientes desarrollo servicios plataforma datos calidad procesos negocio proyectos "
+    "soluciones tecnología diseño arquitectura rendimiento seguridad operaciones colaboración mejora "
+    "continua sistemas aplicaciones usuarios escalables integración análisis entregas objetivos "
+    "responsable participar construir mantener documentar revisar proponer liderar acompañar apoyar "
+    "nuestra empresa ofrece crecimiento profesional aprendizaje ambiente dinámico retos innovación "
+    "banca retail seguros pagos logística salud educación gobierno"
+).split()
+SKILLS = (
+    "Python", "FastAPI", "Django", "Java", "Spring Boot", "React", "TypeScript", "Node.js", "PostgreSQL",
+    "MongoDB", "Kafka", "Docker", "Kubernetes", "AWS", "Azure", "Terraform", "Git", "Scrum", "Power BI",
+    "Excel", "Inglés intermedio", "Inglés avanzado", "CI/CD", "apis rest", "machine learning",
+)
+TITLES = (
+    "Backend Developer", "Frontend Developer", "Data Engineer", "Data Analyst", "DevOps Engineer",
+    "Desarrollador Full Stack", "Analista de Sistemas", "QA Automation Engineer",
+)
+COMPANIES = ("Acme Soluciones Digitales", "Banco Andino", "Retail Perú S.A.C.", "Seguros del Pacífico")
+LOCATIONS = ("Lima, Lima, Perú", "Arequipa, Perú", "San Isidro, Lima", "Remoto", "Lima (híbrido)")
+JOB_TYPES = ("fulltime", "parttime", "contract", "Tiempo completo", None)
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_description(rng: random.Random, words: int = 800) -> str:
+    """Descripción en markdown de unas `words` palabras, con secciones como las de LinkedIn/Indeed."""
+    skills = rng.sample(SKILLS, 6)
+    body = words - 40
+    sections = [
+        "## Sobre nosotros", _paragraph(rng, body // 3),
+        "## Responsabilidades", _paragraph(rng, body // 3),
+        "**Requisitos:**", *(f"- Experiencia con {skill}" for skill in skills),
+        "## Beneficios", _paragraph(rng, body - 2 * (body // 3)),
+    ]
+    if rng.random() < 0.2:
+        sections.append("Modalidad: trabajo remoto.")
+    return "\n\n".join(sections)
+
+
+def make_raw_jobs(count: int, words: int = 800, seed: int = 7) -> List[RawJobData]:
+    rng = random.Random(seed)
+    jobs = []
+    for number in range(count):
+        source = rng.choice((JobSource.INDEED, JobSource.LINKEDIN))
+        url = (f"https://pe.indeed.com/viewjob?jk={number:016x}" if source == JobSource.INDEED
+               else f"https://www.linkedin.com/jobs/view/{4000000000 + number}")
+        jobs.append(RawJobData(
+            source=source, job_id=url, title=rng.choice(TITLES), company=rng.choice(COMPANIES),
+            description=make_description(rng, words), location=rng.choice(LOCATIONS), url=url,
+            salary_range="PEN 5,000.00 - 7,000.00 mensual", job_type=rng.choice(JOB_TYPES),
+            experience_level=rng.choice(("mid-senior level", "entry level", None)), raw_data={},
+        ))
+    return jobs
@@ -0,0 +1,82 @@
+"""
+Microbenchmark de la transformación del ETL.
+
+1. Detección de remoto sobre descripciones largas: `in` sobre el texto en
+   minúsculas (lo que usa `job_transform`) frente a una alternancia de regex
+   precompilada, con y sin IGNORECASE.
+2. Transformación completa: `transform_job_data` trabajo a trabajo (un
+   ProcessedJobData validado por trabajo) frente a `transform_batch`
+   (`transform_records` y una sola validación del lote). Comprueba además
+   que ambos producen los mismos ProcessedJobData, y cuánto de ese tiempo
+   es la extracción de requisitos.
+
+    python -m benchmarks.etl_transform --jobs 3000
+"""
+import argparse
+import re
+import time
+from typing import Callable
+
+from app.service.etl import JobETLService
+from app.service.job_transform import REMOTE_KEYWORDS, detect_remote_job, extract_requirements
+from benchmarks._data import make_raw_jobs
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(args):
+    raw_jobs = make_raw_jobs(args.jobs, words=args.words)
+    pairs = [(raw_job.description, raw_job.location) for raw_job in raw_jobs]
+    print(f"{len(raw_jobs)} jobs, ~{args.words} words per description (best of {args.repeat})\n")
+
+    alternation = re.compile("|".join(map(re.escape, REMOTE_KEYWORDS)))
+    alternation_ignorecase = re.compile("|".join(map(re.escape, REMOTE_KEYWORDS)), re.IGNORECASE)
+    matchers = {
+        "in on lower()": lambda: [detect_remote_job(description, location) for description, location in pairs],
+        "regex on lower()": lambda: [
+            bool(alternation.search(location.lower()) or alternation.search(description.lower()))
+            for description, location in pairs
+        ],
+        "regex IGNORECASE": lambda: [
+            bool(alternation_ignorecase.search(location) or alternation_ignorecase.search(description))
+            for description, location in pairs
+        ],
+    }
+    expected = matchers["in on lower()"]()
+    print(f"{'remote detection':<20} {'ms':>9} {'µs/job':>8}")
+    for name, matcher in matchers.items():
+        assert matcher() == expected, name
+        elapsed = best_of(args.repeat, matcher)
+        print(f"{name:<20} {elapsed * 1000:>9.1f} {elapsed * 1e6 / len(pairs):>8.1f}")
+
+    service = JobETLService(mongo_repository=None, kafka_producer=None)
+    per_job = [service.transform_job_data(raw_job) for raw_job in raw_jobs]
+    batched, failures = service.transform_batch(raw_jobs)
+    assert not failures and [job for _, job in batched] == per_job
+
+    print(f"\n{'transform':<20} {'ms':>9} {'µs/job':>8} {'speedup':>8}")
+    baseline = best_of(args.repeat, lambda: [service.transform_job_data(raw_job) for raw_job in raw_jobs])
+    batch = best_of(args.repeat, lambda: service.transform_batch(raw_jobs))
+    for name, elapsed in (("per job", baseline), ("transform_batch", batch)):
+        print(f"{name:<20} {elapsed * 1000:>9.1f} {elapsed * 1e6 / len(raw_jobs):>8.1f} "
+              f"{baseline / elapsed:>7.2f}x")
+
+    # La extracción de requisitos es común a ambos caminos
+    requirements = best_of(args.repeat, lambda: [extract_requirements(description) for description, _ in pairs])
+    print(f"{'of which requirements':<20} {requirements * 1000:>9.1f} {requirements * 1e6 / len(raw_jobs):>8.1f} "
+          f"{requirements / batch:>7.0%} of transform_batch")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=3000)
+    parser.add_argument("--words", type=int, default=800, help="Palabras por descripción")
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,49 @@
+"""
+Mide la reducción de HTML previa a SmartScraperTool sobre páginas guardadas:
+bytes originales, bytes que llegan al LLM, tarjetas conservadas y tiempo.
+
+Por defecto usa las páginas de `tests/fixtures`, que son recortes pequeños;
+para medir páginas reales, guarda una búsqueda completa (Ctrl+S en el
+navegador o `curl`) y pásala como argumento:
+
+    python -m benchmarks.html_reducer
+    python -m benchmarks.html_reducer indeed_python_lima.html linkedin_python_lima.html
+"""
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from app.core.html_reducer import reduce_html
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+DEFAULT_PAGES = [FIXTURES / "indeed_search.html", FIXTURES / "linkedin_search.html"]
+
+
+def main(args):
+    # reduce_html registra cada página en INFO
+    logging.disable(logging.INFO)
+    pages = [Path(page) for page in args.pages] or DEFAULT_PAGES
+
+    print(f"{'page':<32} {'original':>10} {'to LLM':>9} {'ratio':>7} {'cards':>6} {'ms':>7}")
+    total_original = total_reduced = 0
+    for page in pages:
+        html = page.read_text(encoding="utf-8", errors="replace")
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            result = reduce_html(html)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / args.repeat
+
+        total_original += result.original_bytes
+        total_reduced += result.reduced_bytes
+        print(f"{page.name[:32]:<32} {result.original_bytes:>10,} {result.reduced_bytes:>9,} "
+              f"{result.ratio:>7.1%} {result.cards:>6} {elapsed_ms:>7.2f}")
+
+    print(f"{'total':<32} {total_original:>10,} {total_reduced:>9,} {total_reduced / total_original:>7.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="Páginas de resultados guardadas")
+    parser.add_argument("--repeat", type=int, default=50)
+    main(parser.parse_args())
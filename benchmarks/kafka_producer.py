@@ -0,0 +1,116 @@
+"""
+Compara perfiles del producer de Kafka: bytes en el cable y eventos/s.
+
+Sin broker se mide el trabajo del cliente: validar y serializar cada evento
+y agruparlo en record batches con el mismo constructor y el mismo
+`max_batch_size` que usa aiokafka al enviar; el tamaño de esos batches es lo
+que viaja por la red. Con `--bootstrap` los eventos se envían además a un
+broker local (por ejemplo `docker run -p 9092:9092 apache/kafka`) y se mide
+el envío completo con confirmaciones.
+
+    python -m benchmarks.kafka_producer --events 2000
+    python -m benchmarks.kafka_producer --events 2000 --bootstrap localhost:9092
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from aiokafka import codec
+from aiokafka.record.default_records import DefaultRecordBatch, DefaultRecordBatchBuilder
+
+from app.config.settings import settings
+from app.core.event.kafka.producer import KafkaProducer, orjson
+from app.service.etl import JobETLService
+from benchmarks._data import make_raw_jobs
+
+CODECS = {
+    None: (lambda: True, DefaultRecordBatch.CODEC_NONE),
+    "gzip": (codec.has_gzip, DefaultRecordBatch.CODEC_GZIP),
+    "snappy": (codec.has_snappy, DefaultRecordBatch.CODEC_SNAPPY),
+    "lz4": (codec.has_lz4, DefaultRecordBatch.CODEC_LZ4),
+    "zstd": (codec.has_zstd, DefaultRecordBatch.CODEC_ZSTD),
+}
+
+
+def build_events(count: int, words: int) -> List[dict]:
+    service = JobETLService(mongo_repository=None, kafka_producer=None)
+    raw_jobs = make_raw_jobs(count, words=words)
+    processed, _ = service.transform_batch(raw_jobs)
+    return [service._build_event(raw_job, processed_job) for raw_job, processed_job in processed]
+
+
+def profiles() -> List[Tuple[str, Optional[str]]]:
+    serializers = ["json"] + (["orjson"] if orjson is not None else [])
+    return [
+        (serializer, compression)
+        for compression, (available, _) in CODECS.items() if available()
+        for serializer in serializers
+    ]
+
+
+def encode(producer: KafkaProducer, events: List[dict], compression: Optional[str]) -> Tuple[float, int, int]:
+    """Serializa y agrupa en batches como el acumulador de aiokafka; devuelve (segundos, bytes, batches)."""
+    codec_id = CODECS[compression][1]
+    started = time.perf_counter()
+    wire_bytes = 0
+    batches = 0
+    builder = None
+    for offset, event in enumerate(events):
+        value = producer._serialize_value(event)
+        if builder is None or builder.append(offset, timestamp=None, key=None, value=value, headers=[]) is None:
+            if builder is not None:
+                wire_bytes += len(builder.build())
+                batches += 1
+            builder = DefaultRecordBatchBuilder(2, codec_id, 0, -1, -1, -1, settings.KAFKA_MAX_BATCH_SIZE)
+            builder.append(offset, timestamp=None, key=None, value=value, headers=[])
+    wire_bytes += len(builder.build())
+    return time.perf_counter() - started, wire_bytes, batches + 1
+
+
+async def send(producer: KafkaProducer, events: List[dict], topic: str) -> Tuple[float, int]:
+    await producer.start()
+    try:
+        started = time.perf_counter()
+        errors = await producer.send_events_batch(topic, events)
+        return time.perf_counter() - started, sum(error is not None for error in errors)
+    finally:
+        await producer.stop()
+
+
+async def main(args):
+    if args.bootstrap:
+        settings.KAFKA_BOOTSTRAP_SERVERS = args.bootstrap
+    events = build_events(args.events, args.words)
+    print(f"{len(events)} events, ~{args.words} words per description, "
+          f"max_batch_size={settings.KAFKA_MAX_BATCH_SIZE}")
+
+    header = f"{'serializer':<10} {'compression':<12} {'bytes/event':>12} {'wire MB':>9} {'batches':>8} {'events/s':>10}"
+    if args.bootstrap:
+        header += f" {'sent/s':>9} {'errors':>7}"
+    print(header)
+
+    baseline = None
+    for serializer, compression in profiles():
+        producer = KafkaProducer(serializer=serializer, compression_type=compression)
+        best = min((encode(producer, events, compression) for _ in range(args.repeat)), key=lambda run: run[0])
+        elapsed, wire_bytes, batches = best
+        baseline = baseline or wire_bytes
+        line = (f"{serializer:<10} {compression or 'none':<12} {wire_bytes / len(events):>12,.0f} "
+                f"{wire_bytes / 1e6:>9.2f} {batches:>8} {len(events) / elapsed:>10,.0f}")
+        if args.bootstrap:
+            sent_elapsed, errors = await send(producer, events, args.topic)
+            line += f" {len(events) / sent_elapsed:>9,.0f} {errors:>7}"
+        else:
+            await producer._producer.stop()
+        print(f"{line}   ({wire_bytes / baseline:.0%} of uncompressed json)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=800, help="Palabras por descripción")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones; se informa la más rápida")
+    parser.add_argument("--bootstrap", help="Broker local al que enviar los eventos")
+    parser.add_argument("--topic", default="job-events-benchmark")
+    asyncio.run(main(parser.parse_args()))
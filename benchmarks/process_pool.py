@@ -0,0 +1,74 @@
+"""
+Busca el tamaño de lote a partir del cual compensa enviar la transformación
+del ETL al pool de procesos, y cómo escala con el número de workers.
+
+Para cada número de workers y tamaño de lote compara `transform_records` en
+línea con `TransformExecutor.map` (pool ya arrancado y con los workers
+calientes). El cruce es el menor lote en el que el pool es más rápido; es
+la referencia para `ETL_PROCESS_POOL_MIN_BATCH_SIZE`. Con un solo núcleo el
+pool nunca compensa: mide en una máquina con los núcleos de producción.
+
+    python -m benchmarks.process_pool --workers 1 2 4 --sizes 10 50 100 250 1000
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import List
+
+from app.core.process_pool import TransformExecutor
+from app.service.job_transform import raw_job_record, transform_records
+from benchmarks._data import make_raw_jobs
+
+
+def best_inline(records: List[dict], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        transform_records(records)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def best_pool(executor: TransformExecutor, records: List[dict], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await executor.map(transform_records, records)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def main(args):
+    largest = max(args.sizes)
+    records = [raw_job_record(raw_job) for raw_job in make_raw_jobs(largest, words=args.words)]
+    print(f"{os.cpu_count()} CPUs, ~{args.words} words per description (best of {args.repeat})\n")
+
+    inline = {size: best_inline(records[:size], args.repeat) for size in args.sizes}
+
+    print(f"{'workers':>7} {'batch':>6} {'inline ms':>10} {'pool ms':>9} {'speedup':>8}")
+    for workers in args.workers:
+        # min_batch_size=1: aquí se quiere medir el pool también en lotes pequeños
+        executor = TransformExecutor(workers=workers, min_batch_size=1)
+        try:
+            # Arranca los workers e importa los módulos en cada uno antes de medir
+            await executor.map(transform_records, records[:workers * 4])
+            crossover = None
+            for size in args.sizes:
+                pool = await best_pool(executor, records[:size], args.repeat)
+                speedup = inline[size] / pool
+                if speedup > 1 and crossover is None:
+                    crossover = size
+                print(f"{workers:>7} {size:>6} {inline[size] * 1000:>10.1f} {pool * 1000:>9.1f} {speedup:>7.2f}x")
+            print(f"{'':>7} crossover: {crossover if crossover is not None else 'none (pool never faster)'}\n")
+        finally:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50, 100, 250, 500, 1000])
+    parser.add_argument("--words", type=int, default=800, help="Palabras por descripción")
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
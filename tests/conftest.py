@@ -0,0 +1,7 @@
+import os
+
+# Los scrapers exigen estas variables al importarse (app/service/scraper.py); en
+# las pruebas no se llama a ningún servicio externo
+os.environ.setdefault("LANGCHAIN_API_KEY", "test")
+os.environ.setdefault("LANGCHAIN_PROJECT", "test")
+os.environ.setdefault("SGAI_API_KEY", "sgai-00000000-0000-0000-0000-000000000000")
@@ -0,0 +1,173 @@
+import asyncio
+from pathlib import Path
+from typing import Dict, List
+
+from app.config.settings import settings
+from app.core.fingerprint import listing_fingerprint
+from app.core.rate_limit import RateLimiterRegistry
+from app.service.card_parser import (
+    FALLBACK_DESCRIPTION_BUDGET, FALLBACK_LOW_COVERAGE, FALLBACK_MISSING_DESCRIPTIONS, FALLBACK_NO_CARDS,
+    card_parser_stats, parse_cards, parse_indeed_cards, parse_linkedin_cards
+)
+from app.service.description_fetcher import DescriptionFetcher
+from app.service.scraper import LinkedInScraper
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_indeed_cards_are_read_with_selectors():
+    jobs = parse_indeed_cards(_fixture("indeed_search.html"))
+
+    assert [job["title"] for job in jobs] == ["Backend Developer Python", "Data Engineer Sr.", "QA Automation Engineer"]
+    assert jobs[0] == {
+        "title": "Backend Developer Python",
+        "company": "Acme Soluciones Digitales",
+        "location": "Lima",
+        "summary": "Diseñar y mantener APIs REST con FastAPI. Experiencia con MongoDB y Kafka.",
+        "url": "https://pe.indeed.com/viewjob?jk=7a1b2c3d4e5f6071",
+    }
+    assert jobs[2]["summary"] == "Pruebas con Cypress y Selenium."
+
+
+def test_linkedin_cards_are_read_with_selectors():
+    jobs = parse_linkedin_cards(_fixture("linkedin_search.html"))
+
+    assert len(jobs) == 2
+    assert jobs[0]["title"] == "Backend Developer"
+    assert jobs[0]["company"] == "Acme Soluciones Digitales"
+    assert jobs[0]["location"] == "Lima, Lima, Perú"
+    assert jobs[0]["salary_range"] == "S/ 8,000 - S/ 10,000"
+    assert jobs[0]["posted_at"] == "2025-01-10"
+    # Sin parámetros de seguimiento en la URL
+    assert jobs[0]["url"] == "https://pe.linkedin.com/jobs/view/backend-developer-at-acme-4012345678"
+    assert jobs[1]["salary_range"] is None
+    # La tarjeta no trae descripción: la completa LinkedInScraper
+    assert jobs[0]["description"] == ""
+
+
+def test_complete_page_takes_the_fast_path():
+    assert len(parse_cards("indeed", _fixture("indeed_search.html"), min_coverage=0.8)) == 3
+
+
+def test_low_coverage_falls_back_to_llm():
+    # Un cambio de maquetación que pierde la empresa en dos de las tres tarjetas
+    html = _fixture("indeed_search.html")
+    for company in ("Banco Andino", "Retail Perú S.A.C."):
+        html = html.replace(f">{company}</span>", "></span>")
+    before = card_parser_stats.stats().get("indeed", {}).get(FALLBACK_LOW_COVERAGE, 0)
+
+    assert len(parse_indeed_cards(html)) == 3
+    assert parse_cards("indeed", html, min_coverage=0.8) is None
+    assert card_parser_stats.stats()["indeed"][FALLBACK_LOW_COVERAGE] == before + 1
+
+
+def test_page_without_cards_falls_back_to_llm():
+    before = card_parser_stats.stats().get("linkedin", {}).get(FALLBACK_NO_CARDS, 0)
+
+    assert parse_cards("linkedin", "<html><body><h1>Inicia sesión</h1></body></html>") is None
+    assert card_parser_stats.stats()["linkedin"][FALLBACK_NO_CARDS] == before + 1
+
+
+def test_linkedin_posting_description_is_converted_to_markdown():
+    description = DescriptionFetcher.parse_linkedin_description(_fixture("linkedin_posting.html"))
+
+    assert description.startswith("**Buscamos un Backend Developer** para nuestro equipo de pagos.")
+    assert "* Python y FastAPI" in description
+
+
+class _DescriptionFetcher:
+    def __init__(self, descriptions: Dict[str, str]):
+        self.descriptions = descriptions
+        self.requested = []
+
+    async def fetch_linkedin(self, urls: List[str]) -> Dict[str, str]:
+        self.requested.extend(urls)
+        return {url: self.descriptions[url] for url in urls if url in self.descriptions}
+
+
+def test_linkedin_fast_path_fills_descriptions():
+    jobs = parse_linkedin_cards(_fixture("linkedin_search.html"))
+    descriptions = {job["url"]: f"Descripción de {job['title']}" for job in jobs}
+    scraper = LinkedInScraper(description_fetcher=_DescriptionFetcher(descriptions))
+
+    filled = asyncio.run(scraper._fill_descriptions(jobs))
+
+    assert [job["description"] for job in filled] == ["Descripción de Backend Developer", "Descripción de Data Scientist"]
+
+
+def test_linkedin_fast_path_falls_back_to_llm_without_descriptions():
+    jobs = parse_linkedin_cards(_fixture("linkedin_search.html"))
+    # Solo una de dos: por debajo de CARD_PARSER_MIN_COVERAGE
+    scraper = LinkedInScraper(description_fetcher=_DescriptionFetcher({jobs[0]["url"]: "Descripción"}))
+
+    assert asyncio.run(scraper._fill_descriptions(jobs)) is None
+
+
+class _SearchPage:
+    """Cliente HTTP que siempre devuelve la misma página de resultados."""
+
+    def __init__(self, html: str):
+        self.text = html
+
+    def client(self, site: str, **options):
+        return self
+
+    async def get(self, url: str, **kwargs):
+        return self
+
+    def raise_for_status(self):
+        pass
+
+
+class _StoredListings:
+    def __init__(self, jobs: List[dict]):
+        self.fingerprints = {("linkedin", job["url"]): listing_fingerprint(job) for job in jobs}
+
+    async def find_listing_fingerprints(self, urls_by_source):
+        return {
+            (source, url): self.fingerprints[(source, url)]
+            for source, urls in urls_by_source.items() for url in urls if (source, url) in self.fingerprints
+        }
+
+
+def _linkedin_scraper(descriptions: Dict[str, str], stored: List[dict]) -> LinkedInScraper:
+    return LinkedInScraper(
+        rate_limiter=RateLimiterRegistry(),
+        http_clients=_SearchPage(_fixture("linkedin_search.html")),
+        description_fetcher=_DescriptionFetcher(descriptions),
+        mongo_repository=_StoredListings(stored)
+    )
+
+
+def test_linkedin_fast_path_fetches_only_new_or_changed_descriptions():
+    known, changed = parse_linkedin_cards(_fixture("linkedin_search.html"))
+    descriptions = {known["url"]: "Descripción", changed["url"]: "Descripción"}
+    scraper = _linkedin_scraper(descriptions, [known, dict(changed, title="Data Analyst")])
+
+    jobs = asyncio.run(scraper._parse_search_page("python", "Lima"))
+
+    assert [job["url"] for job in jobs] == [changed["url"]]
+    assert scraper.description_fetcher.requested == [changed["url"]]
+
+
+def test_linkedin_fast_path_with_only_known_jobs_fetches_nothing():
+    cards = parse_linkedin_cards(_fixture("linkedin_search.html"))
+    scraper = _linkedin_scraper({}, cards)
+
+    assert asyncio.run(scraper._parse_search_page("python", "Lima")) == []
+    assert scraper.description_fetcher.requested == []
+
+
+def test_linkedin_fast_path_falls_back_to_llm_over_the_description_budget(monkeypatch):
+    monkeypatch.setattr(settings, "CARD_PARSER_MAX_DESCRIPTION_FETCHES", 1)
+    cards = parse_linkedin_cards(_fixture("linkedin_search.html"))
+    scraper = _linkedin_scraper({job["url"]: "Descripción" for job in cards}, [])
+    before = card_parser_stats.stats().get("linkedin", {}).get(FALLBACK_DESCRIPTION_BUDGET, 0)
+
+    assert asyncio.run(scraper._parse_search_page("python", "Lima")) is None
+    assert scraper.description_fetcher.requested == []
+    assert card_parser_stats.stats()["linkedin"][FALLBACK_DESCRIPTION_BUDGET] == before + 1
@@ -0,0 +1,143 @@
+import asyncio
+import random
+
+from app.core.model.schemas import JobSource, ProcessedJobData, RawJobData
+from app.service.duplicate_detector import (
+    SIGNATURE_BITS, DuplicateDetector, SimHashIndex, _band_layout, _from_int64, _to_int64, simhash
+)
+from app.service.skills_extractor import fold_text, tokenize
+
+COMPANY = "Acme Soluciones Digitales"
+ABOUT = (
+    "Sobre nosotros: somos una empresa peruana de tecnología con más de diez años de experiencia "
+    "desarrollando productos digitales para banca, retail y seguros. Ofrecemos trabajo remoto, "
+    "horario flexible, seguro de salud EPS, bono anual por desempeño y presupuesto de capacitación."
+)
+BACKEND = (
+    "Buscamos un Backend Developer para unirse a nuestro equipo de pagos. Serás responsable de diseñar "
+    "y mantener APIs REST en Python con FastAPI, modelar datos en PostgreSQL y MongoDB, y desplegar "
+    "servicios en AWS con Docker y Kubernetes. Requisitos: tres años de experiencia con Python, "
+    "conocimiento de colas de mensajes como Kafka o RabbitMQ, pruebas automatizadas con pytest e "
+    "inglés intermedio. Deseable experiencia en sistemas de pagos y observabilidad con Grafana."
+)
+FRONTEND = (
+    "Buscamos un Frontend Developer para unirse a nuestro equipo de canales digitales. Construirás "
+    "interfaces web accesibles con React y TypeScript, trabajarás junto a diseño en Figma y "
+    "optimizarás el rendimiento de aplicaciones de una sola página. Requisitos: dos años de "
+    "experiencia con React, manejo de CSS moderno, pruebas con Jest y Cypress e inglés intermedio. "
+    "Deseable experiencia con Next.js y publicación en tiendas de aplicaciones móviles."
+)
+
+
+def _job(job_id, title, description, source=JobSource.INDEED):
+    raw_job = RawJobData(
+        job_id=job_id, source=source, title=title, company=COMPANY, description=description,
+        location="Lima", url=job_id, raw_data={}
+    )
+    processed_job = ProcessedJobData(
+        source_job_id=job_id, title=title, company=COMPANY, description=description, requirements=[],
+        location="Lima", source_url=job_id, source=source
+    )
+    return raw_job, processed_job
+
+
+def _signature(title, description):
+    return simhash(tokenize(fold_text(f"{title}\n{COMPANY}\n{description}")))
+
+
+def test_repost_with_small_edits_is_within_threshold():
+    original = _signature("Backend Developer", f"{BACKEND} {ABOUT}")
+    repost = _signature(
+        "Backend Developer (Remoto)", f"{BACKEND.replace('tres años', '3 años')} {ABOUT} ¡Postula ya!"
+    )
+    reordered = _signature("Backend Developer", f"{ABOUT} {BACKEND}")
+
+    assert (original ^ repost).bit_count() <= 5
+    assert (original ^ reordered).bit_count() <= 5
+
+
+def test_distinct_roles_from_same_company_are_not_near_duplicates():
+    backend = _signature("Backend Developer", f"{BACKEND} {ABOUT}")
+    frontend = _signature("Frontend Developer", f"{FRONTEND} {ABOUT}")
+
+    assert (backend ^ frontend).bit_count() > 5
+
+
+def test_band_layout_covers_all_bits_without_overlap():
+    for bands in range(1, 9):
+        covered = 0
+        for shift, mask in _band_layout(bands):
+            band_bits = mask << shift
+            assert covered & band_bits == 0
+            covered |= band_bits
+        assert covered == (1 << SIGNATURE_BITS) - 1
+
+
+def test_index_finds_every_signature_within_max_distance():
+    rng = random.Random(7)
+    index = SimHashIndex(max_distance=5)
+    signatures = {str(key): rng.getrandbits(SIGNATURE_BITS) for key in range(2000)}
+    for key, signature in signatures.items():
+        index.add(key, signature)
+
+    for key, signature in list(signatures.items())[:300]:
+        flipped = signature
+        for bit in rng.sample(range(SIGNATURE_BITS), rng.randint(0, 5)):
+            flipped ^= 1 << bit
+        assert index.find(flipped) == key
+        assert index.find(flipped, exclude=key) is None
+
+
+def test_signatures_round_trip_through_signed_int64():
+    for signature in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        stored = _to_int64(signature)
+        assert -(1 << 63) <= stored < 1 << 63
+        assert _from_int64(stored) == signature
+
+
+def test_only_confirmed_jobs_are_indexed():
+    detector = DuplicateDetector(max_distance=5, min_tokens=20)
+    original = _job("indeed-1", "Backend Developer", f"{BACKEND} {ABOUT}")
+    repost = _job("linkedin-1", "Backend Developer", f"{ABOUT} {BACKEND}", JobSource.LINKEDIN)
+
+    unique, duplicates = detector.filter_duplicates([original])
+    assert [raw_job.job_id for raw_job, _ in unique] == ["indeed-1"]
+    assert duplicates == {}
+    assert len(detector.index) == 0
+
+    # La publicación falló: el original no se indexa y la copia posterior no es duplicado
+    assert asyncio.run(detector.confirm([], ["indeed-1"])) == {}
+    unique, duplicates = detector.filter_duplicates([repost])
+    assert [raw_job.job_id for raw_job, _ in unique] == ["linkedin-1"]
+
+    asyncio.run(detector.confirm(["linkedin-1"], []))
+    assert len(detector.index) == 1
+    unique, duplicates = detector.filter_duplicates([original])
+    assert unique == []
+    assert duplicates == {"indeed-1": "linkedin-1"}
+
+
+def test_duplicates_within_a_batch_wait_for_the_original():
+    detector = DuplicateDetector(max_distance=5, min_tokens=20)
+    original = _job("indeed-1", "Backend Developer", f"{BACKEND} {ABOUT}")
+    repost = _job("linkedin-1", "Backend Developer", f"{ABOUT} {BACKEND}", JobSource.LINKEDIN)
+    other = _job("indeed-2", "Frontend Developer", f"{FRONTEND} {ABOUT}")
+
+    unique, duplicates = detector.filter_duplicates([original, repost, other])
+    assert [raw_job.job_id for raw_job, _ in unique] == ["indeed-1", "indeed-2"]
+    assert duplicates == {}
+
+    assert asyncio.run(detector.confirm(["indeed-1", "indeed-2"], [])) == {"linkedin-1": "indeed-1"}
+    assert detector.stats()["sources"]["linkedin"] == {"checked": 1, "duplicates": 1, "duplicate_rate": 1.0}
+
+
+def test_short_texts_are_never_compared():
+    detector = DuplicateDetector(max_distance=5, min_tokens=20)
+    first = _job("indeed-1", "Backend Developer", "Python y FastAPI")
+    second = _job("indeed-2", "Backend Developer", "Python y FastAPI")
+
+    unique, duplicates = detector.filter_duplicates([first, second])
+
+    assert len(unique) == 2
+    assert duplicates == {}
+    assert detector.skipped == 2
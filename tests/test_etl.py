@@ -0,0 +1,102 @@
+import asyncio
+from typing import List, Optional
+
+from app.core.model.schemas import JobSource, RawJobData
+from app.service.etl import JobETLService
+
+
+def _raw_job(number: int) -> RawJobData:
+    url = f"https://pe.indeed.com/viewjob?jk={number}"
+    return RawJobData(
+        job_id=url, source=JobSource.INDEED, title=f"Backend Developer {number}", company="Acme",
+        description="Python, FastAPI y MongoDB", location="Lima", url=url, raw_data={}
+    )
+
+
+class _Repository:
+    def __init__(self, chunks: List[List[RawJobData]], failing_marks: int = 0):
+        self.chunks = chunks
+        self.failing_marks = failing_marks
+        self.processed: List[str] = []
+        self.checkpoint = None
+
+    async def get_etl_checkpoint(self, name: str):
+        return None
+
+    async def save_etl_checkpoint(self, name: str, position):
+        self.checkpoint = position
+
+    async def clear_etl_checkpoint(self, name: str):
+        self.checkpoint = None
+
+    async def iter_unprocessed_jobs(self, chunk_size: int, after=None):
+        for position, chunk in enumerate(self.chunks):
+            yield chunk, position
+
+    async def mark_jobs_as_processed(self, job_ids: List[str]):
+        if self.failing_marks:
+            self.failing_marks -= 1
+            raise RuntimeError("write concern timeout")
+        self.processed.extend(job_ids)
+
+
+class _Producer:
+    async def send_events_batch(self, topic: str, events: List[dict]) -> List[Optional[Exception]]:
+        return [None] * len(events)
+
+
+class _InlineExecutor:
+    async def map(self, function, items):
+        return function(items)
+
+
+def test_failed_chunk_is_counted_and_stream_continues():
+    chunks = [[_raw_job(1), _raw_job(2)], [_raw_job(3)]]
+    repository = _Repository(chunks, failing_marks=1)
+    service = JobETLService(repository, _Producer(), transform_executor=_InlineExecutor())
+
+    result = asyncio.run(service.stream_pending_jobs(batched=True, chunk_size=2))
+
+    assert result.published == 1
+    assert result.failed == 2
+    assert set(result.failures) == {chunks[0][0].job_id, chunks[0][1].job_id}
+    assert repository.processed == [chunks[1][0].job_id]
+    # La cola se recorrió entera, así que el checkpoint se borra
+    assert repository.checkpoint is None
+
+
+class _SlowRepository(_Repository):
+    """Cede el control entre bloques y anota cuántos recorridos están abiertos a la vez."""
+
+    def __init__(self, chunks: List[List[RawJobData]]):
+        super().__init__(chunks)
+        self.open_streams = 0
+        self.max_open_streams = 0
+
+    async def iter_unprocessed_jobs(self, chunk_size: int, after=None):
+        self.open_streams += 1
+        self.max_open_streams = max(self.max_open_streams, self.open_streams)
+        try:
+            for position, chunk in enumerate(self.chunks):
+                pending = [raw_job for raw_job in chunk if raw_job.job_id not in self.processed]
+                await asyncio.sleep(0)
+                if pending:
+                    yield pending, position
+        finally:
+            self.open_streams -= 1
+
+
+def test_concurrent_streams_run_one_after_another():
+    chunks = [[_raw_job(1), _raw_job(2)], [_raw_job(3)]]
+    repository = _SlowRepository(chunks)
+    services = [JobETLService(repository, _Producer(), transform_executor=_InlineExecutor()) for _ in range(2)]
+
+    async def run_both():
+        return await asyncio.gather(*(service.stream_pending_jobs(chunk_size=2) for service in services))
+
+    results = asyncio.run(run_both())
+
+    assert repository.max_open_streams == 1
+    # El segundo recorrido empieza cuando el primero ya publicó todo
+    assert [result.published for result in results] == [3, 0]
+    assert repository.processed == [raw_job.job_id for chunk in chunks for raw_job in chunk]
@@ -0,0 +1,221 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId, Timestamp
+
+from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.core.model.schemas import BulkUpsertItem, BulkUpsertResult, BulkUpsertStatus, ETLRunResult
+from app.service.etl_worker import CHANGE_STREAM_CHECKPOINT, ETLWorker
+from app.service.job_pipeline import JobPipeline
+from app.service.pipeline import PipelineRun
+
+
+def _document(number: int) -> dict:
+    return {
+        "_id": ObjectId(), "source": "indeed", "job_id": f"https://pe.indeed.com/viewjob?jk={number}",
+        "title": f"Backend Developer {number}", "company": "Acme", "description": "Python y FastAPI",
+        "location": "Lima", "url": f"https://pe.indeed.com/viewjob?jk={number}", "processed": False,
+        "created_at": datetime(2025, 1, 1),
+    }
+
+
+class ReplicaSetStandIn(MongoDBRepository):
+    """
+    Sustituto de un replica set: los documentos viven en memoria, el change
+    stream entrega los cambios de una lista y los resume tokens se guardan
+    en memoria, en el orden en que ocurren.
+    """
+
+    def __init__(self, changes: List[dict], log: List[tuple], on_exhausted):
+        super().__init__("mongodb://localhost:27017", "etl_worker_test")
+        self.changes = changes
+        self.log = log
+        self.on_exhausted = on_exhausted
+        self.tokens = {}
+        self.watched_from = []
+        self.started_at = []
+        self.documents = {change["fullDocument"]["_id"]: dict(change["fullDocument"]) for change in changes}
+
+    async def get_cluster_time(self) -> Timestamp:
+        self.log.append(("cluster_time", None))
+        return Timestamp(1700000000, 1)
+
+    async def get_unprocessed_jobs_by_ids(self, ids):
+        documents = [self.documents[_id] for _id in ids if not self.documents[_id]["processed"]]
+        return self.docs_to_raw_jobs(documents)
+
+    async def mark_jobs_as_processed(self, job_ids):
+        for document in self.documents.values():
+            if document["job_id"] in job_ids:
+                document["processed"] = True
+
+    async def get_resume_token(self, name: str) -> Optional[dict]:
+        return self.tokens.get(name)
+
+    async def save_resume_token(self, name: str, resume_token: Optional[dict]):
+        self.log.append(("token", resume_token))
+        self.tokens[name] = resume_token
+
+    def watch_unprocessed_jobs(self, resume_after=None, max_await_time_ms: int = 500, start_at_operation_time=None):
+        self.watched_from.append(resume_after)
+        self.started_at.append(start_at_operation_time)
+        start = 0
+        if resume_after is not None:
+            start = next(index for index, change in enumerate(self.changes) if change["_id"] == resume_after) + 1
+        return _ChangeStream(self.changes[start:], self.on_exhausted)
+
+
+class _ChangeStream:
+    def __init__(self, changes: List[dict], on_exhausted):
+        self.changes = list(changes)
+        self.on_exhausted = on_exhausted
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def try_next(self):
+        if not self.changes:
+            self.on_exhausted()
+            return None
+        change = self.changes.pop(0)
+        self.resume_token = change["_id"]
+        return change
+
+
+class _RecordingETLService:
+    """Publica (y marca como procesado) lo que recibe; la pasada de pendientes publica todo lo pendiente."""
+
+    def __init__(self, log: List[tuple], repository: Optional[ReplicaSetStandIn] = None):
+        self.log = log
+        self.repository = repository
+
+    async def publish_raw_jobs(self, raw_jobs):
+        job_ids = [raw_job.job_id for raw_job in raw_jobs]
+        self.log.append(("publish", job_ids))
+        if self.repository is not None:
+            await self.repository.mark_jobs_as_processed(job_ids)
+        return ETLRunResult(published=len(raw_jobs))
+
+    async def process_pending_jobs(self):
+        pending = [document for document in self.repository.documents.values() if not document["processed"]]
+        self.log.append(("catch_up", [document["job_id"] for document in pending]))
+        await self.repository.mark_jobs_as_processed([document["job_id"] for document in pending])
+        return ETLRunResult(published=len(pending))
+
+
+def _changes(documents: List[dict]) -> List[dict]:
+    return [
+        {"_id": {"_data": f"token-{index}"}, "operationType": "insert", "fullDocument": document}
+        for index, document in enumerate(documents)
+    ]
+
+
+def _run_worker(repository: ReplicaSetStandIn, etl_service, batch_size: int):
+    worker = ETLWorker(repository, etl_service, mode="change_stream", batch_size=batch_size, max_wait_ms=200)
+    repository.on_exhausted = worker._stopping.set
+
+    async def consume():
+        resume_token = await repository.get_resume_token(CHANGE_STREAM_CHECKPOINT)
+        await worker._consume_changes(resume_token)
+
+    asyncio.run(consume())
+
+
+def test_change_stream_publishes_in_batches_and_saves_token_after_publishing():
+    documents = [_document(number) for number in range(5)]
+    log = []
+    repository = ReplicaSetStandIn(_changes(documents), log, None)
+
+    _run_worker(repository, _RecordingETLService(log), batch_size=2)
+
+    published = [job_id for kind, value in log if kind == "publish" for job_id in value]
+    assert published == [document["job_id"] for document in documents]
+    assert [len(value) for kind, value in log if kind == "publish"] == [2, 2, 1]
+    # Cada token se guarda después de publicar el lote que lo contiene
+    assert [kind for kind, _ in log] == ["publish", "token", "publish", "token", "publish", "token"]
+    assert repository.tokens[CHANGE_STREAM_CHECKPOINT] == {"_data": "token-4"}
+
+
+def test_change_stream_resumes_after_saved_token():
+    documents = [_document(number) for number in range(4)]
+    log = []
+    repository = ReplicaSetStandIn(_changes(documents), log, None)
+    repository.tokens[CHANGE_STREAM_CHECKPOINT] = {"_data": "token-1"}
+
+    _run_worker(repository, _RecordingETLService(log), batch_size=10)
+
+    assert repository.watched_from == [{"_data": "token-1"}]
+    assert [value for kind, value in log if kind == "publish"] == [[documents[2]["job_id"], documents[3]["job_id"]]]
+
+
+def test_repeated_changes_of_a_document_are_published_once_per_batch():
+    document = _document(1)
+    log = []
+    repository = ReplicaSetStandIn(_changes([document, dict(document, title="Backend Developer Sr")]), log, None)
+
+    _run_worker(repository, _RecordingETLService(log), batch_size=10)
+
+    assert [value for kind, value in log if kind == "publish"] == [[document["job_id"]]]
+
+
+def _run_worker_loop(repository: ReplicaSetStandIn, etl_service):
+    worker = ETLWorker(repository, etl_service, mode="change_stream", batch_size=10, max_wait_ms=200)
+    repository.on_exhausted = worker._stopping.set
+    asyncio.run(worker._run_change_stream())
+
+
+def test_replayed_inserts_are_not_republished_after_the_pending_pass():
+    documents = [_document(number) for number in range(3)]
+    log = []
+    repository = ReplicaSetStandIn(_changes(documents), log, None)
+    # Reinicio: el token guardado es anterior a las tres inserciones
+    repository.changes.insert(0, {"_id": {"_data": "token-start"}, "operationType": "insert",
+                                  "fullDocument": _document(99)})
+    repository.documents[repository.changes[0]["fullDocument"]["_id"]] = dict(
+        repository.changes[0]["fullDocument"], processed=True
+    )
+    repository.tokens[CHANGE_STREAM_CHECKPOINT] = {"_data": "token-start"}
+
+    _run_worker_loop(repository, _RecordingETLService(log, repository))
+
+    # La pasada de pendientes los publica; el stream repite sus inserciones con processed=False
+    assert [value for kind, value in log if kind == "catch_up"] == [[document["job_id"] for document in documents]]
+    assert [value for kind, value in log if kind == "publish"] == []
+    assert repository.tokens[CHANGE_STREAM_CHECKPOINT] == {"_data": "token-2"}
+
+
+def test_first_start_watches_from_before_the_pending_pass():
+    documents = [_document(number) for number in range(2)]
+    log = []
+    repository = ReplicaSetStandIn(_changes(documents), log, None)
+
+    _run_worker_loop(repository, _RecordingETLService(log, repository))
+
+    assert [kind for kind, _ in log][:2] == ["cluster_time", "catch_up"]
+    assert repository.watched_from == [None]
+    assert repository.started_at == [Timestamp(1700000000, 1)]
+
+
+class _StoreOnlyRepository:
+    seen_cache = None
+
+    async def save_raw_jobs_bulk(self, documents):
+        return BulkUpsertResult(
+            items=[BulkUpsertItem(index=index, status=BulkUpsertStatus.UPSERTED) for index in range(len(documents))],
+            upserted=len(documents)
+        )
+
+
+def test_pipeline_leaves_publishing_to_the_worker_when_it_is_enabled():
+    documents = [_document(number) for number in range(3)]
+
+    publishing = JobPipeline(_StoreOnlyRepository(), etl_service=None, publish=True)
+    storing_only = JobPipeline(_StoreOnlyRepository(), etl_service=None, publish=False)
+
+    assert asyncio.run(publishing._store(documents, PipelineRun())) == [documents]
+    assert asyncio.run(storing_only._store(documents, PipelineRun())) == []
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from app.core.extraction_cache import extraction_key
+from app.core.html_reducer import reduce_html
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_only_job_cards_reach_the_llm():
+    html = (FIXTURES / "indeed_search.html").read_text(encoding="utf-8")
+
+    result = reduce_html(html)
+
+    assert result.cards == 3
+    assert result.reduced_bytes < result.original_bytes
+    assert "window.mosaic" not in result.html and "<title>" not in result.html
+    assert 'data-jk="7a1b2c3d4e5f6071"' in result.html
+    assert "Backend Developer Python" in result.html and "Banco Andino" in result.html
+    # Las clases de presentación no aportan nada a la extracción
+    assert "css-1h7lukg" not in result.html
+
+
+def test_page_without_cards_is_kept_without_scripts():
+    html = "<html><head><script>track()</script></head><body><!-- x --><p>Sin   resultados</p></body></html>"
+
+    result = reduce_html(html)
+
+    assert result.cards == 0
+    assert result.html == "<html><body><p>Sin resultados</p></body></html>"
+
+
+def test_tracking_params_do_not_change_the_extraction_key():
+    indeed = (FIXTURES / "indeed_search.html").read_text(encoding="utf-8")
+    linkedin = (FIXTURES / "linkedin_search.html").read_text(encoding="utf-8")
+    refetched_indeed = indeed.replace("&amp;bb=abc", "&amp;bb=xyz&amp;xkcb=SoD1")
+    refetched_linkedin = linkedin.replace("refId=abc&amp;trackingId=def", "refId=ghi&amp;trackingId=jkl")
+
+    for first, second in ((indeed, refetched_indeed), (linkedin, refetched_linkedin)):
+        assert first != second
+        first_key, second_key = (extraction_key("prompt", html=reduce_html(page).html) for page in (first, second))
+        assert first_key == second_key
+
+    assert 'href="/rc/clk?jk=7a1b2c3d4e5f6071"' in reduce_html(indeed).html
+    assert 'href="https://pe.linkedin.com/jobs/view/backend-developer-at-acme-4012345678"' in reduce_html(linkedin).html
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from app.core.http import BROWSER_HEADERS, HTTPClientRegistry
+
+
+def test_client_is_shared_per_destination():
+    registry = HTTPClientRegistry(http2=False)
+
+    first = registry.client("linkedin", headers=BROWSER_HEADERS, follow_redirects=True)
+    upper_case = {name.upper(): value for name, value in BROWSER_HEADERS.items()}
+
+    assert registry.client("linkedin", headers=upper_case, follow_redirects=True) is first
+    assert registry.client("ms_job") is not first
+    asyncio.run(registry.close())
+
+
+def test_client_rejects_different_options_for_a_destination():
+    registry = HTTPClientRegistry(http2=False)
+    registry.client("linkedin", headers=BROWSER_HEADERS, follow_redirects=True)
+
+    with pytest.raises(ValueError):
+        registry.client("linkedin")
+    with pytest.raises(ValueError):
+        registry.client("linkedin", headers=BROWSER_HEADERS, follow_redirects=False)
+
+    # Tras cerrar, el destino puede crearse con otras opciones
+    asyncio.run(registry.close())
+    assert not registry.client("linkedin").follow_redirects
+    asyncio.run(registry.close())
+
+
+def test_stats_without_pool_internals():
+    registry = HTTPClientRegistry(http2=False)
+    client = registry.client("indeed")
+    client._transport = object()
+
+    stats = registry.stats()["clients"]["indeed"]
+
+    assert stats["requests"] == 0
+    assert "connections" not in stats
+    asyncio.run(registry.close())
@@ -0,0 +1,102 @@
+import math
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.core.datastore.repository.mongodb import MongoDBRepository
+from app.service.job_spy_scraper import JobSpyScraper
+from app.service.normalizer import frame_fingerprints, jobs_frame_to_documents
+
+
+def _jobspy_frame() -> pd.DataFrame:
+    """Filas con la forma de JobSpy: NaN, None, NaT, fechas y salarios a convertir."""
+    return pd.DataFrame({
+        "id": ["in-1", "li-2", "zr-3"],
+        "site": ["indeed", "linkedin", "zip_recruiter"],
+        "job_url": ["https://pe.indeed.com/viewjob?jk=1", "https://www.linkedin.com/jobs/view/2", "https://zr.com/3"],
+        "title": ["Backend Developer", "Data Analyst", None],
+        "company": ["Acme", np.nan, "Globex"],
+        "location": ["Lima, Lima, PE", "Arequipa, Peru", "Austin, TX, US"],
+        "date_posted": [date(2025, 1, 10), None, date(2024, 12, 31)],
+        "scraped_at": pd.to_datetime(["2025-01-11 10:00", None, "2025-01-01 08:30"]),
+        "job_type": ["fulltime", None, "contract"],
+        "interval": ["yearly", np.nan, "hourly"],
+        "min_amount": [60000.0, np.nan, 40.0],
+        "max_amount": [84000.0, np.nan, np.nan],
+        "currency": ["USD", None, "USD"],
+        "is_remote": [False, True, None],
+        "job_level": [np.nan, "mid-senior level", None],
+        "description": ["**Requisitos:**\n- Python y FastAPI\n- Inglés intermedio", np.nan, "Excel y Power BI"],
+    })
+
+
+def _nan_to_none(value):
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def _per_row_documents(jobs_df: pd.DataFrame) -> list:
+    scraper = JobSpyScraper(mongo_repository=None, etl_service=None)
+    repository = MongoDBRepository("mongodb://localhost:27017", "normalizer_test")
+    documents = []
+    for raw_job in scraper.build_raw_jobs_per_row(jobs_df):
+        document = repository.build_job_document(raw_job)
+        # La ruta por filas deja los NaN tal cual; la columnar los guarda como None
+        document = {key: _nan_to_none(value) for key, value in document.items()}
+        document["raw_data"] = {key: _nan_to_none(value) for key, value in document["raw_data"].items()}
+        documents.append(document)
+    return documents
+
+
+def test_columnar_documents_match_the_per_row_path():
+    jobs_df = _jobspy_frame()
+
+    columnar = jobs_frame_to_documents(jobs_df)
+    per_row = _per_row_documents(jobs_df)
+
+    # La ruta por filas convierte NaT en "0001-01-01T00:00:00"; la columnar, en None
+    assert per_row[1]["raw_data"]["scraped_at"] == "0001-01-01T00:00:00"
+    assert columnar[1]["raw_data"]["scraped_at"] is None
+    per_row[1]["raw_data"]["scraped_at"] = None
+
+    assert columnar == per_row
+
+
+def test_columnar_conversion_of_dates_salaries_and_missing_values():
+    documents = jobs_frame_to_documents(_jobspy_frame())
+
+    assert [document["source"] for document in documents] == ["indeed", "linkedin", "other"]
+    assert documents[0]["raw_data"]["date_posted"] == "2025-01-10T00:00:00"
+    assert documents[0]["raw_data"]["scraped_at"] == "2025-01-11T10:00:00"
+    assert documents[1]["raw_data"]["date_posted"] is None
+    # Perú: salario anual en USD a PEN mensual; sin salario, el rango por defecto
+    assert documents[0]["salary_range"] == "PEN 5,000.00 - 7,000.00 mensual"
+    assert documents[1]["salary_range"] == "PEN 1,000.00 - 3,000.00 "
+    assert documents[2]["salary_range"] == "USD 40.00+ por hora"
+    assert documents[1]["company"] is None and documents[1]["raw_data"]["job_level"] == "mid-senior level"
+
+
+def test_frame_fingerprints_match_document_hashes():
+    jobs_df = _jobspy_frame()
+
+    sources, urls, hashes = frame_fingerprints(jobs_df)
+
+    documents = jobs_frame_to_documents(jobs_df)
+    assert sources == [document["source"] for document in documents]
+    assert urls == [document["url"] for document in documents]
+    assert hashes == [document["content_hash"] for document in documents]
+
+
+def test_requirements_are_extracted_from_descriptions():
+    jobs_df = pd.DataFrame({
+        "site": ["indeed", "linkedin"],
+        "job_url": ["https://pe.indeed.com/viewjob?jk=1", "https://www.linkedin.com/jobs/view/2"],
+        "title": ["Backend Developer", "Data Analyst"],
+        "description": ["**Requisitos:**\n- Python y FastAPI\n- Inglés intermedio", np.nan],
+        "location": ["Lima, Perú", "Lima, Perú"],
+    })
+
+    documents = jobs_frame_to_documents(jobs_df)
+
+    assert documents[0]["requirements"] == ["Python", "FastAPI", "English"]
+    assert documents[1]["requirements"] == []
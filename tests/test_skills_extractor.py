@@ -0,0 +1,69 @@
+from app.service.skills_extractor import SkillsExtractor, fold_text, get_skills_extractor, tokenize
+
+TAXONOMY = {
+    "version": 1,
+    "categories": {
+        "technologies": [
+            {"name": "React", "aliases": ["react", "react.js"]},
+            {"name": "React Native", "aliases": ["react native"]},
+            {"name": "Machine Learning", "aliases": ["machine learning", "aprendizaje automático"]},
+            {"name": "C#", "aliases": ["c#", "c sharp"]},
+            {"name": "Node.js", "aliases": ["node.js", "nodejs"]},
+            {"name": "Python", "aliases": ["python"]},
+        ],
+        "languages": [
+            {"name": "English", "aliases": ["inglés", "english"]},
+        ],
+    },
+}
+
+
+def test_fold_text_removes_accents_and_case():
+    assert fold_text("Inglés AVANZADO, Programación") == "ingles avanzado, programacion"
+    assert fold_text("python developer") == "python developer"
+
+
+def test_tokens_keep_symbols_of_technology_names():
+    assert tokenize(fold_text("C#, Node.js, .NET y CI/CD")) == ["c#", "node.js", ".net", "y", "ci", "cd"]
+
+
+def test_accented_aliases_match_with_or_without_accents():
+    extractor = SkillsExtractor(TAXONOMY)
+
+    assert extractor.extract("Inglés avanzado") == ["English"]
+    assert extractor.extract("INGLES intermedio") == ["English"]
+    assert extractor.extract("Experiencia en aprendizaje automatico") == ["Machine Learning"]
+
+
+def test_multi_word_skills_take_the_longest_match():
+    extractor = SkillsExtractor(TAXONOMY)
+
+    assert extractor.extract("Apps móviles con React Native") == ["React Native"]
+    assert extractor.extract("React Native y también React para web") == ["React Native", "React"]
+    assert extractor.extract("Backend en C sharp") == ["C#"]
+    # Un prefijo de un alias de varias palabras no cuenta
+    assert extractor.extract("Machine vision") == []
+
+
+def test_requirements_section_goes_first():
+    extractor = SkillsExtractor(TAXONOMY)
+    description = (
+        "Nuestro stack usa React y Node.js.\n"
+        "\n"
+        "**Requisitos:**\n"
+        "- Python avanzado\n"
+        "- Inglés intermedio\n"
+        "\n"
+        "## Beneficios\n"
+        "Capacitaciones en React Native"
+    )
+
+    assert extractor.extract(description) == ["Python", "English", "React", "Node.js", "React Native"]
+
+
+def test_default_taxonomy_loads():
+    extractor = get_skills_extractor()
+
+    assert extractor.extract("Buscamos experiencia con Power BI, AWS y metodologías ágiles") == [
+        "Power BI", "AWS", "Agile"
+    ]